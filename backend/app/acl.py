@@ -46,6 +46,11 @@ ALL_PERMISSIONS = [
     PERM_SEND_MESSAGE,
 ]
 
+# Each permission owns the bit at its position in ``ALL_PERMISSIONS``.  Link
+# masks are stored in the database, so new permissions must be appended and
+# existing entries never reordered or removed.
+PERMISSION_BITS = {name: 1 << index for index, name in enumerate(ALL_PERMISSIONS)}
+
 ROLE_DEFAULT_PERMISSIONS = {
     "admin": ALL_PERMISSIONS,
     "parent": [
@@ -73,3 +78,23 @@ ROLE_DEFAULT_PERMISSIONS = {
 
 def get_default_permissions_for_role(role: str) -> list[str]:
     return ROLE_DEFAULT_PERMISSIONS.get(role, [])
+
+
+def permissions_to_mask(names) -> int:
+    """Return the bitmask for ``names``, ignoring unknown permissions."""
+
+    mask = 0
+    for name in names or ():
+        mask |= PERMISSION_BITS.get(name, 0)
+    return mask
+
+
+def mask_to_permissions(mask: int) -> list[str]:
+    """Return the permission names set in ``mask`` in canonical order."""
+
+    return [name for name, bit in PERMISSION_BITS.items() if mask & bit]
+
+
+def mask_has_permission(mask: int, name: str) -> bool:
+    bit = PERMISSION_BITS.get(name, 0)
+    return bool(bit) and bool(mask & bit)
@@ -4,22 +4,30 @@ This module centralizes password hashing, JWT handling and FastAPI
 dependency utilities for enforcing roles and permissions.
 """
 
+import asyncio
 import base64
 import hashlib
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
+from weakref import WeakKeyDictionary
 
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 
+from app.acl import mask_has_permission
 from app.database import get_session
-from app.models import Child, RevokedToken, User
+from app.models import Child, ChildUserLink, RevokedToken, User
 
 
 def _require_env(name: str) -> str:
@@ -37,6 +45,12 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
 REFRESH_TOKEN_EXPIRE_MINUTES = int(
     os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", str(60 * 24 * 14))
 )
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+IDENTITY_CACHE_TTL_SECONDS = float(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "10"))
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "4"))
+PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS = float(
+    os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", "2")
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
@@ -62,17 +76,32 @@ def is_password_hash(value: str) -> bool:
     return value.startswith("$2")
 
 
-def verify_password(plain_password, hashed_password):
-    """Verify a plaintext password against a stored hash."""
+def _match_password(plain_password, hashed_password, allow_legacy=True) -> str | None:
+    """Return ``"current"`` or ``"legacy"`` for the scheme that matched, else ``None``.
+
+    Legacy hashes are bcrypt over the raw (truncated) password rather than
+    the SHA-256 pre-hash; checking them costs a second bcrypt round.
+    """
 
     try:
         hashed_bytes = _to_bytes(hashed_password)
         if bcrypt.checkpw(_prehash_password(plain_password), hashed_bytes):
-            return True
-        legacy_plain = _to_bytes(plain_password)[:72]
-        return bcrypt.checkpw(legacy_plain, hashed_bytes)
+            return "current"
+        if allow_legacy and bcrypt.checkpw(_to_bytes(plain_password)[:72], hashed_bytes):
+            return "legacy"
     except (ValueError, TypeError):
-        return False
+        pass
+    return None
+
+
+def verify_password(plain_password, hashed_password, allow_legacy=True):
+    """Verify a plaintext password against a stored hash.
+
+    Pass ``allow_legacy=False`` for users whose hash is known to use the
+    current scheme, so a wrong password costs one bcrypt round, not two.
+    """
+
+    return _match_password(plain_password, hashed_password, allow_legacy) is not None
 
 
 def get_password_hash(password):
@@ -81,15 +110,83 @@ def get_password_hash(password):
     return bcrypt.hashpw(_prehash_password(password), bcrypt.gensalt()).decode("utf-8")
 
 
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when no password hashing slot frees up within the queue timeout."""
+
+
+_password_executor = ThreadPoolExecutor(
+    max_workers=max(PASSWORD_HASH_CONCURRENCY, 1), thread_name_prefix="bcrypt"
+)
+# Semaphores belong to one event loop, so keep one per running loop.
+_password_slots: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    WeakKeyDictionary()
+)
+
+
+async def _run_password_work(func, *args):
+    """Run a bcrypt call on the hashing pool without blocking the event loop.
+
+    At most ``PASSWORD_HASH_CONCURRENCY`` calls run at once.  A caller that
+    cannot get a slot within ``PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS`` gets
+    :class:`PasswordHasherBusyError`, which the API turns into a ``503``.
+    """
+
+    loop = asyncio.get_running_loop()
+    slots = _password_slots.get(loop)
+    if slots is None:
+        slots = _password_slots[loop] = asyncio.Semaphore(
+            max(PASSWORD_HASH_CONCURRENCY, 1)
+        )
+    try:
+        await asyncio.wait_for(slots.acquire(), PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise PasswordHasherBusyError("Password hashing pool is saturated") from None
+    try:
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        slots.release()
+
+
+async def verify_password_async(
+    plain_password, hashed_password, allow_legacy=True
+) -> bool:
+    """:func:`verify_password` run on the bounded hashing pool."""
+
+    return await _run_password_work(
+        verify_password, plain_password, hashed_password, allow_legacy
+    )
+
+
+async def get_password_hash_async(password) -> str:
+    """:func:`get_password_hash` run on the bounded hashing pool."""
+
+    return await _run_password_work(get_password_hash, password)
+
+
 async def authenticate_user(db: AsyncSession, email: str, password: str):
-    """Return the user if credentials are valid, otherwise ``None``."""
+    """Return the user if credentials are valid, otherwise ``None``.
+
+    The legacy scheme is only tried for users not yet marked
+    ``password_migrated``.  A successful login marks the user, rehashing
+    the password first if it still matched the legacy scheme.
+    """
 
     result = await db.execute(
         select(User).where(User.email == email).options(selectinload(User.permissions))
     )
     user = result.scalar_one_or_none()
-    if not user or not verify_password(password, user.password_hash):
+    if not user:
+        return None
+    scheme = await _run_password_work(
+        _match_password, password, user.password_hash, not user.password_migrated
+    )
+    if scheme is None:
         return None
+    if not user.password_migrated:
+        if scheme == "legacy":
+            user.password_hash = await get_password_hash_async(password)
+        user.password_migrated = True
+        await db.commit()
     return user
 
 
@@ -150,9 +247,100 @@ def create_token_pair(subject: str) -> dict[str, str]:
     }
 
 
+class _RevocationCache:
+    """Unexpired revoked token ids known to this process.
+
+    ``sequence`` is the highest ``RevokedToken.id`` read by
+    :func:`sync_revoked_tokens`; rows added by other workers are picked up by
+    reading only ids above it.  Local revocations never move it, or rows
+    from other workers with lower ids would be skipped.
+    """
+
+    def __init__(self) -> None:
+        self.expires_at: dict[str, datetime] = {}
+        self.sequence = 0
+        self.synced_at: float | None = None
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self.expires_at[jti] = expires_at
+
+    def evict_expired(self, now: datetime) -> None:
+        expired = [jti for jti, expires in self.expires_at.items() if expires <= now]
+        for jti in expired:
+            del self.expires_at[jti]
+
+
+# One entry per engine, so separate databases never share revocations.
+_revocation_cache: WeakKeyDictionary[Engine, _RevocationCache] = WeakKeyDictionary()
+
+
+def _revocation_cache_for(db: AsyncSession) -> _RevocationCache | None:
+    if db.bind is None:
+        return None
+    engine = db.bind.sync_engine
+    cache = _revocation_cache.get(engine)
+    if cache is None:
+        cache = _revocation_cache[engine] = _RevocationCache()
+    return cache
+
+
+def clear_revocation_cache() -> None:
+    """Forget every cached revocation in this process."""
+
+    _revocation_cache.clear()
+
+
+async def sync_revoked_tokens(db: AsyncSession, force: bool = False) -> None:
+    """Bring this process's revocation set up to date with the database.
+
+    Reads only rows with an id above the last one seen, and at most once
+    every ``REVOCATION_SYNC_SECONDS`` unless ``force`` is set.  The first
+    sync of an engine loads every unexpired row.
+    """
+
+    cache = _revocation_cache_for(db)
+    if cache is None:
+        return
+    started = time.monotonic()
+    if (
+        not force
+        and cache.synced_at is not None
+        and started - cache.synced_at < REVOCATION_SYNC_SECONDS
+    ):
+        return
+    now = _utcnow().replace(tzinfo=None)
+    result = await db.execute(
+        select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+        .where(RevokedToken.id > cache.sequence)
+        .order_by(RevokedToken.id)
+    )
+    for row_id, jti, expires_at in result.all():
+        if expires_at > now:
+            cache.add(jti, expires_at)
+        cache.sequence = max(cache.sequence, row_id)
+    cache.evict_expired(now)
+    cache.synced_at = started
+
+
 async def is_token_revoked(db: AsyncSession, jti: str) -> bool:
-    result = await db.execute(select(RevokedToken).where(RevokedToken.jti == jti))
-    return result.scalar_one_or_none() is not None
+    """Return ``True`` if ``jti`` has been revoked.
+
+    Answered from the in-process revocation set; the database is only
+    consulted when the set is due for a sync (see :func:`sync_revoked_tokens`).
+    """
+
+    cache = _revocation_cache_for(db)
+    if cache is None:
+        result = await db.execute(select(RevokedToken).where(RevokedToken.jti == jti))
+        return result.scalar_one_or_none() is not None
+    await sync_revoked_tokens(db)
+    expires_at = cache.expires_at.get(jti)
+    if expires_at is None:
+        return False
+    if expires_at <= _utcnow().replace(tzinfo=None):
+        del cache.expires_at[jti]
+        return False
+    return True
 
 
 async def revoke_token(
@@ -179,6 +367,9 @@ async def revoke_token(
     db.add(revoked)
     await db.commit()
     await db.refresh(revoked)
+    cache = _revocation_cache_for(db)
+    if cache is not None:
+        cache.add(revoked.jti, revoked.expires_at)
     return revoked
 
 
@@ -202,8 +393,19 @@ async def revoke_token_from_payload(
 
 
 async def purge_expired_revoked_tokens(db: AsyncSession) -> int:
+    """Delete expired revocations, keeping the newest row.
+
+    The newest row stays so SQLite never hands out its id again: workers
+    sync by reading ids above the last one they saw, and a reused id
+    would be skipped.
+    """
+
+    newest = select(func.max(RevokedToken.id)).scalar_subquery()
     result = await db.execute(
-        select(RevokedToken).where(RevokedToken.expires_at < _utcnow().replace(tzinfo=None))
+        select(RevokedToken).where(
+            RevokedToken.expires_at < _utcnow().replace(tzinfo=None),
+            RevokedToken.id != newest,
+        )
     )
     expired = result.scalars().all()
     if not expired:
@@ -275,27 +477,128 @@ async def get_child_by_id(db: AsyncSession, child_id: int):
     return result.scalars().first()
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_session),
-):
+@dataclass(frozen=True)
+class Identity:
+    """The authenticated user or child, as needed for authorization.
+
+    ``permissions`` holds permission names and is empty for children.
+    Routes that need the full ``User`` row use
+    :func:`get_current_user_record` instead.
+    """
+
+    kind: str
+    id: int
+    role: str | None = None
+    status: str | None = None
+    permissions: frozenset[str] = frozenset()
+    account_frozen: bool = False
+
+
+# One entry per engine: subject -> (identity, monotonic time cached).
+_identity_cache: WeakKeyDictionary[Engine, dict[str, tuple[Identity, float]]] = (
+    WeakKeyDictionary()
+)
+
+
+def invalidate_identity(kind: str, entity_id: int) -> None:
+    """Drop the cached identity for ``kind:entity_id`` in this process."""
+
+    subject = f"{kind}:{entity_id}"
+    for entries in _identity_cache.values():
+        entries.pop(subject, None)
+
+
+def clear_identity_cache() -> None:
+    """Forget every cached identity in this process."""
+
+    _identity_cache.clear()
+
+
+async def _load_identity(db: AsyncSession, kind: str, entity_id: int) -> Identity | None:
+    if kind == "child":
+        child = await get_child_by_id(db, entity_id)
+        if child is None:
+            return None
+        return Identity(kind="child", id=child.id, account_frozen=child.account_frozen)
+    result = await db.execute(
+        select(User).where(User.id == entity_id).options(selectinload(User.permissions))
+    )
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+    return Identity(
+        kind="user",
+        id=user.id,
+        role=user.role,
+        status=user.status,
+        permissions=frozenset(p.name for p in user.permissions),
+    )
+
+
+async def resolve_identity(db: AsyncSession, kind: str, entity_id: int) -> Identity | None:
+    """Return the identity for a token subject, or ``None`` if it is gone.
+
+    Identities are cached per process for ``IDENTITY_CACHE_TTL_SECONDS``.
+    Changes made through the crud helpers invalidate the entry at once;
+    changes made by another worker show up once the entry expires.
+    """
+
+    entries = None
+    if db.bind is not None:
+        engine = db.bind.sync_engine
+        entries = _identity_cache.get(engine)
+        if entries is None:
+            entries = _identity_cache[engine] = {}
+    subject = f"{kind}:{entity_id}"
+    now = time.monotonic()
+    if entries is not None:
+        cached = entries.get(subject)
+        if cached is not None and now - cached[1] < IDENTITY_CACHE_TTL_SECONDS:
+            return cached[0]
+    identity = await _load_identity(db, kind, entity_id)
+    if entries is not None:
+        if identity is None:
+            entries.pop(subject, None)
+        else:
+            entries[subject] = (identity, now)
+    return identity
+
+
+async def _identity_from_token(
+    token: str, db: AsyncSession, kind: str | None = None
+) -> Identity:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+    )
     payload = await decode_and_validate_token(token, db, expected_type="access")
     try:
-        kind, entity_id = parse_subject(payload.get("sub", ""))
+        subject_kind, entity_id = parse_subject(payload.get("sub", ""))
     except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-        )
+        raise credentials_exception
+    if kind is not None and subject_kind != kind:
+        raise credentials_exception
+    identity = await resolve_identity(db, subject_kind, entity_id)
+    if identity is None:
+        raise credentials_exception
+    return identity
 
-    if kind != "user":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-        )
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_session),
+) -> Identity:
+    return await _identity_from_token(token, db, kind="user")
+
+
+async def get_current_user_record(
+    identity: Identity = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+) -> User:
+    """Return the authenticated ``User`` row with its permissions loaded."""
 
     result = await db.execute(
-        select(User).where(User.id == entity_id).options(selectinload(User.permissions))
+        select(User).where(User.id == identity.id).options(selectinload(User.permissions))
     )
     user = result.scalar_one_or_none()
     if user is None:
@@ -309,7 +612,7 @@ async def get_current_user(
 def require_role(*roles: str):
     """Dependency factory to require a user role."""
 
-    async def role_dependency(current_user: User = Depends(get_current_user)):
+    async def role_dependency(current_user: Identity = Depends(get_current_user)):
         if current_user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -323,12 +626,11 @@ def require_role(*roles: str):
 def require_permissions(*perms: str):
     """Dependency factory to require one or more permissions."""
 
-    async def perm_dependency(current_user: User = Depends(get_current_user)):
+    async def perm_dependency(current_user: Identity = Depends(get_current_user)):
         if current_user.role == "admin":
             return current_user
-        user_perms = {p.name for p in current_user.permissions}
         for perm in perms:
-            if perm not in user_perms:
+            if perm not in current_user.permissions:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Insufficient permissions",
@@ -341,61 +643,147 @@ def require_permissions(*perms: str):
 async def get_current_identity(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_session),
-) -> tuple[str, User | Child]:
-    """Return ("user", User) or ("child", Child) based on JWT subject."""
-
-    payload = await decode_and_validate_token(token, db, expected_type="access")
-    try:
-        kind, entity_id = parse_subject(payload.get("sub", ""))
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-        )
+) -> tuple[str, Identity]:
+    """Return ("user", Identity) or ("child", Identity) based on JWT subject."""
 
-    if kind == "child":
-        child = await get_child_by_id(db, entity_id)
-        if child is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-            )
-        return "child", child
-
-    result = await db.execute(
-        select(User).where(User.id == entity_id).options(selectinload(User.permissions))
-    )
-    user = result.scalar_one_or_none()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-        )
-    return "user", user
+    identity = await _identity_from_token(token, db)
+    return identity.kind, identity
 
 
 async def get_current_child(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_session),
-):
-    payload = await decode_and_validate_token(token, db, expected_type="access")
-    try:
-        kind, entity_id = parse_subject(payload.get("sub", ""))
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+) -> Identity:
+    return await _identity_from_token(token, db, kind="child")
+
+
+@dataclass(frozen=True)
+class ChildAccess:
+    """The caller's access to one child, as resolved by :func:`authorize_child`."""
+
+    identity: Identity
+    child_id: int
+    is_owner: bool = False
+    link_mask: int = 0
+
+    @property
+    def is_admin(self) -> bool:
+        return self.identity.role == "admin"
+
+    def can(self, perm: str) -> bool:
+        """Whether the caller may use ``perm`` on this child."""
+
+        if self.identity.kind == "child":
+            return False
+        return (
+            self.is_admin
+            or self.is_owner
+            or mask_has_permission(self.link_mask, perm)
         )
-    if kind != "child":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+
+
+_CHILD_LINKS_KEY = "child_links"
+
+
+def forget_child_links(db: AsyncSession) -> None:
+    """Drop the links memoized on ``db``; call after changing a link."""
+
+    db.info.pop(_CHILD_LINKS_KEY, None)
+
+
+async def _child_link(
+    db: AsyncSession, user_id: int, child_id: int
+) -> tuple[bool, int] | None:
+    """Return ``(is_owner, permission_mask)`` for a parent link, memoized per session."""
+
+    memo = db.info.setdefault(_CHILD_LINKS_KEY, {})
+    key = (user_id, child_id)
+    if key not in memo:
+        result = await db.execute(
+            select(ChildUserLink.is_owner, ChildUserLink.permission_mask).where(
+                ChildUserLink.user_id == user_id,
+                ChildUserLink.child_id == child_id,
+            )
         )
+        row = result.first()
+        memo[key] = None if row is None else (row[0], row[1])
+    return memo[key]
 
-    child = await get_child_by_id(db, entity_id)
-    if child is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+
+async def authorize_child_access(
+    db: AsyncSession,
+    identity: Identity,
+    child_id: int,
+    perm: str | None = None,
+    *,
+    global_perm: str | None = None,
+    require_owner: bool = False,
+) -> ChildAccess:
+    """Check that ``identity`` may act on ``child_id`` and return its access.
+
+    Admins always pass and a child passes for itself.  A parent needs
+    ``global_perm`` as a user permission (``403``), a link to the child
+    (``404``), ownership if ``require_owner`` (``403``), and ``perm`` on the
+    link unless they own it (``403``).  Role and user permissions come from
+    the cached identity and the link from one primary-key lookup memoized
+    on the session, so this issues at most one query per child per request.
+    """
+
+    if identity.kind == "child":
+        if identity.id != child_id or require_owner:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        return ChildAccess(identity=identity, child_id=child_id)
+    if identity.role == "admin":
+        return ChildAccess(identity=identity, child_id=child_id)
+    if global_perm is not None and global_perm not in identity.permissions:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    link = await _child_link(db, identity.id, child_id)
+    if link is None:
+        raise HTTPException(status_code=404, detail="Child not found")
+    access = ChildAccess(
+        identity=identity,
+        child_id=child_id,
+        is_owner=link[0],
+        link_mask=link[1],
+    )
+    if require_owner and not access.is_owner:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if perm is not None and not access.can(perm):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return access
+
+
+def authorize_child(
+    perm: str | None = None,
+    *,
+    global_perm: str | None = None,
+    require_owner: bool = False,
+    allow_child: bool = False,
+):
+    """Dependency factory authorizing the caller for the ``child_id`` path param.
+
+    See :func:`authorize_child_access` for the rules.  Child tokens are
+    rejected with ``401`` unless ``allow_child`` is set.  The caller is
+    resolved through the same dependency as :func:`get_current_user` or
+    :func:`get_current_identity`, so FastAPI reuses it within a request.
+    """
+
+    caller = get_current_identity if allow_child else get_current_user
+
+    async def child_dependency(
+        child_id: int,
+        identity: Identity | tuple[str, Identity] = Depends(caller),
+        db: AsyncSession = Depends(get_session),
+    ) -> ChildAccess:
+        if isinstance(identity, tuple):
+            identity = identity[1]
+        return await authorize_child_access(
+            db,
+            identity,
+            child_id,
+            perm,
+            global_perm=global_perm,
+            require_owner=require_owner,
         )
-    return child
+
+    return child_dependency
@@ -5,12 +5,15 @@ using SQLModel and SQLAlchemy.  Centralizing the logic keeps route
 handlers light and makes behavior easier to test.
 """
 
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, delete
 from sqlalchemy.orm import selectinload
-from sqlalchemy import func, case
+from sqlalchemy import bindparam, func, case, insert, inspect, or_, true, update
 from datetime import datetime, date, timedelta, time
 from decimal import Decimal
+from typing import Awaitable, Callable
+from weakref import WeakKeyDictionary
 from app.models import (
     User,
     Child,
@@ -34,16 +37,32 @@ from app.models import (
     QuizQuestion,
     Badge,
     ChildBadge,
+    JobRun,
 )
-from app.auth import get_password_hash, get_child_by_id, is_password_hash
-from app.acl import get_default_permissions_for_role, ALL_PERMISSIONS
+from app.auth import (
+    get_password_hash_async,
+    forget_child_links,
+    get_child_by_id,
+    invalidate_identity,
+    is_password_hash,
+)
+from app.acl import get_default_permissions_for_role, ALL_PERMISSIONS, PERMISSION_BITS
+from app.job_metrics import JobMetrics
+from app.schemas import ChildRead, DashboardCD, DashboardChild
 from app.money import (
     ZERO_MONEY,
     as_decimal,
+    from_cents,
+    interest_cents,
     percentage_of,
     quantize_money,
     quantize_rate,
+    rate_to_micros,
+    to_cents,
 )
+import os
+import re
+import time as time_module
 import uuid
 
 
@@ -83,6 +102,7 @@ async def assign_permissions_by_names(
                     UserPermissionLink(user_id=user.id, permission_id=perm.id)
                 )
     await db.commit()
+    invalidate_identity("user", user.id)
 
 
 async def remove_permissions_by_names(
@@ -103,6 +123,7 @@ async def remove_permissions_by_names(
                 )
             )
     await db.commit()
+    invalidate_identity("user", user.id)
 
 
 async def get_all_permissions(db: AsyncSession) -> list[Permission]:
@@ -112,39 +133,122 @@ async def get_all_permissions(db: AsyncSession) -> list[Permission]:
     return result.scalars().all()
 
 
+SETTINGS_CACHE_TTL_SECONDS = float(os.getenv("SETTINGS_CACHE_TTL_SECONDS", "30"))
+
+
+class _CachedSettings:
+    def __init__(self, settings: Settings) -> None:
+        self.values = settings.model_dump()
+        self.version = settings.version
+        self.checked_at = time_module.monotonic()
+
+    def copy(self) -> Settings:
+        return Settings(**self.values)
+
+
+# One entry per engine, so separate databases never share settings.
+_settings_cache: WeakKeyDictionary[Engine, _CachedSettings] = WeakKeyDictionary()
+
+
+def _settings_cache_key(db: AsyncSession) -> Engine | None:
+    return db.bind.sync_engine if db.bind is not None else None
+
+
+def clear_settings_cache() -> None:
+    """Forget every cached settings row in this process."""
+
+    _settings_cache.clear()
+
+
 async def get_settings(db: AsyncSession) -> Settings:
-    """Fetch the singleton settings record, creating it if necessary."""
-    result = await db.execute(select(Settings).where(Settings.id == 1))
+    """Fetch the singleton settings record, creating it if necessary.
+
+    The row is cached per process.  Within ``SETTINGS_CACHE_TTL_SECONDS``
+    the cached copy is returned without touching the database; after that
+    only ``Settings.version`` is read, and the row is reloaded if another
+    worker has saved a newer version.  The returned object is a detached
+    copy: change settings through :func:`save_settings`.
+    """
+
+    key = _settings_cache_key(db)
+    cached = _settings_cache.get(key) if key is not None else None
+    if cached is not None:
+        now = time_module.monotonic()
+        if now - cached.checked_at < SETTINGS_CACHE_TTL_SECONDS:
+            return cached.copy()
+        result = await db.execute(select(Settings.version).where(Settings.id == 1))
+        if result.scalar_one_or_none() == cached.version:
+            cached.checked_at = now
+            return cached.copy()
+
+    result = await db.execute(
+        select(Settings)
+        .where(Settings.id == 1)
+        .execution_options(populate_existing=True)
+    )
     settings = result.scalar_one_or_none()
     if not settings:
         settings = Settings()
         db.add(settings)
         await db.commit()
         await db.refresh(settings)
-    return settings
+    entry = _CachedSettings(settings)
+    if key is not None:
+        _settings_cache[key] = entry
+    return entry.copy()
+
+
+_SETTINGS_RATE_FIELDS = (
+    "default_interest_rate",
+    "default_penalty_interest_rate",
+    "default_cd_penalty_rate",
+)
+_SETTINGS_MONEY_FIELDS = ("service_fee_amount", "overdraft_fee_amount")
+
 
+async def save_settings(db: AsyncSession, changes: dict) -> Settings:
+    """Write the changed settings fields and return the fresh row.
 
-async def save_settings(db: AsyncSession, settings: Settings) -> Settings:
-    """Persist settings changes and return the refreshed object."""
+    Only the columns in ``changes`` are updated, so a save never writes
+    back other fields from a possibly stale cached copy and cannot undo
+    another worker's change.  Every settings column is required, so
+    ``None`` values leave their field unchanged.  Bumps ``Settings.version`` and refreshes this
+    process's cache, so other workers pick up the change on their next
+    version check.
+    """
 
-    settings.default_interest_rate = quantize_rate(settings.default_interest_rate)
-    settings.default_penalty_interest_rate = quantize_rate(
-        settings.default_penalty_interest_rate
+    changes = {field: value for field, value in changes.items() if value is not None}
+    for field in _SETTINGS_RATE_FIELDS:
+        if field in changes:
+            changes[field] = quantize_rate(changes[field])
+    for field in _SETTINGS_MONEY_FIELDS:
+        if field in changes:
+            changes[field] = quantize_money(changes[field])
+    await get_settings(db)  # creates the row on first use
+    await db.execute(
+        update(Settings)
+        .where(Settings.id == 1)
+        .values(**changes, version=Settings.version + 1)
     )
-    settings.default_cd_penalty_rate = quantize_rate(settings.default_cd_penalty_rate)
-    settings.service_fee_amount = quantize_money(settings.service_fee_amount)
-    settings.overdraft_fee_amount = quantize_money(settings.overdraft_fee_amount)
-    db.add(settings)
     await db.commit()
-    await db.refresh(settings)
-    return settings
+    result = await db.execute(
+        select(Settings)
+        .where(Settings.id == 1)
+        .execution_options(populate_existing=True)
+    )
+    entry = _CachedSettings(result.scalar_one())
+    key = _settings_cache_key(db)
+    if key is not None:
+        _settings_cache[key] = entry
+    return entry.copy()
 
 
 async def create_user(db: AsyncSession, user: User):
     """Create a new user, hashing the password and assigning defaults."""
 
     if not is_password_hash(user.password_hash):
-        user.password_hash = get_password_hash(user.password_hash)
+        user.password_hash = await get_password_hash_async(user.password_hash)
+        user.password_migrated = True
     db.add(user)
     await db.commit()
     await db.refresh(user)
@@ -189,14 +293,17 @@ async def save_user(db: AsyncSession, user: User) -> User:
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    invalidate_identity("user", user.id)
     return user
 
 
 async def delete_user(db: AsyncSession, user: User) -> None:
     """Remove a user from the database."""
 
+    user_id = user.id
     await db.delete(user)
     await db.commit()
+    invalidate_identity("user", user_id)
 
 
 async def create_child(db: AsyncSession, child: Child):
@@ -232,6 +339,7 @@ async def create_child_for_user(db: AsyncSession, child: Child, user_id: int):
     db.add(link)
 
     await db.commit()
+    forget_child_links(db)
     await db.refresh(child)
     return child
 
@@ -247,6 +355,57 @@ async def get_children_by_user(db: AsyncSession, user_id: int):
     return result.scalars().all()
 
 
+CHILD_SORT_COLUMNS = {
+    "id": Child.id,
+    "first_name": Child.first_name,
+    "balance": Account.balance,
+}
+
+
+async def get_children_with_accounts(
+    db: AsyncSession,
+    *,
+    user_id: int | None = None,
+    permission: str | None = None,
+    sort: str = "id",
+    descending: bool = False,
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[tuple[Child, Account | None]]:
+    """Return children paired with their accounts in a single query.
+
+    ``user_id`` restricts the result to children linked to that parent and,
+    with ``permission``, to links that own the child or grant it.
+    ``sort`` is a key of :data:`CHILD_SORT_COLUMNS`; ties fall back to id.
+    """
+
+    column = CHILD_SORT_COLUMNS[sort]
+    query = (
+        select(Child, Account)
+        .outerjoin(Account, Account.child_id == Child.id)
+        .order_by(column.desc() if descending else column.asc(), Child.id)
+        .offset(offset)
+    )
+    if user_id is not None:
+        query = query.join(ChildUserLink, ChildUserLink.child_id == Child.id).where(
+            ChildUserLink.user_id == user_id
+        )
+        if permission is not None:
+            query = query.where(
+                or_(
+                    ChildUserLink.is_owner == true(),
+                    ChildUserLink.permission_mask.op("&")(
+                        PERMISSION_BITS.get(permission, 0)
+                    )
+                    != 0,
+                )
+            )
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return [(child, account) for child, account in result.all()]
+
+
 async def get_child_by_access_code(db: AsyncSession, access_code: str):
     """Return a child by their unique access code."""
     result = await db.execute(
@@ -274,22 +433,26 @@ async def save_child(db: AsyncSession, child: Child) -> Child:
     db.add(child)
     await db.commit()
     await db.refresh(child)
+    invalidate_identity("child", child.id)
     return child
 
 
 async def delete_child(db: AsyncSession, child: Child) -> None:
     """Remove a child record."""
+    child_id = child.id
     await db.execute(
-        delete(Transaction).where(Transaction.child_id == child.id)
+        delete(Transaction).where(Transaction.child_id == child_id)
     )
     await db.execute(
-        delete(Account).where(Account.child_id == child.id)
+        delete(Account).where(Account.child_id == child_id)
     )
     await db.execute(
-        delete(ChildUserLink).where(ChildUserLink.child_id == child.id)
+        delete(ChildUserLink).where(ChildUserLink.child_id == child_id)
     )
     await db.delete(child)
     await db.commit()
+    forget_child_links(db)
+    invalidate_identity("child", child_id)
 
 
 async def set_child_frozen(
@@ -304,6 +467,7 @@ async def set_child_frozen(
     db.add(child)
     await db.commit()
     await db.refresh(child)
+    invalidate_identity("child", child.id)
     return child
 
 
@@ -330,6 +494,7 @@ async def link_child_to_user(
     )
     db.add(link)
     await db.commit()
+    forget_child_links(db)
     await db.refresh(link)
     return link
 
@@ -342,6 +507,7 @@ async def remove_child_link(db: AsyncSession, child_id: int, user_id: int) -> No
         )
     )
     await db.commit()
+    forget_child_links(db)
 
 
 async def get_parents_for_child(
@@ -444,10 +610,39 @@ async def set_cd_penalty_rate(
     return account
 
 
+def signed_amount(tx_type: str, amount) -> Decimal:
+    """Return the balance effect of a ledger entry (credits positive)."""
+
+    value = quantize_money(amount)
+    return value if tx_type == "credit" else -value
+
+
+async def adjust_account_balance(
+    db: AsyncSession, child_id: int, delta: Decimal
+) -> None:
+    """Apply ``delta`` to the materialized balance inside the current transaction.
+
+    The update is a single ``balance = balance + delta`` statement so concurrent
+    writers never overwrite each other's changes.  Callers are responsible for
+    committing alongside the ledger rows that caused the change.
+    """
+
+    delta = quantize_money(delta)
+    if delta == ZERO_MONEY:
+        return
+    await db.execute(
+        update(Account)
+        .where(Account.child_id == child_id)
+        .values(balance=Account.balance + delta)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
 async def create_transaction(db: AsyncSession, tx: Transaction) -> Transaction:
-    """Persist a ledger transaction."""
+    """Persist a ledger transaction and update the account balance."""
     tx.amount = quantize_money(tx.amount)
     db.add(tx)
+    await adjust_account_balance(db, tx.child_id, signed_amount(tx.type, tx.amount))
     await db.commit()
     await db.refresh(tx)
     return tx
@@ -463,18 +658,39 @@ async def get_transaction(
     return result.scalar_one_or_none()
 
 
+def _persisted_value(tx: Transaction, attr: str):
+    """Return the value of ``attr`` as last loaded from the database."""
+
+    history = inspect(tx).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(tx, attr)
+
+
 async def save_transaction(db: AsyncSession, tx: Transaction) -> Transaction:
-    """Persist updates to a transaction."""
+    """Persist updates to a transaction and rebalance the affected account."""
 
+    old_child_id = _persisted_value(tx, "child_id")
+    old_effect = signed_amount(
+        _persisted_value(tx, "type"), _persisted_value(tx, "amount")
+    )
+    tx.amount = quantize_money(tx.amount)
+    new_effect = signed_amount(tx.type, tx.amount)
     db.add(tx)
+    if old_child_id != tx.child_id:
+        await adjust_account_balance(db, old_child_id, -old_effect)
+        await adjust_account_balance(db, tx.child_id, new_effect)
+    else:
+        await adjust_account_balance(db, tx.child_id, new_effect - old_effect)
     await db.commit()
     await db.refresh(tx)
     return tx
 
 
 async def delete_transaction(db: AsyncSession, tx: Transaction) -> None:
-    """Remove a transaction from the ledger."""
+    """Remove a transaction from the ledger and reverse its balance effect."""
 
+    await adjust_account_balance(db, tx.child_id, -signed_amount(tx.type, tx.amount))
     await db.delete(tx)
     await db.commit()
 
@@ -492,6 +708,52 @@ async def get_transactions_by_child(
     return result.scalars().all()
 
 
+async def get_transactions_page(
+    db: AsyncSession,
+    child_id: int,
+    *,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    tx_type: str | None = None,
+    initiated_by: str | None = None,
+) -> tuple[list[Transaction], tuple[datetime, int] | None]:
+    """Return one newest-first page of a child's ledger.
+
+    Pages are keyed on ``(timestamp, id)`` so each request is an index range
+    scan on ``(child_id, timestamp)`` regardless of how deep the caller is.
+    ``after`` is the key of the last row of the previous page.  Returns the
+    rows and the key to pass for the next page, or ``None`` when exhausted.
+    """
+
+    stmt = select(Transaction).where(Transaction.child_id == child_id)
+    if after is not None:
+        after_ts, after_id = after
+        stmt = stmt.where(
+            (Transaction.timestamp < after_ts)
+            | ((Transaction.timestamp == after_ts) & (Transaction.id < after_id))
+        )
+    if start is not None:
+        stmt = stmt.where(Transaction.timestamp >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.timestamp < end)
+    if tx_type is not None:
+        stmt = stmt.where(Transaction.type == tx_type)
+    if initiated_by is not None:
+        stmt = stmt.where(Transaction.initiated_by == initiated_by)
+    stmt = stmt.order_by(Transaction.timestamp.desc(), Transaction.id.desc()).limit(
+        limit + 1
+    )
+    result = await db.execute(stmt)
+    rows = list(result.scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, (last.timestamp, last.id)
+
+
 async def get_all_transactions(db: AsyncSession) -> list[Transaction]:
     """Return the full ledger across all children."""
 
@@ -501,10 +763,10 @@ async def get_all_transactions(db: AsyncSession) -> list[Transaction]:
     return result.scalars().all()
 
 
-async def calculate_balance(db: AsyncSession, child_id: int) -> Decimal:
-    """Calculate the running balance for a child's account."""
+def _ledger_total():
+    """SQL expression summing credits minus debits."""
 
-    total = func.coalesce(
+    return func.coalesce(
         func.sum(
             case(
                 (Transaction.type == "credit", Transaction.amount),
@@ -513,105 +775,486 @@ async def calculate_balance(db: AsyncSession, child_id: int) -> Decimal:
         ),
         0,
     )
+
+
+async def calculate_ledger_balance(db: AsyncSession, child_id: int) -> Decimal:
+    """Sum every ledger row for a child; the reference for ``Account.balance``."""
+
     result = await db.execute(
-        select(total).where(Transaction.child_id == child_id)
+        select(_ledger_total()).where(Transaction.child_id == child_id)
     )
     return quantize_money(result.scalar_one())
 
 
-async def recalc_interest(db: AsyncSession, child_id: int) -> None:
-    """Recalculate and post daily interest transactions."""
-    account = await get_account_by_child(db, child_id)
-    if not account:
-        raise ValueError("Account not found")
+async def calculate_balance(db: AsyncSession, child_id: int) -> Decimal:
+    """Return the running balance for a child's account.
 
-    # Determine starting point for recalculation
-    first_tx_result = await db.execute(
-        select(func.min(Transaction.timestamp)).where(
-            Transaction.child_id == child_id
-        )
+    Reads the materialized ``Account.balance``; children without an account
+    row fall back to summing the ledger.
+    """
+
+    result = await db.execute(
+        select(Account.balance).where(Account.child_id == child_id)
     )
-    first_tx_time = first_tx_result.scalar_one_or_none()
-    if not first_tx_time:
-        account.last_interest_applied = date.today()
-        db.add(account)
-        await db.commit()
-        return
+    balance = result.scalar_one_or_none()
+    if balance is None:
+        return await calculate_ledger_balance(db, child_id)
+    return quantize_money(balance)
 
-    start_date = account.last_interest_applied or first_tx_time.date()
-    today = date.today()
 
-    # Balance prior to start_date
-    bal_before_result = await db.execute(
-        select(
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Transaction.type == "credit", Transaction.amount),
-                        else_=-Transaction.amount,
-                    )
-                ),
-                0.0,
-            )
-        ).where(
-            Transaction.child_id == child_id,
-            Transaction.timestamp < datetime.combine(start_date, time.min),
-        )
+async def rebuild_account_balances(
+    db: AsyncSession, child_id: int | None = None
+) -> int:
+    """Recompute ``Account.balance`` from the ledger.
+
+    Runs as one correlated ``UPDATE`` so it is safe alongside live writers.
+    Returns the number of accounts touched.
+    """
+
+    ledger_sum = (
+        select(_ledger_total())
+        .where(Transaction.child_id == Account.child_id)
+        .scalar_subquery()
     )
-    current_balance = quantize_money(bal_before_result.scalar_one())
+    stmt = update(Account).values(balance=ledger_sum)
+    if child_id is not None:
+        stmt = stmt.where(Account.child_id == child_id)
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    await db.commit()
+    return result.rowcount or 0
+
+
+_CD_MEMO = re.compile(
+    r"^CD #(\d+) (purchase|maturity|early withdrawal penalty|early withdrawal)$"
+)
+_LOAN_MEMO = re.compile(r"^Loan #(\d+) (disbursement|payment)$")
+_SYSTEM_MEMO_SOURCES = {
+    "Interest": "interest",
+    "Service Fee": "service_fee",
+    "Overdraft Fee": "overdraft_fee",
+    "Promotion": "promotion",
+}
+
 
+def cd_transaction_key(cd_id: int, event: str) -> str:
+    """Idempotency key of the ledger row for ``event`` on a CD."""
+
+    return f"cd:{cd_id}:{event.replace(' ', '_')}"
+
+
+async def _transaction_key_exists(db: AsyncSession, key: str) -> bool:
     result = await db.execute(
-        select(Transaction)
-        .where(
-            Transaction.child_id == child_id,
-            Transaction.timestamp >= datetime.combine(start_date, time.min),
-        )
-        .order_by(Transaction.timestamp)
+        select(Transaction.id).where(Transaction.idempotency_key == key)
     )
-    txs = list(result.scalars().all())
+    return result.first() is not None
 
-    total_interest = quantize_money(account.total_interest_earned)
-    tx_idx = 0
 
-    day = start_date
-    while day < today:
-        while tx_idx < len(txs) and txs[tx_idx].timestamp.date() == day:
-            tx = txs[tx_idx]
-            if tx.type == "credit":
-                current_balance = quantize_money(current_balance + tx.amount)
-            else:
-                current_balance = quantize_money(current_balance - tx.amount)
-            tx_idx += 1
+async def backfill_transaction_sources(
+    db: AsyncSession, batch_size: int = 1000
+) -> int:
+    """Derive ``source_type``/``source_id`` for legacy rows from their memos.
+
+    CD and loan rows are recognised by their ``CD #<id> ...`` and
+    ``Loan #<id> ...`` memos (CD rows also get their idempotency key), chore
+    payouts by their ``Chore:`` prefix, and system rows by the fixed interest,
+    fee and promotion memos or by matching one of the child's recurring
+    charges.  Rows that match nothing are left alone.  Returns the number
+    of rows updated.
+    """
 
-        rate = quantize_rate(
-            account.interest_rate
-            if current_balance >= ZERO_MONEY
-            else account.penalty_interest_rate
+    charges: dict[tuple[int, str | None], list[int]] = {}
+    result = await db.execute(
+        select(RecurringCharge.id, RecurringCharge.child_id, RecurringCharge.memo)
+    )
+    for charge_id, child_id, memo in result.all():
+        charges.setdefault((child_id, memo), []).append(charge_id)
+    result = await db.execute(
+        select(Transaction.idempotency_key).where(
+            Transaction.idempotency_key.is_not(None)
         )
-        interest = percentage_of(current_balance, rate)
-        if interest != ZERO_MONEY:
-            tx_time = datetime.combine(day + timedelta(days=1), time.min)
-            interest_tx = Transaction(
-                child_id=child_id,
-                type="credit" if interest >= ZERO_MONEY else "debit",
-                amount=abs(interest),
-                memo="Interest",
-                initiated_by="system",
-                initiator_id=0,
-                timestamp=tx_time,
+    )
+    used_keys = set(result.scalars().all())
+
+    stmt = update(Transaction.__table__).where(
+        Transaction.__table__.c.id == bindparam("b_id")
+    ).values(
+        source_type=bindparam("b_source_type"),
+        source_id=bindparam("b_source_id"),
+        idempotency_key=bindparam("b_key"),
+    )
+    updated = 0
+    after_id = 0
+    while True:
+        result = await db.execute(
+            select(
+                Transaction.id,
+                Transaction.child_id,
+                Transaction.memo,
+                Transaction.initiated_by,
             )
-            db.add(interest_tx)
-            current_balance = quantize_money(current_balance + interest)
-            total_interest = quantize_money(total_interest + interest)
+            .where(Transaction.source_type.is_(None), Transaction.id > after_id)
+            .order_by(Transaction.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            return updated
+        params = []
+        for tx_id, child_id, memo, initiated_by in rows:
+            source_type, source_id, key = None, None, None
+            memo = memo or ""
+            if match := _CD_MEMO.match(memo):
+                source_type, source_id = "cd", int(match.group(1))
+                key = cd_transaction_key(source_id, match.group(2))
+                if key in used_keys:
+                    key = None
+                else:
+                    used_keys.add(key)
+            elif match := _LOAN_MEMO.match(memo):
+                source_type, source_id = "loan", int(match.group(1))
+            elif memo.startswith("Chore: "):
+                source_type = "chore"
+            elif initiated_by == "system":
+                source_type = _SYSTEM_MEMO_SOURCES.get(memo)
+                matching = charges.get((child_id, memo or None), [])
+                if source_type is None and len(matching) == 1:
+                    source_type, source_id = "recurring_charge", matching[0]
+            if source_type is not None:
+                params.append(
+                    {
+                        "b_id": tx_id,
+                        "b_source_type": source_type,
+                        "b_source_id": source_id,
+                        "b_key": key,
+                    }
+                )
+        if params:
+            await db.execute(stmt, params)
+        await db.commit()
+        updated += len(params)
+        after_id = rows[-1][0]
+
+
+def interest_schedule(
+    opening_cents: int,
+    deltas: dict[date, int],
+    start: date,
+    end: date,
+    interest_rate,
+    penalty_rate,
+) -> list[tuple[date, int]]:
+    """Return ``(day, interest_cents)`` postings for each day in ``[start, end)``.
+
+    ``opening_cents`` is the balance before ``start`` and ``deltas`` maps a day
+    to the net ledger change on that day.  The balance is walked segment by
+    segment between ledger days in integer cents, rounding each day exactly
+    like ``percentage_of``.  Once a day earns zero interest the balance cannot
+    move again until the next ledger day, so the rest of that quiet stretch is
+    skipped in one step.
+    """
 
+    rate_micros = rate_to_micros(interest_rate)
+    penalty_micros = rate_to_micros(penalty_rate)
+    change_days = sorted(day for day in deltas if start <= day < end)
+    postings: list[tuple[date, int]] = []
+    balance = opening_cents
+    next_change = 0
+    day = start
+    while day < end:
+        if next_change < len(change_days) and change_days[next_change] == day:
+            balance += deltas[day]
+            next_change += 1
+        interest = interest_cents(
+            balance, rate_micros if balance >= 0 else penalty_micros
+        )
+        if interest == 0:
+            day = (
+                change_days[next_change]
+                if next_change < len(change_days)
+                else end
+            )
+            continue
+        postings.append((day, interest))
+        balance += interest
         day += timedelta(days=1)
+    return postings
+
+
+INTEREST_POSTING_FREQUENCIES = ("daily", "weekly", "monthly")
+
+
+def interest_period_end(day: date, frequency: str) -> date:
+    """Return the first day after the posting period that contains ``day``.
+
+    Daily periods end the next midnight, weekly periods on Monday and
+    monthly periods on the first of the following month.
+    """
+
+    if frequency == "weekly":
+        return day + timedelta(days=7 - day.weekday())
+    if frequency == "monthly":
+        return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def consolidate_interest(
+    daily: list[tuple[date, int]],
+    carried_cents: int,
+    carried_day: date,
+    frequency: str,
+    today: date,
+) -> tuple[list[tuple[date, int]], int]:
+    """Group daily interest into posting periods.
+
+    ``carried_cents`` is interest already accrued for ``carried_day``'s
+    period.  Returns ``(period_end, cents)`` for every non-zero period that
+    closed on or before ``today`` plus the cents still accruing in the open
+    period.
+    """
+
+    totals: dict[date, int] = {}
+    if carried_cents:
+        totals[interest_period_end(carried_day, frequency)] = carried_cents
+    for day, cents in daily:
+        period_end = interest_period_end(day, frequency)
+        totals[period_end] = totals.get(period_end, 0) + cents
+    posted = [
+        (period_end, cents)
+        for period_end, cents in sorted(totals.items())
+        if period_end <= today and cents
+    ]
+    accrued = sum(
+        cents for period_end, cents in totals.items() if period_end > today
+    )
+    return posted, accrued
+
+
+def _interest_rows(child_id: int, postings: list[tuple[date, int]]) -> list[dict]:
+    """Build bulk-insert rows for interest postings stamped at period end."""
+
+    return [
+        {
+            "child_id": child_id,
+            "type": "credit" if cents >= 0 else "debit",
+            "amount": from_cents(abs(cents)),
+            "memo": "Interest",
+            "initiated_by": "system",
+            "initiator_id": 0,
+            "timestamp": datetime.combine(period_end, time.min),
+            "source_type": "interest",
+        }
+        for period_end, cents in postings
+    ]
+
+
+async def _daily_ledger_deltas(
+    db: AsyncSession, child_id: int, since: date
+) -> dict[date, int]:
+    """Net ledger change in cents per calendar day from ``since`` onwards."""
+
+    by_child = await _ledger_deltas_by_child(db, since, child_ids=[child_id])
+    return by_child.get(child_id, {})
+
 
-    account.total_interest_earned = quantize_money(total_interest)
+async def _ledger_deltas_by_child(
+    db: AsyncSession, since: date, *, child_ids: list[int] | None = None
+) -> dict[int, dict[date, int]]:
+    """Net ledger change in cents per child and calendar day since ``since``."""
+
+    day_col = func.date(Transaction.timestamp)
+    query = (
+        select(Transaction.child_id, day_col, _ledger_total())
+        .where(Transaction.timestamp >= datetime.combine(since, time.min))
+        .group_by(Transaction.child_id, day_col)
+    )
+    if child_ids is not None:
+        query = query.where(Transaction.child_id.in_(child_ids))
+    result = await db.execute(query)
+    deltas: dict[int, dict[date, int]] = {}
+    for row_child_id, day, total in result.all():
+        deltas.setdefault(row_child_id, {})[
+            date.fromisoformat(str(day)[:10])
+        ] = to_cents(total)
+    return deltas
+
+
+async def _interest_since_last_run(
+    db: AsyncSession, account: Account, today: date
+) -> tuple[date, list[tuple[date, int]]] | None:
+    """Return the start day and daily interest owed up to ``today``.
+
+    ``None`` means the child has no ledger history to earn interest on yet.
+    """
+
+    start_date = account.last_interest_applied
+    if start_date is None:
+        # Determine starting point for recalculation
+        first_tx_result = await db.execute(
+            select(func.min(Transaction.timestamp)).where(
+                Transaction.child_id == account.child_id
+            )
+        )
+        first_tx_time = first_tx_result.scalar_one_or_none()
+        if not first_tx_time:
+            return None
+        start_date = first_tx_time.date()
+
+    # Only ledger days since start_date are read; the opening balance is
+    # derived from the materialized balance rather than re-summing history.
+    # Unposted interest keeps compounding, so it counts toward the balance.
+    deltas = await _daily_ledger_deltas(db, account.child_id, start_date)
+    balance_cents = to_cents(await calculate_balance(db, account.child_id))
+    opening_cents = (
+        balance_cents - sum(deltas.values()) + to_cents(account.accrued_interest)
+    )
+    return start_date, interest_schedule(
+        opening_cents,
+        deltas,
+        start_date,
+        today,
+        account.interest_rate,
+        account.penalty_interest_rate,
+    )
+
+
+async def recalc_interest(
+    db: AsyncSession, child_id: int, frequency: str | None = None
+) -> None:
+    """Accrue daily interest and post it once per posting period.
+
+    ``frequency`` defaults to ``Settings.interest_posting_frequency``.
+    Interest for the still-open period is kept in ``accrued_interest``.
+    """
+    account = await get_account_by_child(db, child_id)
+    if not account:
+        raise ValueError("Account not found")
+    if frequency is None:
+        frequency = (await get_settings(db)).interest_posting_frequency
+
+    today = date.today()
+    pending = await _interest_since_last_run(db, account, today)
+    if pending is None:
+        account.last_interest_applied = today
+        db.add(account)
+        await db.commit()
+        return
+    start_date, daily = pending
+
+    postings, accrued_cents = consolidate_interest(
+        daily,
+        to_cents(account.accrued_interest),
+        start_date - timedelta(days=1),
+        frequency,
+        today,
+    )
+    posted_interest = from_cents(sum(cents for _, cents in postings))
+    if postings:
+        await db.execute(insert(Transaction), _interest_rows(child_id, postings))
+
+    account.total_interest_earned = quantize_money(
+        quantize_money(account.total_interest_earned) + posted_interest
+    )
+    account.accrued_interest = from_cents(accrued_cents)
     account.last_interest_applied = today
     db.add(account)
+    await adjust_account_balance(db, child_id, posted_interest)
     await db.commit()
 
 
+async def get_accrued_interest(db: AsyncSession, account: Account) -> Decimal:
+    """Project interest earned but not yet posted to the ledger, as of today.
+
+    Adds the stored ``accrued_interest`` to whatever the next run of
+    :func:`recalc_interest` would accrue, without writing anything.
+    """
+
+    pending = await _interest_since_last_run(db, account, date.today())
+    pending_cents = sum(cents for _, cents in pending[1]) if pending else 0
+    return from_cents(to_cents(account.accrued_interest) + pending_cents)
+
+
+async def get_accrued_interest_by_child(
+    db: AsyncSession, accounts: list[Account]
+) -> dict[int, Decimal]:
+    """Batch form of :func:`get_accrued_interest` keyed by child id.
+
+    Reads the first ledger day and the daily deltas for all ``accounts`` with
+    one grouped query each, instead of two or three queries per account.
+    """
+
+    if not accounts:
+        return {}
+    today = date.today()
+    child_ids = [account.child_id for account in accounts]
+    unstarted = [a.child_id for a in accounts if a.last_interest_applied is None]
+    first_tx_day: dict[int, date] = {}
+    if unstarted:
+        result = await db.execute(
+            select(Transaction.child_id, func.min(Transaction.timestamp))
+            .where(Transaction.child_id.in_(unstarted))
+            .group_by(Transaction.child_id)
+        )
+        first_tx_day = {child_id: first.date() for child_id, first in result.all()}
+    start_days = {
+        account.child_id: account.last_interest_applied
+        or first_tx_day.get(account.child_id)
+        for account in accounts
+    }
+    known_starts = [day for day in start_days.values() if day is not None]
+    deltas_by_child = (
+        await _ledger_deltas_by_child(db, min(known_starts), child_ids=child_ids)
+        if known_starts
+        else {}
+    )
+
+    accrued: dict[int, Decimal] = {}
+    for account in accounts:
+        accrued_cents = to_cents(account.accrued_interest)
+        start_date = start_days[account.child_id]
+        if start_date is not None:
+            deltas = {
+                day: cents
+                for day, cents in deltas_by_child.get(account.child_id, {}).items()
+                if day >= start_date
+            }
+            daily = interest_schedule(
+                to_cents(account.balance) - sum(deltas.values()) + accrued_cents,
+                deltas,
+                start_date,
+                today,
+                account.interest_rate,
+                account.penalty_interest_rate,
+            )
+            accrued_cents += sum(cents for _, cents in daily)
+        accrued[account.child_id] = from_cents(accrued_cents)
+    return accrued
+
+
+async def build_child_reads(
+    db: AsyncSession, rows: list[tuple[Child, Account | None]]
+) -> list[ChildRead]:
+    """Build ``ChildRead`` responses for ``(child, account)`` pairs."""
+
+    accrued = await get_accrued_interest_by_child(
+        db, [account for _, account in rows if account is not None]
+    )
+    return [
+        ChildRead.from_child(child, account, accrued.get(child.id))
+        for child, account in rows
+    ]
+
+
+async def build_child_read(
+    db: AsyncSession, child: Child, account: Account | None = None
+) -> ChildRead:
+    """Build the ``ChildRead`` for one child, loading its account if needed."""
+
+    if account is None:
+        account = await get_account_by_child(db, child.id)
+    accrued = await get_accrued_interest(db, account) if account else None
+    return ChildRead.from_child(child, account, accrued)
+
+
 async def apply_service_fee(
     db: AsyncSession, account: Account, settings: Settings, today: date
 ) -> None:
@@ -636,10 +1279,12 @@ async def apply_service_fee(
         initiated_by="system",
         initiator_id=0,
         timestamp=datetime.combine(today, time.min),
+        source_type="service_fee",
     )
     account.service_fee_last_charged = today
     db.add(tx)
     db.add(account)
+    await adjust_account_balance(db, account.child_id, -fee)
     await db.commit()
 
 
@@ -664,8 +1309,10 @@ async def apply_overdraft_fee(
                         memo="Overdraft Fee",
                         initiated_by="system",
                         initiator_id=0,
+                        source_type="overdraft_fee",
                     )
                     db.add(tx)
+                    await adjust_account_balance(db, account.child_id, -fee)
                     account.overdraft_fee_last_charged = today
             else:
                 if not account.overdraft_fee_charged:
@@ -676,8 +1323,10 @@ async def apply_overdraft_fee(
                         memo="Overdraft Fee",
                         initiated_by="system",
                         initiator_id=0,
+                        source_type="overdraft_fee",
                     )
                     db.add(tx)
+                    await adjust_account_balance(db, account.child_id, -fee)
                     account.overdraft_fee_charged = True
                     account.overdraft_fee_last_charged = today
     else:
@@ -688,6 +1337,234 @@ async def apply_overdraft_fee(
     await db.commit()
 
 
+Shard = tuple[int, int]
+"""``(index, count)``: the slice of children with ``child_id % count == index``."""
+
+
+def _in_shard(child_id_column, shard: Shard | None):
+    """SQL filter restricting ``child_id_column`` to ``shard`` (no-op if None)."""
+
+    if shard is None:
+        return true()
+    index, count = shard
+    return child_id_column % count == index
+
+
+async def apply_interest_and_fees_batch(
+    db: AsyncSession,
+    settings: Settings,
+    today: date | None = None,
+    *,
+    batch_size: int | None = None,
+    after_child_id: int | None = None,
+    on_chunk: Callable[[int], Awaitable[None]] | None = None,
+    shard: Shard | None = None,
+    metrics: JobMetrics | None = None,
+) -> int:
+    """Run the daily interest, service-fee and overdraft pass for all accounts.
+
+    This is the set-based equivalent of calling :func:`recalc_interest`,
+    :func:`apply_service_fee` and :func:`apply_overdraft_fee` per account,
+    which remain the reference implementation.  Accounts are streamed in
+    ``child_id`` order, ``batch_size`` (default
+    ``Settings.daily_job_chunk_size``) at a time, starting after
+    ``after_child_id``.  Each chunk reads its per-day ledger totals with a
+    couple of grouped queries, is computed in memory, and is written with
+    one bulk insert and one ``executemany`` update before committing.
+    ``on_chunk`` is awaited with the chunk's last ``child_id`` just before
+    that commit so callers can record a checkpoint atomically.  ``shard``
+    limits the pass to one slice of children.  Each chunk is timed as one
+    item of ``metrics``.  Returns the number of accounts processed.
+    """
+
+    today = today or date.today()
+    metrics = metrics or JobMetrics()
+    frequency = settings.interest_posting_frequency
+    batch_size = batch_size or settings.daily_job_chunk_size
+    account_values = update(Account.__table__).where(
+        Account.__table__.c.id == bindparam("b_id")
+    ).values(
+        balance=Account.__table__.c.balance + bindparam("b_balance_delta"),
+        total_interest_earned=Account.__table__.c.total_interest_earned
+        + bindparam("b_interest"),
+        accrued_interest=bindparam("b_accrued"),
+        last_interest_applied=bindparam("b_last_interest"),
+        service_fee_last_charged=bindparam("b_service_fee_last"),
+        overdraft_fee_last_charged=bindparam("b_overdraft_last"),
+        overdraft_fee_charged=bindparam("b_overdraft_charged"),
+    )
+
+    processed = 0
+    while True:
+        query = (
+            select(Account)
+            .where(_in_shard(Account.child_id, shard))
+            .order_by(Account.child_id)
+            .limit(batch_size)
+            .execution_options(populate_existing=True)
+        )
+        if after_child_id is not None:
+            query = query.where(Account.child_id > after_child_id)
+        result = await db.execute(query)
+        accounts = result.scalars().all()
+        if not accounts:
+            return processed
+        child_ids = [account.child_id for account in accounts]
+
+        with metrics.item():
+            first_tx_result = await db.execute(
+                select(Transaction.child_id, func.min(Transaction.timestamp))
+                .where(Transaction.child_id.in_(child_ids))
+                .group_by(Transaction.child_id)
+            )
+            first_tx_day = {
+                child_id: first.date() for child_id, first in first_tx_result.all()
+            }
+            start_days = {
+                account.child_id: account.last_interest_applied
+                or first_tx_day.get(account.child_id)
+                for account in accounts
+            }
+            known_starts = [day for day in start_days.values() if day is not None]
+            deltas_by_child = (
+                await _ledger_deltas_by_child(
+                    db, min(known_starts), child_ids=child_ids
+                )
+                if known_starts
+                else {}
+            )
+
+            tx_rows: list[dict] = []
+            account_rows: list[dict] = []
+            for account in accounts:
+                child_id = account.child_id
+                balance = quantize_money(account.balance)
+                posted_interest = ZERO_MONEY
+                accrued = quantize_money(account.accrued_interest)
+                start_date = start_days[child_id]
+                if start_date is not None:
+                    deltas = {
+                        day: cents
+                        for day, cents in deltas_by_child.get(child_id, {}).items()
+                        if day >= start_date
+                    }
+                    daily = interest_schedule(
+                        to_cents(balance) - sum(deltas.values()) + to_cents(accrued),
+                        deltas,
+                        start_date,
+                        today,
+                        account.interest_rate,
+                        account.penalty_interest_rate,
+                    )
+                    postings, accrued_cents = consolidate_interest(
+                        daily,
+                        to_cents(accrued),
+                        start_date - timedelta(days=1),
+                        frequency,
+                        today,
+                    )
+                    tx_rows.extend(_interest_rows(child_id, postings))
+                    posted_interest = from_cents(sum(cents for _, cents in postings))
+                    accrued = from_cents(accrued_cents)
+                    balance = quantize_money(balance + posted_interest)
+
+                service_fee_last = account.service_fee_last_charged
+                if today.day == 1 and not (
+                    service_fee_last
+                    and service_fee_last.month == today.month
+                    and service_fee_last.year == today.year
+                ):
+                    fee = (
+                        percentage_of(abs(balance), settings.service_fee_amount)
+                        if settings.service_fee_is_percentage
+                        else quantize_money(settings.service_fee_amount)
+                    )
+                    if fee > ZERO_MONEY:
+                        tx_rows.append(
+                            _system_debit_row(
+                                child_id,
+                                fee,
+                                "Service Fee",
+                                datetime.combine(today, time.min),
+                                "service_fee",
+                            )
+                        )
+                        balance = quantize_money(balance - fee)
+                        service_fee_last = today
+
+                overdraft_last = account.overdraft_fee_last_charged
+                overdraft_charged = account.overdraft_fee_charged
+                if balance < ZERO_MONEY:
+                    fee = (
+                        percentage_of(abs(balance), settings.overdraft_fee_amount)
+                        if settings.overdraft_fee_is_percentage
+                        else quantize_money(settings.overdraft_fee_amount)
+                    )
+                    due = (
+                        overdraft_last != today
+                        if settings.overdraft_fee_daily
+                        else not overdraft_charged
+                    )
+                    if fee > ZERO_MONEY and due:
+                        tx_rows.append(
+                            _system_debit_row(
+                                child_id,
+                                fee,
+                                "Overdraft Fee",
+                                datetime.utcnow(),
+                                "overdraft_fee",
+                            )
+                        )
+                        balance = quantize_money(balance - fee)
+                        overdraft_last = today
+                        if not settings.overdraft_fee_daily:
+                            overdraft_charged = True
+                else:
+                    overdraft_charged = False
+                    overdraft_last = None
+
+                account_rows.append(
+                    {
+                        "b_id": account.id,
+                        "b_balance_delta": balance - quantize_money(account.balance),
+                        "b_interest": posted_interest,
+                        "b_accrued": accrued,
+                        "b_last_interest": today,
+                        "b_service_fee_last": service_fee_last,
+                        "b_overdraft_last": overdraft_last,
+                        "b_overdraft_charged": overdraft_charged,
+                    }
+                )
+
+            if tx_rows:
+                await db.execute(insert(Transaction), tx_rows)
+            await db.execute(account_values, account_rows)
+            after_child_id = child_ids[-1]
+            if on_chunk is not None:
+                await on_chunk(after_child_id)
+            await db.commit()
+            processed += len(accounts)
+
+
+def _system_debit_row(
+    child_id: int,
+    amount: Decimal,
+    memo: str,
+    timestamp: datetime,
+    source_type: str,
+) -> dict:
+    return {
+        "child_id": child_id,
+        "type": "debit",
+        "amount": amount,
+        "memo": memo,
+        "initiated_by": "system",
+        "initiator_id": 0,
+        "timestamp": timestamp,
+        "source_type": source_type,
+    }
+
+
 async def post_transaction_update(db: AsyncSession, child_id: int) -> None:
     await recalc_interest(db, child_id)
     settings = await get_settings(db)
@@ -723,6 +1600,7 @@ async def apply_promotion(
             memo=memo or "Promotion",
             initiated_by="system",
             initiator_id=0,
+            source_type="promotion",
         )
         await create_transaction(db, tx)
         await post_transaction_update(db, account.child_id)
@@ -860,21 +1738,12 @@ async def redeem_cd(
         matured = matured or datetime.utcnow() >= cd.matures_at
 
     if matured:
-        payout = quantize_money(
-            as_decimal(cd.amount) * (as_decimal("1") + as_decimal(cd.interest_rate))
-        )
+        payout = cd_maturity_payout(cd)
         payout_time = (
             cd.matures_at if cd.matures_at and cd.matures_at <= datetime.utcnow() else datetime.utcnow()
         )
-        result = await db.execute(
-            select(Transaction).where(
-                Transaction.child_id == cd.child_id,
-                Transaction.type == "credit",
-                Transaction.memo == f"CD #{cd.id} maturity",
-            )
-        )
-        existing = result.scalar_one_or_none()
-        if not existing:
+        key = cd_transaction_key(cd.id, "maturity")
+        if not await _transaction_key_exists(db, key):
             db.add(
                 Transaction(
                     child_id=cd.child_id,
@@ -884,18 +1753,15 @@ async def redeem_cd(
                     initiated_by="system",
                     initiator_id=0,
                     timestamp=payout_time,
+                    source_type="cd",
+                    source_id=cd.id,
+                    idempotency_key=key,
                 )
             )
+            await adjust_account_balance(db, cd.child_id, payout)
     else:
-        payout_result = await db.execute(
-            select(Transaction).where(
-                Transaction.child_id == cd.child_id,
-                Transaction.type == "credit",
-                Transaction.memo == f"CD #{cd.id} early withdrawal",
-            )
-        )
-        payout_existing = payout_result.scalar_one_or_none()
-        if not payout_existing:
+        key = cd_transaction_key(cd.id, "early withdrawal")
+        if not await _transaction_key_exists(db, key):
             db.add(
                 Transaction(
                     child_id=cd.child_id,
@@ -904,29 +1770,31 @@ async def redeem_cd(
                     memo=f"CD #{cd.id} early withdrawal",
                     initiated_by="system",
                     initiator_id=0,
+                    source_type="cd",
+                    source_id=cd.id,
+                    idempotency_key=key,
                 )
             )
+            await adjust_account_balance(db, cd.child_id, cd.amount)
         account = await get_account_by_child(db, cd.child_id)
         penalty_rate = account.cd_penalty_rate if account else as_decimal("0.1")
-        penalty_result = await db.execute(
-            select(Transaction).where(
-                Transaction.child_id == cd.child_id,
-                Transaction.type == "debit",
-                Transaction.memo == f"CD #{cd.id} early withdrawal penalty",
-            )
-        )
-        penalty_existing = penalty_result.scalar_one_or_none()
-        if not penalty_existing:
+        key = cd_transaction_key(cd.id, "early withdrawal penalty")
+        if not await _transaction_key_exists(db, key):
+            penalty = percentage_of(cd.amount, penalty_rate)
             db.add(
                 Transaction(
                     child_id=cd.child_id,
                     type="debit",
-                    amount=percentage_of(cd.amount, penalty_rate),
+                    amount=penalty,
                     memo=f"CD #{cd.id} early withdrawal penalty",
                     initiated_by="system",
                     initiator_id=0,
+                    source_type="cd",
+                    source_id=cd.id,
+                    idempotency_key=key,
                 )
             )
+            await adjust_account_balance(db, cd.child_id, -penalty)
 
     cd.status = "redeemed"
     cd.redeemed_at = datetime.utcnow()
@@ -941,17 +1809,114 @@ async def redeem_cd(
     return cd
 
 
-async def redeem_matured_cds(db: AsyncSession) -> None:
-    """Redeem all CDs that have reached their maturity date."""
-    result = await db.execute(
-        select(CertificateDeposit).where(
-            CertificateDeposit.status == "accepted",
-            CertificateDeposit.matures_at <= datetime.utcnow(),
-        )
+def cd_maturity_payout(cd: CertificateDeposit) -> Decimal:
+    """Principal plus interest paid out when ``cd`` matures."""
+
+    return quantize_money(
+        as_decimal(cd.amount) * (as_decimal("1") + as_decimal(cd.interest_rate))
     )
-    cds = result.scalars().all()
-    for cd in cds:
-        await redeem_cd(db, cd)
+
+
+async def redeem_matured_cds(
+    db: AsyncSession,
+    shard: Shard | None = None,
+    metrics: JobMetrics | None = None,
+    *,
+    batch_size: int | None = None,
+) -> int:
+    """Redeem all CDs that have reached their maturity date.
+
+    The bulk equivalent of calling :func:`redeem_cd` on each matured CD.
+    CDs are streamed in ``id`` order, ``batch_size`` (default
+    ``Settings.daily_job_chunk_size``) at a time.  Each batch checks for
+    existing payouts by idempotency key in one query, then inserts the
+    missing payouts, applies the balance changes and marks the CDs redeemed
+    in one commit.  Interest and overdraft fees are then evaluated once per
+    affected child.  Returns the number of CDs redeemed.
+    """
+
+    now = datetime.utcnow()
+    metrics = metrics or JobMetrics()
+    settings = await get_settings(db)
+    batch_size = batch_size or settings.daily_job_chunk_size
+    account_values = update(Account.__table__).where(
+        Account.__table__.c.child_id == bindparam("b_child_id")
+    ).values(balance=Account.__table__.c.balance + bindparam("b_delta"))
+
+    redeemed = 0
+    affected: set[int] = set()
+    after_id = 0
+    while True:
+        result = await db.execute(
+            select(CertificateDeposit)
+            .where(
+                CertificateDeposit.status == "accepted",
+                CertificateDeposit.matures_at <= now,
+                CertificateDeposit.id > after_id,
+                _in_shard(CertificateDeposit.child_id, shard),
+            )
+            .order_by(CertificateDeposit.id)
+            .limit(batch_size)
+        )
+        cds = result.scalars().all()
+        if not cds:
+            break
+        with metrics.item():
+            keys = {cd.id: cd_transaction_key(cd.id, "maturity") for cd in cds}
+            paid_result = await db.execute(
+                select(Transaction.idempotency_key).where(
+                    Transaction.idempotency_key.in_(keys.values())
+                )
+            )
+            paid = set(paid_result.scalars().all())
+            tx_rows: list[dict] = []
+            deltas: dict[int, Decimal] = {}
+            for cd in cds:
+                metrics.lag(cd.matures_at)
+                if keys[cd.id] not in paid:
+                    payout = cd_maturity_payout(cd)
+                    tx_rows.append(
+                        {
+                            "child_id": cd.child_id,
+                            "type": "credit",
+                            "amount": payout,
+                            "memo": f"CD #{cd.id} maturity",
+                            "initiated_by": "system",
+                            "initiator_id": 0,
+                            "timestamp": cd.matures_at,
+                            "source_type": "cd",
+                            "source_id": cd.id,
+                            "idempotency_key": keys[cd.id],
+                        }
+                    )
+                    deltas[cd.child_id] = deltas.get(cd.child_id, ZERO_MONEY) + payout
+                cd.status = "redeemed"
+                cd.redeemed_at = datetime.utcnow()
+                db.add(cd)
+                affected.add(cd.child_id)
+            if tx_rows:
+                await db.execute(insert(Transaction), tx_rows)
+                await db.execute(
+                    account_values,
+                    [
+                        {"b_child_id": child_id, "b_delta": delta}
+                        for child_id, delta in deltas.items()
+                    ],
+                )
+            await db.commit()
+        redeemed += len(cds)
+        after_id = cds[-1].id
+
+    if affected:
+        result = await db.execute(
+            select(Account).where(Account.child_id.in_(affected))
+        )
+        for account in sorted(result.scalars().all(), key=lambda a: a.child_id):
+            await recalc_interest(
+                db, account.child_id, settings.interest_posting_frequency
+            )
+            await apply_overdraft_fee(db, account, settings, date.today())
+    return redeemed
 
 
 async def create_recurring_charge(db: AsyncSession, rc: RecurringCharge) -> RecurringCharge:
@@ -997,36 +1962,133 @@ async def delete_recurring_charge(db: AsyncSession, rc: RecurringCharge) -> None
     await db.commit()
 
 
-async def process_due_recurring_charges(db: AsyncSession) -> None:
-    """Process and apply any recurring charges that are due today."""
+def recurring_occurrences(charge: RecurringCharge, today: date) -> list[date]:
+    """Return every due date of ``charge`` up to and including ``today``."""
+
+    if not charge.active or charge.next_run > today:
+        return []
+    interval = max(charge.interval_days, 1)
+    missed = (today - charge.next_run).days // interval + 1
+    return [charge.next_run + timedelta(days=interval * n) for n in range(missed)]
+
+
+async def process_due_recurring_charges(
+    db: AsyncSession,
+    shard: Shard | None = None,
+    metrics: JobMetrics | None = None,
+    *,
+    batch_size: int | None = None,
+) -> int:
+    """Post every occurrence of the recurring charges due up to today.
+
+    Missed occurrences are counted arithmetically and each ledger row is
+    stamped with its own due date.  Charges are streamed in ``id`` order,
+    ``batch_size`` (default ``Settings.daily_job_chunk_size``) at a time;
+    each batch is written with one bulk insert and one balance update and
+    then committed, and counts as one item of ``metrics``.  Interest is
+    recalculated once for every affected child at the end.  Returns the
+    number of transactions posted.
+    """
 
     today = date.today()
-    result = await db.execute(
-        select(RecurringCharge).where(
-            RecurringCharge.active == True,  # noqa: E712
-            RecurringCharge.next_run <= today,
+    metrics = metrics or JobMetrics()
+    settings = await get_settings(db)
+    batch_size = batch_size or settings.daily_job_chunk_size
+    account_values = update(Account.__table__).where(
+        Account.__table__.c.child_id == bindparam("b_child_id")
+    ).values(balance=Account.__table__.c.balance + bindparam("b_delta"))
+
+    posted = 0
+    affected: set[int] = set()
+    after_id = 0
+    while True:
+        result = await db.execute(
+            select(RecurringCharge)
+            .where(
+                RecurringCharge.active == True,  # noqa: E712
+                RecurringCharge.next_run <= today,
+                RecurringCharge.id > after_id,
+                _in_shard(RecurringCharge.child_id, shard),
+            )
+            .order_by(RecurringCharge.id)
+            .limit(batch_size)
         )
-    )
-    charges = result.scalars().all()
-    for charge in charges:
-        changed = False
-        while charge.next_run <= today and charge.active:
-            db.add(
-                Transaction(
-                    child_id=charge.child_id,
-                    type=charge.type,
-                    amount=charge.amount,
-                    memo=charge.memo,
-                    initiated_by="system",
-                    initiator_id=0,
+        charges = result.scalars().all()
+        if not charges:
+            break
+        with metrics.item():
+            tx_rows: list[dict] = []
+            deltas: dict[int, Decimal] = {}
+            for charge in charges:
+                metrics.lag(datetime.combine(charge.next_run, time.min))
+                due_days = recurring_occurrences(charge, today)
+                amount = quantize_money(charge.amount)
+                tx_rows.extend(
+                    {
+                        "child_id": charge.child_id,
+                        "type": charge.type,
+                        "amount": amount,
+                        "memo": charge.memo,
+                        "initiated_by": "system",
+                        "initiator_id": 0,
+                        "timestamp": datetime.combine(day, time.min),
+                        "source_type": "recurring_charge",
+                        "source_id": charge.id,
+                    }
+                    for day in due_days
                 )
-            )
-            charge.next_run = charge.next_run + timedelta(days=charge.interval_days)
-            changed = True
-        if changed:
-            db.add(charge)
+                deltas[charge.child_id] = deltas.get(
+                    charge.child_id, ZERO_MONEY
+                ) + signed_amount(charge.type, amount) * len(due_days)
+                charge.next_run = due_days[-1] + timedelta(
+                    days=max(charge.interval_days, 1)
+                )
+                db.add(charge)
+            await db.execute(insert(Transaction), tx_rows)
+            balance_rows = [
+                {"b_child_id": child_id, "b_delta": delta}
+                for child_id, delta in deltas.items()
+                if delta != ZERO_MONEY
+            ]
+            if balance_rows:
+                await db.execute(account_values, balance_rows)
             await db.commit()
-            await db.refresh(charge)
+        posted += len(tx_rows)
+        affected.update(deltas)
+        after_id = charges[-1].id
+
+    if affected:
+        result = await db.execute(
+            select(Account.child_id).where(Account.child_id.in_(affected))
+        )
+        for child_id in sorted(result.scalars().all()):
+            await recalc_interest(db, child_id, settings.interest_posting_frequency)
+    return posted
+
+
+async def get_next_due_at(
+    db: AsyncSession, shard: Shard | None = None
+) -> datetime | None:
+    """Return when the earliest recurring charge or CD maturity falls due."""
+
+    next_run_result = await db.execute(
+        select(func.min(RecurringCharge.next_run)).where(
+            RecurringCharge.active == True,  # noqa: E712
+            _in_shard(RecurringCharge.child_id, shard),
+        )
+    )
+    next_run = next_run_result.scalar_one_or_none()
+    matures_result = await db.execute(
+        select(func.min(CertificateDeposit.matures_at)).where(
+            CertificateDeposit.status == "accepted",
+            _in_shard(CertificateDeposit.child_id, shard),
+        )
+    )
+    matures_at = matures_result.scalar_one_or_none()
+    candidates = [matures_at] if matures_at else []
+    if next_run:
+        candidates.append(datetime.combine(next_run, time.min))
+    return min(candidates) if candidates else None
 
 
 # --- Loan helpers -------------------------------------------------------
@@ -1072,8 +2134,15 @@ async def record_loan_transaction(db: AsyncSession, tx: LoanTransaction) -> Loan
     return tx
 
 
-async def recalc_loan_interest(db: AsyncSession, loan: Loan) -> None:
-    """Accrue interest on a loan for any missed days."""
+async def recalc_loan_interest(
+    db: AsyncSession, loan: Loan, frequency: str | None = None
+) -> None:
+    """Accrue interest on a loan for any missed days.
+
+    Interest is added to principal once per posting period (see
+    :func:`recalc_interest`); the open period's share stays in
+    ``accrued_interest`` and still compounds.
+    """
 
     today = date.today()
     if loan.status != "active":
@@ -1082,25 +2151,25 @@ async def recalc_loan_interest(db: AsyncSession, loan: Loan) -> None:
     start_day = loan.last_interest_applied or loan.created_at.date()
     if start_day >= today:
         return
+    if frequency is None:
+        frequency = (await get_settings(db)).interest_posting_frequency
 
-    day = start_day
-    while day < today:
-        interest = percentage_of(loan.principal_remaining, loan.interest_rate)
-        if interest != ZERO_MONEY:
-            loan.principal_remaining = quantize_money(
-                loan.principal_remaining + interest
-            )
-            db.add(
-                LoanTransaction(
-                    loan_id=loan.id,
-                    type="interest",
-                    amount=interest,
-                    memo="Interest",
-                    timestamp=datetime.combine(day + timedelta(days=1), time.min),
-                )
+    postings, accrued = _loan_interest_postings(loan, today, frequency)
+    for period_end, interest in postings:
+        loan.principal_remaining = quantize_money(
+            loan.principal_remaining + interest
+        )
+        db.add(
+            LoanTransaction(
+                loan_id=loan.id,
+                type="interest",
+                amount=interest,
+                memo="Interest",
+                timestamp=datetime.combine(period_end, time.min),
             )
-        day += timedelta(days=1)
+        )
 
+    loan.accrued_interest = accrued
     loan.last_interest_applied = today
     loan.amount = quantize_money(loan.amount)
     loan.interest_rate = quantize_rate(loan.interest_rate)
@@ -1110,15 +2179,153 @@ async def recalc_loan_interest(db: AsyncSession, loan: Loan) -> None:
     await db.refresh(loan)
 
 
-async def get_active_loans(db: AsyncSession) -> list[Loan]:
-    result = await db.execute(select(Loan).where(Loan.status == "active"))
+def _loan_interest_postings(
+    loan: Loan, today: date, frequency: str
+) -> tuple[list[tuple[date, Decimal]], Decimal]:
+    """Return the interest postings due on ``loan`` and its new accrual.
+
+    Shared by :func:`recalc_loan_interest` and
+    :func:`apply_loan_interest_batch` so both round identically.
+    """
+
+    start_day = loan.last_interest_applied or loan.created_at.date()
+    carried_cents = to_cents(loan.accrued_interest)
+    daily = interest_schedule(
+        to_cents(loan.principal_remaining) + carried_cents,
+        {},
+        start_day,
+        today,
+        loan.interest_rate,
+        loan.interest_rate,
+    )
+    postings, accrued_cents = consolidate_interest(
+        daily, carried_cents, start_day - timedelta(days=1), frequency, today
+    )
+    return (
+        [(period_end, from_cents(cents)) for period_end, cents in postings],
+        from_cents(accrued_cents),
+    )
+
+
+async def apply_loan_interest_batch(
+    db: AsyncSession,
+    settings: Settings,
+    today: date | None = None,
+    *,
+    batch_size: int | None = None,
+    shard: Shard | None = None,
+    metrics: JobMetrics | None = None,
+) -> int:
+    """Accrue and post interest for every active loan.
+
+    This is the set-based equivalent of calling :func:`recalc_loan_interest`
+    per loan, which remains the reference implementation.  Loans are
+    streamed in ``id`` order, ``batch_size`` (default
+    ``Settings.daily_job_chunk_size``) at a time; each batch is computed in
+    memory and written with one bulk insert of interest rows and one
+    ``executemany`` loan update before committing.  Each batch is timed as
+    one item of ``metrics``.  Returns the number of loans processed.
+    """
+
+    today = today or date.today()
+    metrics = metrics or JobMetrics()
+    frequency = settings.interest_posting_frequency
+    batch_size = batch_size or settings.daily_job_chunk_size
+    loan_values = update(Loan.__table__).where(
+        Loan.__table__.c.id == bindparam("b_id")
+    ).values(
+        principal_remaining=bindparam("b_principal"),
+        accrued_interest=bindparam("b_accrued"),
+        last_interest_applied=bindparam("b_last_interest"),
+    )
+
+    processed = 0
+    after_id = 0
+    while True:
+        result = await db.execute(
+            select(Loan)
+            .where(
+                Loan.status == "active",
+                Loan.id > after_id,
+                _in_shard(Loan.child_id, shard),
+            )
+            .order_by(Loan.id)
+            .limit(batch_size)
+            .execution_options(populate_existing=True)
+        )
+        loans = result.scalars().all()
+        if not loans:
+            return processed
+        with metrics.item():
+            tx_rows: list[dict] = []
+            loan_rows: list[dict] = []
+            for loan in loans:
+                start_day = loan.last_interest_applied or loan.created_at.date()
+                if start_day >= today:
+                    continue
+                postings, accrued = _loan_interest_postings(loan, today, frequency)
+                principal = quantize_money(loan.principal_remaining)
+                for period_end, interest in postings:
+                    principal = quantize_money(principal + interest)
+                    tx_rows.append(
+                        {
+                            "loan_id": loan.id,
+                            "type": "interest",
+                            "amount": interest,
+                            "memo": "Interest",
+                            "timestamp": datetime.combine(period_end, time.min),
+                        }
+                    )
+                loan_rows.append(
+                    {
+                        "b_id": loan.id,
+                        "b_principal": principal,
+                        "b_accrued": accrued,
+                        "b_last_interest": today,
+                    }
+                )
+            if tx_rows:
+                await db.execute(insert(LoanTransaction), tx_rows)
+            if loan_rows:
+                await db.execute(loan_values, loan_rows)
+            await db.commit()
+        after_id = loans[-1].id
+        processed += len(loans)
+
+
+def capitalize_loan_accrued_interest(db: AsyncSession, loan: Loan) -> None:
+    """Add any accrued-but-unposted interest to principal ahead of a payment.
+
+    Changes are staged on the session; the caller commits.
+    """
+
+    interest = quantize_money(loan.accrued_interest)
+    if interest == ZERO_MONEY:
+        return
+    loan.principal_remaining = quantize_money(loan.principal_remaining + interest)
+    loan.accrued_interest = ZERO_MONEY
+    db.add(
+        LoanTransaction(
+            loan_id=loan.id, type="interest", amount=interest, memo="Interest"
+        )
+    )
+    db.add(loan)
+
+
+async def get_active_loans(db: AsyncSession, shard: Shard | None = None) -> list[Loan]:
+    result = await db.execute(
+        select(Loan).where(Loan.status == "active", _in_shard(Loan.child_id, shard))
+    )
     return result.scalars().all()
 
 
-async def process_loan_interest(db: AsyncSession) -> None:
-    loans = await get_active_loans(db)
-    for loan in loans:
-        await recalc_loan_interest(db, loan)
+async def process_loan_interest(
+    db: AsyncSession,
+    shard: Shard | None = None,
+    metrics: JobMetrics | None = None,
+) -> None:
+    settings = await get_settings(db)
+    await apply_loan_interest_batch(db, settings, shard=shard, metrics=metrics)
 
 
 # --- Chore helpers ------------------------------------------------------
@@ -1386,3 +2593,108 @@ async def award_badge_for_module(
     )
     await db.commit()
     return True
+
+
+# --- Job run helpers ----------------------------------------------------
+
+
+async def get_job_runs(
+    db: AsyncSession, job_name: str | None = None, limit: int = 50
+) -> list[JobRun]:
+    """Return the most recent job runs, newest first."""
+
+    query = select(JobRun).order_by(JobRun.started_at.desc(), JobRun.id.desc())
+    if job_name is not None:
+        query = query.where(JobRun.job_name == job_name)
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
+
+
+# --- Dashboard helpers --------------------------------------------------
+
+
+async def get_child_dashboards(
+    db: AsyncSession, rows: list[tuple[Child, Account | None]]
+) -> list[DashboardChild]:
+    """Summarize balances and open items for ``(child, account)`` pairs.
+
+    Each kind of item is counted for all children with one grouped query,
+    so the cost does not grow with the number of children.
+    """
+
+    child_ids = [child.id for child, _ in rows]
+    if not child_ids:
+        return []
+    accrued = await get_accrued_interest_by_child(
+        db, [account for _, account in rows if account is not None]
+    )
+
+    result = await db.execute(
+        select(Transaction.child_id, func.max(Transaction.timestamp))
+        .where(Transaction.child_id.in_(child_ids))
+        .group_by(Transaction.child_id)
+    )
+    last_activity = dict(result.all())
+
+    result = await db.execute(
+        select(WithdrawalRequest.child_id, func.count())
+        .where(
+            WithdrawalRequest.child_id.in_(child_ids),
+            WithdrawalRequest.status == "pending",
+        )
+        .group_by(WithdrawalRequest.child_id)
+    )
+    pending_withdrawals = dict(result.all())
+
+    result = await db.execute(
+        select(Chore.child_id, func.count())
+        .where(Chore.child_id.in_(child_ids), Chore.status == "awaiting_approval")
+        .group_by(Chore.child_id)
+    )
+    awaiting_chores = dict(result.all())
+
+    result = await db.execute(
+        select(Loan.child_id, func.count(), func.sum(Loan.principal_remaining))
+        .where(Loan.child_id.in_(child_ids), Loan.status == "active")
+        .group_by(Loan.child_id)
+    )
+    loans = {child_id: (count, total) for child_id, count, total in result.all()}
+
+    result = await db.execute(
+        select(CertificateDeposit)
+        .where(
+            CertificateDeposit.child_id.in_(child_ids),
+            CertificateDeposit.status == "accepted",
+        )
+        .order_by(CertificateDeposit.matures_at, CertificateDeposit.id)
+    )
+    cds: dict[int, list[DashboardCD]] = {}
+    for cd in result.scalars().all():
+        cds.setdefault(cd.child_id, []).append(
+            DashboardCD(
+                id=cd.id,
+                amount=cd.amount,
+                interest_rate=cd.interest_rate,
+                matures_at=cd.matures_at,
+            )
+        )
+
+    summaries = []
+    for child, account in rows:
+        loan_count, loan_principal = loans.get(child.id, (0, None))
+        summaries.append(
+            DashboardChild(
+                id=child.id,
+                first_name=child.first_name,
+                frozen=child.account_frozen,
+                balance=quantize_money(account.balance) if account else ZERO_MONEY,
+                accrued_interest=accrued.get(child.id, ZERO_MONEY),
+                last_activity=last_activity.get(child.id),
+                pending_withdrawals=pending_withdrawals.get(child.id, 0),
+                chores_awaiting_approval=awaiting_chores.get(child.id, 0),
+                active_loans=loan_count,
+                active_loan_principal=quantize_money(loan_principal or 0),
+                upcoming_cds=cds.get(child.id, []),
+            )
+        )
+    return summaries
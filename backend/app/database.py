@@ -6,6 +6,7 @@ schema in sync.  Comments are added throughout to clarify the startup
 sequence and purpose of each block.
 """
 
+import json
 import os
 import logging
 from sqlmodel import SQLModel
@@ -16,6 +17,8 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
 )
 
+from .acl import permissions_to_mask
+
 DATABASE_URL = (
     "sqlite+aiosqlite:///./uncle_jons_bank.db"  # swap with Postgres URL if needed
 )
@@ -97,6 +100,58 @@ async def create_db_and_tables() -> None:
                 )
             )
 
+        if not await has_column("settings", "interest_posting_frequency"):
+            await conn.execute(
+                text(
+                    "ALTER TABLE settings ADD COLUMN interest_posting_frequency VARCHAR DEFAULT 'daily'"
+                )
+            )
+
+        if not await has_column("settings", "daily_job_chunk_size"):
+            await conn.execute(
+                text(
+                    "ALTER TABLE settings ADD COLUMN daily_job_chunk_size INTEGER DEFAULT 500"
+                )
+            )
+
+        if not await has_column("settings", "version"):
+            await conn.execute(
+                text("ALTER TABLE settings ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            )
+
+        # User table columns
+        if not await has_column("user", "password_migrated"):
+            await conn.execute(
+                text(
+                    'ALTER TABLE "user" ADD COLUMN password_migrated BOOLEAN NOT NULL DEFAULT 0'
+                )
+            )
+
+        # ChildUserLink table columns
+        if not await has_column("childuserlink", "permission_mask"):
+            await conn.execute(
+                text(
+                    "ALTER TABLE childuserlink ADD COLUMN permission_mask INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+            links = await conn.execute(
+                text("SELECT user_id, child_id, permissions FROM childuserlink")
+            )
+            for user_id, child_id, permissions in links.fetchall():
+                if isinstance(permissions, str):
+                    permissions = json.loads(permissions)
+                await conn.execute(
+                    text(
+                        "UPDATE childuserlink SET permission_mask = :mask "
+                        "WHERE user_id = :user_id AND child_id = :child_id"
+                    ),
+                    {
+                        "mask": permissions_to_mask(permissions),
+                        "user_id": user_id,
+                        "child_id": child_id,
+                    },
+                )
+
         # RecurringCharge table columns
         if not await has_column("recurringcharge", "type"):
             await conn.execute(
@@ -125,6 +180,61 @@ async def create_db_and_tables() -> None:
                 )
             )
 
+        if not await has_column("account", "accrued_interest"):
+            await conn.execute(
+                text(
+                    "ALTER TABLE account ADD COLUMN accrued_interest NUMERIC(14,2) NOT NULL DEFAULT 0"
+                )
+            )
+
+        # Loan table columns
+        if not await has_column("loan", "accrued_interest"):
+            await conn.execute(
+                text(
+                    "ALTER TABLE loan ADD COLUMN accrued_interest NUMERIC(14,2) NOT NULL DEFAULT 0"
+                )
+            )
+
+        # SchedulerLock table columns
+        if not await has_column("scheduler_locks", "fencing_token"):
+            await conn.execute(
+                text(
+                    "ALTER TABLE scheduler_locks ADD COLUMN fencing_token INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+
+        # Transaction source references
+        backfill_sources = not await has_column("transaction", "source_type")
+        for column, column_type in (
+            ("source_type", "VARCHAR"),
+            ("source_id", "INTEGER"),
+            ("idempotency_key", "VARCHAR"),
+        ):
+            if not await has_column("transaction", column):
+                await conn.execute(
+                    text(
+                        f'ALTER TABLE "transaction" ADD COLUMN {column} {column_type}'
+                    )
+                )
+
+        # JobRun table columns
+        if not await has_column("job_runs", "checkpoint"):
+            await conn.execute(
+                text("ALTER TABLE job_runs ADD COLUMN checkpoint INTEGER")
+            )
+        for column, column_type in (
+            ("critical_path_seconds", "FLOAT"),
+            ("rows_read", "INTEGER"),
+            ("rows_written", "INTEGER"),
+            ("commits", "INTEGER"),
+            ("max_item_ms", "FLOAT"),
+            ("max_lag_seconds", "FLOAT"),
+        ):
+            if not await has_column("job_runs", column):
+                await conn.execute(
+                    text(f"ALTER TABLE job_runs ADD COLUMN {column} {column_type}")
+                )
+
         monetary_columns = {
             "account": {
                 "balance": "NUMERIC(14,2)",
@@ -132,6 +242,7 @@ async def create_db_and_tables() -> None:
                 "penalty_interest_rate": "NUMERIC(12,6)",
                 "cd_penalty_rate": "NUMERIC(12,6)",
                 "total_interest_earned": "NUMERIC(14,2)",
+                "accrued_interest": "NUMERIC(14,2)",
             },
             "transaction": {"amount": "NUMERIC(14,2)"},
             "withdrawalrequest": {"amount": "NUMERIC(14,2)"},
@@ -144,6 +255,7 @@ async def create_db_and_tables() -> None:
                 "amount": "NUMERIC(14,2)",
                 "interest_rate": "NUMERIC(12,6)",
                 "principal_remaining": "NUMERIC(14,2)",
+                "accrued_interest": "NUMERIC(14,2)",
             },
             "loantransaction": {"amount": "NUMERIC(14,2)"},
             "chore": {"amount": "NUMERIC(14,2)"},
@@ -235,6 +347,45 @@ async def create_db_and_tables() -> None:
         finally:
             await conn.execute(text("PRAGMA foreign_keys=ON"))
 
+        # ``create_all`` only emits indexes alongside brand-new tables, so
+        # secondary indexes added to existing models must be created here.
+        def _create_missing_indexes(sync_conn) -> None:
+            for table in SQLModel.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(sync_conn, checkfirst=True)
+
+        await conn.run_sync(_create_missing_indexes)
+
+        # Account.balance became the authoritative running balance.  Installs
+        # that predate it never wrote the column, so backfill it once from the
+        # ledger when every account still reads zero but transactions exist.
+        has_balance = await conn.execute(
+            text("SELECT 1 FROM account WHERE balance != 0 LIMIT 1")
+        )
+        has_ledger = await conn.execute(text('SELECT 1 FROM "transaction" LIMIT 1'))
+        if has_balance.first() is None and has_ledger.first() is not None:
+            await conn.execute(
+                text(
+                    """
+                    UPDATE account SET balance = (
+                        SELECT COALESCE(SUM(CASE WHEN t.type = 'credit'
+                                                 THEN t.amount ELSE -t.amount END), 0)
+                        FROM "transaction" AS t
+                        WHERE t.child_id = account.child_id
+                    )
+                    """
+                )
+            )
+
+
+    # Rows written before Transaction.source_type existed only carry their
+    # origin in the memo; classify them once when the column is added.
+    if backfill_sources:
+        from .crud import backfill_transaction_sources
+
+        async with async_session() as db:
+            await backfill_transaction_sources(db)
+
 
 async def get_session() -> AsyncSession:
     async with async_session() as session:
@@ -0,0 +1,87 @@
+"""Counters collected while a scheduled job runs.
+
+The numbers end up on the job's ``job_runs`` row, so a stage that starts
+reading or writing far more rows than usual, or falls behind on due items,
+shows up in the run history before it overlaps the next day's run.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+
+class JobMetrics:
+    """Metrics for one job run.
+
+    Once attached to a session it counts commits, ORM objects loaded (rows
+    read), and rows inserted, updated or deleted either by a flush or by
+    bulk ``insert``/``update``/``delete`` statements (rows written).
+    :meth:`item` times one unit of work and :meth:`lag` records how late a
+    due item was processed.
+    """
+
+    def __init__(self) -> None:
+        self.rows_read = 0
+        self.rows_written = 0
+        self.commits = 0
+        self.max_item_ms: float | None = None
+        self.max_lag_seconds: float | None = None
+
+    def attach(self, db: AsyncSession) -> None:
+        """Count reads, writes and commits issued on ``db``."""
+
+        session = db.sync_session
+        event.listen(session, "loaded_as_persistent", self._on_load)
+        event.listen(session, "before_flush", self._on_flush)
+        event.listen(session, "do_orm_execute", self._on_execute)
+        event.listen(session, "after_commit", self._on_commit)
+
+    def lag(self, due_at: datetime) -> None:
+        """Record that an item due at ``due_at`` is being processed now."""
+
+        lag = max((datetime.utcnow() - due_at).total_seconds(), 0.0)
+        self.max_lag_seconds = max(self.max_lag_seconds or 0.0, lag)
+
+    @contextmanager
+    def item(self, due_at: datetime | None = None) -> Iterator[None]:
+        """Time the enclosed unit of work; ``due_at`` is when it fell due."""
+
+        if due_at is not None:
+            self.lag(due_at)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.max_item_ms = max(self.max_item_ms or 0.0, elapsed_ms)
+
+    def _on_load(self, session: Session, instance: object) -> None:
+        self.rows_read += 1
+
+    def _on_flush(self, session: Session, flush_context, instances) -> None:
+        self.rows_written += (
+            len(session.new)
+            + len(session.deleted)
+            + sum(1 for obj in session.dirty if session.is_modified(obj))
+        )
+
+    def _on_execute(self, state: ORMExecuteState):
+        if not (state.is_insert or state.is_update or state.is_delete):
+            return None
+        result = state.invoke_statement()
+        if state.is_insert:
+            params = state.parameters
+            self.rows_written += len(params) if isinstance(params, list) else 1
+        else:
+            self.rows_written += max(getattr(result, "rowcount", 0) or 0, 0)
+        return result
+
+    def _on_commit(self, session: Session) -> None:
+        self.commits += 1
@@ -30,13 +30,18 @@ from app.routes import (
     coupons,
     education,
     chores,
+    dashboard,
 )
 from app.database import create_db_and_tables, async_session
 from app.crud import (
     ensure_permissions_exist,
 )
 from app.acl import ALL_PERMISSIONS
-from app.auth import purge_expired_revoked_tokens
+from app.auth import (
+    PasswordHasherBusyError,
+    purge_expired_revoked_tokens,
+    sync_revoked_tokens,
+)
 from app.services.scheduler import start_scheduler_task
 
 # Basic logging configuration.  The log level can be controlled with an
@@ -160,6 +165,7 @@ async def on_startup():
         # Ensure any new permissions are inserted into the database on startup.
         await ensure_permissions_exist(session, ALL_PERMISSIONS)
         await purge_expired_revoked_tokens(session)
+        await sync_revoked_tokens(session, force=True)
         from app.crud import ensure_education_content
 
         await ensure_education_content(session)
@@ -183,6 +189,7 @@ app.include_router(messages.router)
 app.include_router(coupons.router)
 app.include_router(education.router)
 app.include_router(chores.router)
+app.include_router(dashboard.router)
 
 
 @app.get("/docs", include_in_schema=False)
@@ -206,6 +213,20 @@ async def read_root():
     return {"message": f"Welcome to {name} API"}
 
 
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    """Shed password work quickly instead of queueing it behind a login storm."""
+    logger.warning("Password hashing pool saturated during %s", request.url.path)
+    return JSONResponse(
+        status_code=503,
+        content={
+            "code": "service_busy",
+            "message": "Too many sign-in requests, please retry shortly",
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Catch-all exception handler that logs the stack trace once."""
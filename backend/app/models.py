@@ -10,7 +10,9 @@ from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime, date
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, JSON, Numeric
+from sqlalchemy import Column, Index, JSON, Numeric, event
+
+from app.acl import permissions_to_mask
 
 
 class UserPermissionLink(SQLModel, table=True):
@@ -45,6 +47,8 @@ class User(SQLModel, table=True):
     password_hash: str
     role: str  # 'viewer', 'depositor', 'withdrawer', 'admin'
     status: str = "active"  # 'active' or 'pending'
+    # True once password_hash is known to use the SHA-256 pre-hash scheme.
+    password_migrated: bool = False
 
     children: List["ChildUserLink"] = Relationship(back_populates="user")
     permission_links: List["UserPermissionLink"] = Relationship(
@@ -77,15 +81,35 @@ class Child(SQLModel, table=True):
 class ChildUserLink(SQLModel, table=True):
     """Many‑to‑many relationship between parents and children."""
 
+    __table_args__ = (
+        Index("ix_childuserlink_child_id", "child_id"),
+        Index(
+            "ix_childuserlink_child_permission_mask",
+            "child_id",
+            "permission_mask",
+            "is_owner",
+            "user_id",
+        ),
+    )
+
     user_id: int = Field(foreign_key="user.id", primary_key=True)
     child_id: int = Field(foreign_key="child.id", primary_key=True)
     permissions: List[str] = Field(sa_column=Column(JSON), default_factory=list)
+    # Bitmask of ``permissions`` (see ``app.acl.PERMISSION_BITS``) used for
+    # authorization checks and indexed reverse lookups.
+    permission_mask: int = Field(default=0)
     is_owner: bool = False
 
     user: User = Relationship(back_populates="children")
     child: Child = Relationship(back_populates="parents")
 
 
+@event.listens_for(ChildUserLink, "before_insert")
+@event.listens_for(ChildUserLink, "before_update")
+def _sync_permission_mask(mapper, connection, target: ChildUserLink) -> None:
+    target.permission_mask = permissions_to_mask(target.permissions)
+
+
 class ShareCode(SQLModel, table=True):
     """One‑time use share code allowing another parent to link a child."""
 
@@ -113,7 +137,7 @@ class RevokedToken(SQLModel, table=True):
 class Account(SQLModel, table=True):
     """Per‑child ledger account storing running balances and rates."""
     id: Optional[int] = Field(default=None, primary_key=True)
-    child_id: int = Field(foreign_key="child.id")
+    child_id: int = Field(foreign_key="child.id", index=True)
     balance: Decimal = Field(
         default=Decimal("0.00"),
         sa_column=Column(Numeric(14, 2), nullable=False),
@@ -135,6 +159,10 @@ class Account(SQLModel, table=True):
         default=Decimal("0.00"),
         sa_column=Column(Numeric(14, 2), nullable=False),
     )
+    accrued_interest: Decimal = Field(
+        default=Decimal("0.00"),
+        sa_column=Column(Numeric(14, 2), nullable=False),
+    )  # Interest earned since the last posting period closed
     service_fee_last_charged: Optional[date] = None
     overdraft_fee_last_charged: Optional[date] = None
     overdraft_fee_charged: bool = False
@@ -145,6 +173,12 @@ class Account(SQLModel, table=True):
 class Transaction(SQLModel, table=True):
     """Ledger transaction representing credits and debits on a child's account."""
 
+    __table_args__ = (
+        Index("ix_transaction_child_id_timestamp", "child_id", "timestamp"),
+        Index("ix_transaction_source", "source_type", "source_id"),
+        Index("ux_transaction_idempotency_key", "idempotency_key", unique=True),
+    )
+
     id: Optional[int] = Field(
         default=None, primary_key=True, alias="transaction_id"
     )
@@ -155,12 +189,26 @@ class Transaction(SQLModel, table=True):
     initiated_by: str  # "child" or "parent"
     initiator_id: int
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+    # What produced the row: "cd", "loan", "coupon", "chore", "withdrawal",
+    # "recurring_charge", "interest", "service_fee", "overdraft_fee" or
+    # "promotion"; ``None`` for manual entries.  ``source_id`` is the id of
+    # the CD, loan, etc. when there is one.
+    source_type: Optional[str] = None
+    source_id: Optional[int] = None
+    # Set on rows that must be written at most once, e.g. "cd:12:maturity"
+    idempotency_key: Optional[str] = None
 
     child: Child = Relationship(back_populates="transactions")
 
 
 class WithdrawalRequest(SQLModel, table=True):
     """Parent‑approved withdrawal initiated by a child."""
+
+    __table_args__ = (
+        Index("ix_withdrawalrequest_child_id_status", "child_id", "status"),
+        Index("ix_withdrawalrequest_child_id_requested_at", "child_id", "requested_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     child_id: int = Field(foreign_key="child.id")
     amount: Decimal = Field(sa_column=Column(Numeric(14, 2), nullable=False))
@@ -177,6 +225,12 @@ class WithdrawalRequest(SQLModel, table=True):
 
 class RecurringCharge(SQLModel, table=True):
     """Scheduled transaction that repeats every ``interval_days``."""
+
+    __table_args__ = (
+        Index("ix_recurringcharge_active_next_run", "active", "next_run"),
+        Index("ix_recurringcharge_child_id", "child_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     child_id: int = Field(foreign_key="child.id")
     amount: Decimal = Field(sa_column=Column(Numeric(14, 2), nullable=False))
@@ -191,6 +245,12 @@ class RecurringCharge(SQLModel, table=True):
 
 class CertificateDeposit(SQLModel, table=True):
     """Simple certificate of deposit offering a fixed return."""
+
+    __table_args__ = (
+        Index("ix_certificatedeposit_status_matures_at", "status", "matures_at"),
+        Index("ix_certificatedeposit_child_id_created_at", "child_id", "created_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     child_id: int = Field(foreign_key="child.id")
     parent_id: int = Field(foreign_key="user.id")
@@ -210,6 +270,11 @@ class CertificateDeposit(SQLModel, table=True):
 class Loan(SQLModel, table=True):
     """Simple loan offered by a parent to a child."""
 
+    __table_args__ = (
+        Index("ix_loan_status", "status"),
+        Index("ix_loan_child_id_status", "child_id", "status"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     child_id: int = Field(foreign_key="child.id")
     parent_id: Optional[int] = Field(default=None, foreign_key="user.id")
@@ -225,6 +290,10 @@ class Loan(SQLModel, table=True):
         default=Decimal("0.00"),
         sa_column=Column(Numeric(14, 2), nullable=False),
     )
+    accrued_interest: Decimal = Field(
+        default=Decimal("0.00"),
+        sa_column=Column(Numeric(14, 2), nullable=False),
+    )  # Interest accrued but not yet added to principal
     last_interest_applied: Optional[date] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -236,6 +305,10 @@ class Loan(SQLModel, table=True):
 class LoanTransaction(SQLModel, table=True):
     """Ledger of loan-related transactions."""
 
+    __table_args__ = (
+        Index("ix_loantransaction_loan_id_timestamp", "loan_id", "timestamp"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     loan_id: int = Field(foreign_key="loan.id")
     type: str  # disbursement, payment, interest, fee
@@ -249,6 +322,8 @@ class LoanTransaction(SQLModel, table=True):
 class Chore(SQLModel, table=True):
     """Task that can earn a child money when completed."""
 
+    __table_args__ = (Index("ix_chore_child_id_status", "child_id", "status"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     child_id: int = Field(foreign_key="child.id")
     description: str
@@ -292,11 +367,41 @@ class Settings(SQLModel, table=True):
     overdraft_fee_daily: bool = False
     currency_symbol: str = "$"
     public_registration_disabled: bool = False
+    interest_posting_frequency: str = "daily"  # daily, weekly, monthly
+    daily_job_chunk_size: int = 500  # Accounts per commit in daily jobs
+    version: int = 0  # Bumped on every save; lets workers revalidate caches
 
 
 class Message(SQLModel, table=True):
     """Simple user-to-user message supporting rich text content."""
 
+    __table_args__ = (
+        Index(
+            "ix_message_recipient_user_inbox",
+            "recipient_user_id",
+            "recipient_archived",
+            "created_at",
+        ),
+        Index(
+            "ix_message_recipient_child_inbox",
+            "recipient_child_id",
+            "recipient_archived",
+            "created_at",
+        ),
+        Index(
+            "ix_message_sender_user_sent",
+            "sender_user_id",
+            "sender_archived",
+            "created_at",
+        ),
+        Index(
+            "ix_message_sender_child_sent",
+            "sender_child_id",
+            "sender_archived",
+            "created_at",
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     subject: str
     body: str  # stored as HTML
@@ -354,6 +459,7 @@ class SchedulerLock(SQLModel, table=True):
     owner_id: str
     locked_until: datetime = Field(index=True)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    fencing_token: int = 0  # Bumped on every change of owner
 
 
 class JobRun(SQLModel, table=True):
@@ -367,6 +473,13 @@ class JobRun(SQLModel, table=True):
     finished_at: Optional[datetime] = Field(default=None, index=True)
     status: str = Field(default="running", index=True)
     error: Optional[str] = None
+    checkpoint: Optional[int] = None  # Last processed key for resumable stages
+    critical_path_seconds: Optional[float] = None  # Slowest dependent stage chain
+    rows_read: Optional[int] = None
+    rows_written: Optional[int] = None
+    commits: Optional[int] = None
+    max_item_ms: Optional[float] = None  # Slowest single item (or chunk)
+    max_lag_seconds: Optional[float] = None  # How late the most overdue item ran
 
 
 class EducationModule(SQLModel, table=True):
@@ -45,3 +45,32 @@ def percentage_of(amount: MoneyLike, percentage: MoneyLike) -> Decimal:
     """Alias for readability when a config value is a percentage/rate."""
 
     return multiply_rate(amount, percentage)
+
+
+def to_cents(value: MoneyLike | None) -> int:
+    """Convert a money amount to an integer number of cents."""
+
+    return int(quantize_money(value).scaleb(2))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Convert integer cents back to a quantized Decimal amount."""
+
+    return quantize_money(Decimal(cents).scaleb(-2))
+
+
+def rate_to_micros(rate: MoneyLike | None) -> int:
+    """Express a rate as an integer number of millionths (its stored precision)."""
+
+    return int(quantize_rate(rate).scaleb(6))
+
+
+def interest_cents(balance_cents: int, rate_micros: int) -> int:
+    """Integer-only equivalent of ``percentage_of`` for cents and micro-rates.
+
+    Rounds half away from zero, matching ``ROUND_HALF_UP`` on Decimals.
+    """
+
+    product = balance_cents * rate_micros
+    magnitude = (abs(product) + 500_000) // 1_000_000
+    return magnitude if product >= 0 else -magnitude
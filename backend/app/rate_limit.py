@@ -0,0 +1,159 @@
+"""In-process token buckets used to throttle failed sign-in attempts.
+
+Each key (an email address or a client IP) owns a bucket of ``capacity``
+tokens that refills evenly over ``refill_seconds``.  A failed attempt takes
+a token; once the bucket is empty further attempts are refused without
+touching bcrypt until a token has refilled.  Buckets that have refilled
+completely carry no information and are dropped, so memory only grows
+with keys that failed recently.
+
+Behind a reverse proxy every connection comes from the proxy, so the IP
+bucket is keyed on the address the trusted proxies forwarded instead;
+see :func:`login_client_ip`.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import os
+import time
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by string, stored as ``key -> (tokens, stamp)``."""
+
+    def __init__(self, capacity: int, refill_seconds: float) -> None:
+        self.capacity = max(capacity, 1)
+        self.refill_seconds = refill_seconds
+        self._rate = self.capacity / refill_seconds
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._swept_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _level(self, key: str, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return float(self.capacity)
+        tokens, stamp = entry
+        return min(self.capacity, tokens + (now - stamp) * self._rate)
+
+    def retry_after(self, key: str, now: float | None = None) -> float:
+        """Seconds until ``key`` may try again; ``0`` if it may try now."""
+
+        now = time.monotonic() if now is None else now
+        level = self._level(key, now)
+        return 0.0 if level >= 1 else (1 - level) / self._rate
+
+    def consume(self, key: str, now: float | None = None) -> None:
+        """Take one token from ``key``'s bucket."""
+
+        now = time.monotonic() if now is None else now
+        self._buckets[key] = (max(self._level(key, now) - 1, 0.0), now)
+        if now - self._swept_at >= self.refill_seconds:
+            self._sweep(now)
+
+    def reset(self, key: str) -> None:
+        """Refill ``key``'s bucket."""
+
+        self._buckets.pop(key, None)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def _sweep(self, now: float) -> None:
+        full = [key for key in self._buckets if self._level(key, now) >= self.capacity]
+        for key in full:
+            del self._buckets[key]
+        self._swept_at = now
+
+
+LOGIN_FAILURE_WINDOW_SECONDS = float(os.getenv("LOGIN_FAILURE_WINDOW_SECONDS", "300"))
+LOGIN_MAX_FAILURES_PER_EMAIL = int(os.getenv("LOGIN_MAX_FAILURES_PER_EMAIL", "5"))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "20"))
+
+# Same variable uvicorn reads for ``--forwarded-allow-ips``: comma-separated
+# addresses or networks whose X-Forwarded-For header is believed.
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def _parse_networks(value: str) -> list[ipaddress.IPv4Network | ipaddress.IPv6Network]:
+    networks = []
+    for item in value.split(","):
+        item = item.strip()
+        if item == "*":
+            networks.extend([ipaddress.ip_network("0.0.0.0/0"), ipaddress.ip_network("::/0")])
+        elif item:
+            networks.append(ipaddress.ip_network(item, strict=False))
+    return networks
+
+
+trusted_proxy_networks = _parse_networks(FORWARDED_ALLOW_IPS)
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxy_networks)
+
+
+def login_client_ip(peer: str | None, forwarded_for: str | None) -> str | None:
+    """Address to charge failed logins to, or ``None`` to skip the IP bucket.
+
+    A direct client is keyed on its own address.  When the peer is a
+    trusted proxy, X-Forwarded-For is read from the right and the first
+    hop that is not a trusted proxy is the client.  A trusted proxy that
+    forwarded nothing usable yields ``None``: keying on the proxy would
+    make one bucket shared by every user.
+    """
+
+    if not peer or not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in (forwarded_for or "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    # Every hop is a proxy we trust, e.g. a LAN client seen by uvicorn's
+    # own proxy-header handling; the leftmost hop is the original client.
+    return hops[0] if hops else None
+
+
+email_login_limiter = TokenBucketLimiter(
+    LOGIN_MAX_FAILURES_PER_EMAIL, LOGIN_FAILURE_WINDOW_SECONDS
+)
+ip_login_limiter = TokenBucketLimiter(
+    LOGIN_MAX_FAILURES_PER_IP, LOGIN_FAILURE_WINDOW_SECONDS
+)
+
+
+def _email_key(email: str) -> str:
+    return email.strip().lower()
+
+
+def login_retry_after(email: str, client_ip: str | None) -> float:
+    """Seconds before a login for ``email`` from ``client_ip`` is admitted."""
+
+    wait = email_login_limiter.retry_after(_email_key(email))
+    if client_ip:
+        wait = max(wait, ip_login_limiter.retry_after(client_ip))
+    return wait
+
+
+def record_login_failure(email: str, client_ip: str | None) -> None:
+    email_login_limiter.consume(_email_key(email))
+    if client_ip:
+        ip_login_limiter.consume(client_ip)
+
+
+def record_login_success(email: str) -> None:
+    email_login_limiter.reset(_email_key(email))
+
+
+def clear_login_limits() -> None:
+    """Forget every recorded failure in this process."""
+
+    email_login_limiter.clear()
+    ip_login_limiter.clear()
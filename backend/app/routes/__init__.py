@@ -16,6 +16,7 @@ from . import (
     coupons,
     education,
     chores,
+    dashboard,
 )
 
 __all__ = [
@@ -34,4 +35,5 @@ __all__ = [
     "coupons",
     "education",
     "chores",
+    "dashboard",
 ]
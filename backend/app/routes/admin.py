@@ -1,11 +1,13 @@
 """Administrative endpoints for managing users, children and transactions."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.database import get_session
-from app.auth import require_role, get_password_hash
+from app.auth import require_role, get_password_hash_async, Identity
 from app.models import User, Child, Transaction, Permission, UserPermissionLink
 from app.schemas import (
     UserCreate,
@@ -18,6 +20,7 @@ from app.schemas import (
     PermissionRead,
     PermissionsUpdate,
     Promotion,
+    JobRunRead,
 )
 from app.crud import (
     get_all_users,
@@ -26,7 +29,6 @@ from app.crud import (
     delete_user,
     create_user,
     get_user_by_email,
-    get_all_children,
     get_child,
     save_child,
     delete_child,
@@ -34,11 +36,14 @@ from app.crud import (
     get_transaction,
     save_transaction,
     delete_transaction,
-    get_account_by_child,
+    build_child_read,
+    build_child_reads,
+    get_children_with_accounts,
     get_all_permissions,
     assign_permissions_by_names,
     remove_permissions_by_names,
     apply_promotion,
+    get_job_runs,
 )
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -47,7 +52,7 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 @router.get("/users", response_model=list[UserResponse])
 async def admin_list_users(
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     return await get_all_users(db)
 
@@ -56,7 +61,7 @@ async def admin_list_users(
 async def admin_create_parent(
     user_in: UserCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     existing = await get_user_by_email(db, user_in.email)
     if existing:
@@ -75,7 +80,7 @@ async def admin_create_parent(
 @router.get("/permissions", response_model=list[PermissionRead])
 async def list_permissions(
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     return await get_all_permissions(db)
 
@@ -85,7 +90,7 @@ async def add_permissions_to_user(
     user_id: int,
     perms: PermissionsUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     user = await get_user(db, user_id)
     if not user:
@@ -104,7 +109,7 @@ async def remove_permissions_from_user(
     user_id: int,
     perms: PermissionsUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     user = await get_user(db, user_id)
     if not user:
@@ -122,7 +127,7 @@ async def remove_permissions_from_user(
 async def admin_get_user(
     user_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     user = await get_user(db, user_id)
     if not user:
@@ -135,13 +140,14 @@ async def admin_update_user(
     user_id: int,
     data: UserUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     user = await get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if data.password is not None:
-        user.password_hash = get_password_hash(data.password)
+        user.password_hash = await get_password_hash_async(data.password)
+        user.password_migrated = True
     for field, value in data.model_dump(
         exclude_unset=True, exclude={"password"}
     ).items():
@@ -162,7 +168,7 @@ async def admin_update_user(
 async def admin_approve_user(
     user_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     user = await get_user(db, user_id)
     if not user:
@@ -176,7 +182,7 @@ async def admin_approve_user(
 async def admin_delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     user = await get_user(db, user_id)
     if not user:
@@ -186,48 +192,35 @@ async def admin_delete_user(
 
 @router.get("/children", response_model=list[ChildRead])
 async def admin_list_children(
+    limit: int | None = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    sort: Literal["id", "first_name", "balance"] = "id",
+    order: Literal["asc", "desc"] = "asc",
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
-    children = await get_all_children(db)
-    result = []
-    for c in children:
-        account = await get_account_by_child(db, c.id)
-        result.append(
-            ChildRead(
-                id=c.id,
-                first_name=c.first_name,
-                account_frozen=c.account_frozen,
-                interest_rate=account.interest_rate if account else None,
-                penalty_interest_rate=account.penalty_interest_rate if account else None,
-                cd_penalty_rate=account.cd_penalty_rate if account else None,
-                total_interest_earned=(
-                    account.total_interest_earned if account else None
-                ),
-            )
-        )
-    return result
+    """Return all children with their account settings.
+
+    Paging is opt-in: without ``limit`` every child after ``offset`` is
+    returned, which is what the admin and messaging pages expect.
+    """
+
+    rows = await get_children_with_accounts(
+        db, sort=sort, descending=order == "desc", offset=offset, limit=limit
+    )
+    return await build_child_reads(db, rows)
 
 
 @router.get("/children/{child_id}", response_model=ChildRead)
 async def admin_get_child(
     child_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     child = await get_child(db, child_id)
     if not child:
         raise HTTPException(status_code=404, detail="Child not found")
-    account = await get_account_by_child(db, child_id)
-    return ChildRead(
-        id=child.id,
-        first_name=child.first_name,
-        account_frozen=child.account_frozen,
-        interest_rate=account.interest_rate if account else None,
-        penalty_interest_rate=account.penalty_interest_rate if account else None,
-        cd_penalty_rate=account.cd_penalty_rate if account else None,
-        total_interest_earned=account.total_interest_earned if account else None,
-    )
+    return await build_child_read(db, child)
 
 
 @router.put("/children/{child_id}", response_model=ChildRead)
@@ -235,7 +228,7 @@ async def admin_update_child(
     child_id: int,
     data: ChildUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     child = await get_child(db, child_id)
     if not child:
@@ -246,23 +239,14 @@ async def admin_update_child(
         else:
             setattr(child, field, value)
     updated = await save_child(db, child)
-    account = await get_account_by_child(db, child_id)
-    return ChildRead(
-        id=updated.id,
-        first_name=updated.first_name,
-        account_frozen=updated.account_frozen,
-        interest_rate=account.interest_rate if account else None,
-        penalty_interest_rate=account.penalty_interest_rate if account else None,
-        cd_penalty_rate=account.cd_penalty_rate if account else None,
-        total_interest_earned=account.total_interest_earned if account else None,
-    )
+    return await build_child_read(db, updated)
 
 
 @router.delete("/children/{child_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def admin_delete_child(
     child_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     child = await get_child(db, child_id)
     if not child:
@@ -273,7 +257,7 @@ async def admin_delete_child(
 @router.get("/transactions", response_model=list[TransactionRead])
 async def admin_list_transactions(
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     return await get_all_transactions(db)
 
@@ -282,7 +266,7 @@ async def admin_list_transactions(
 async def admin_get_transaction(
     transaction_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     tx = await get_transaction(db, transaction_id)
     if not tx:
@@ -295,7 +279,7 @@ async def admin_update_transaction(
     transaction_id: int,
     data: TransactionUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     tx = await get_transaction(db, transaction_id)
     if not tx:
@@ -310,7 +294,7 @@ async def admin_update_transaction(
 async def admin_delete_transaction(
     transaction_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     tx = await get_transaction(db, transaction_id)
     if not tx:
@@ -322,9 +306,31 @@ async def admin_delete_transaction(
 async def run_promotion(
     promo: Promotion,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     count = await apply_promotion(
         db, promo.amount, promo.is_percentage, promo.credit, promo.memo
     )
     return {"accounts_updated": count}
+
+
+@router.get("/job-runs", response_model=list[JobRunRead])
+async def admin_list_job_runs(
+    job_name: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_session),
+    current_user: Identity = Depends(require_role("admin")),
+):
+    runs = await get_job_runs(db, job_name=job_name, limit=limit)
+    return [
+        JobRunRead.model_validate(run).model_copy(
+            update={
+                "duration_seconds": (
+                    (run.finished_at - run.started_at).total_seconds()
+                    if run.finished_at
+                    else None
+                )
+            }
+        )
+        for run in runs
+    ]
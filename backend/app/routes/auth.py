@@ -2,8 +2,9 @@
 """Authentication endpoints: login, refresh, logout, and registration."""
 
 import logging
+import math
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,12 +18,17 @@ from app.auth import (
     decode_and_validate_token,
     parse_subject,
     revoke_token_from_payload,
-    verify_password,
     oauth2_scheme,
 )
 from app.crud import create_user, get_settings
 from app.database import get_session
 from app.models import Child, User
+from app.rate_limit import (
+    login_client_ip,
+    login_retry_after,
+    record_login_failure,
+    record_login_success,
+)
 from app.schemas.user import UserCreate, UserLogin, UserResponse
 
 logger = logging.getLogger(__name__)
@@ -37,16 +43,50 @@ class LogoutRequest(BaseModel):
     refresh_token: str | None = None
 
 
+async def _admit_and_authenticate(
+    request: Request, db: AsyncSession, email: str, password: str
+) -> User | None:
+    """Check the login limits before any hashing, then authenticate.
+
+    Failed attempts are charged to both the email and the client IP;
+    a successful login clears the email's failures.
+    """
+
+    client_ip = login_client_ip(
+        request.client.host if request.client else None,
+        request.headers.get("x-forwarded-for"),
+    )
+    retry_after = login_retry_after(email, client_ip)
+    if retry_after > 0:
+        logger.warning("Throttled login for %s from %s", email, client_ip)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "code": "auth_rate_limited",
+                "message": "Too many failed sign-in attempts, please wait and retry",
+            },
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    user = await authenticate_user(db=db, email=email, password=password)
+    if user is None:
+        record_login_failure(email, client_ip)
+    else:
+        record_login_success(email)
+    return user
+
+
 @router.post("/token")
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_session),
 ):
     """OAuth2 password flow used by interactive docs and external clients."""
 
-    result = await db.execute(select(User).where(User.email == form_data.username))
-    user = result.scalar_one_or_none()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    user = await _admit_and_authenticate(
+        request, db, form_data.username, form_data.password
+    )
+    if not user:
         logger.warning("Failed OAuth login for %s", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,10 +108,12 @@ async def login_for_access_token(
 
 
 @router.post("/login")
-async def login(user_in: UserLogin, db: AsyncSession = Depends(get_session)):
+async def login(
+    user_in: UserLogin, request: Request, db: AsyncSession = Depends(get_session)
+):
     """JSON-based login used by the frontend."""
 
-    user = await authenticate_user(db=db, email=user_in.email, password=user_in.password)
+    user = await _admit_and_authenticate(request, db, user_in.email, user_in.password)
     if not user:
         logger.warning("Failed login for %s", user_in.email)
         raise HTTPException(
@@ -5,20 +5,26 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_session
 """Routes for managing children's certificates of deposit."""
 
-from app.auth import require_role, get_current_child
-from app.models import CertificateDeposit, Child, User, Transaction
+from app.auth import (
+    Identity,
+    authorize_child_access,
+    get_current_child,
+    require_role,
+)
+from app.models import CertificateDeposit, Child, Transaction
 from app.schemas import CDCreate, CDRead
 from app.crud import (
     create_cd,
     get_cd,
     save_cd,
     get_cds_by_child,
-    get_child_user_link,
     calculate_balance,
     create_transaction,
     post_transaction_update,
+    cd_transaction_key,
 )
 from app.acl import PERM_OFFER_CD
+from app.services.scheduler import notify_due_item
 from app.schemas.validation import MAX_RATE
 
 router = APIRouter(prefix="/cds", tags=["cds"])
@@ -28,7 +34,7 @@ router = APIRouter(prefix="/cds", tags=["cds"])
 async def create_cd_offer(
     data: CDCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("parent", "admin")),
+    current_user: Identity = Depends(require_role("parent", "admin")),
 ):
     if data.amount <= 0:
         raise HTTPException(status_code=400, detail="CD amount must be greater than zero")
@@ -36,12 +42,7 @@ async def create_cd_offer(
         raise HTTPException(
             status_code=400, detail="Interest rate must be between 0 and 1"
         )
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, data.child_id)
-        if not link:
-            raise HTTPException(status_code=404, detail="Child not found")
-        if PERM_OFFER_CD not in link.permissions and not link.is_owner:
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    await authorize_child_access(db, current_user, data.child_id, PERM_OFFER_CD)
     cd = CertificateDeposit(
         child_id=data.child_id,
         parent_id=current_user.id,
@@ -54,7 +55,7 @@ async def create_cd_offer(
 
 @router.get("/child", response_model=list[CDRead])
 async def my_cds(
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     return await get_cds_by_child(db, child.id)
@@ -72,7 +73,7 @@ async def _get_child_cd(
 @router.post("/{cd_id}/accept", response_model=CDRead)
 async def accept_cd(
     cd_id: int,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     cd = await _get_child_cd(db, cd_id, child.id)
@@ -90,6 +91,9 @@ async def accept_cd(
             memo=f"CD #{cd.id} purchase",
             initiated_by="child",
             initiator_id=child.id,
+            source_type="cd",
+            source_id=cd.id,
+            idempotency_key=cd_transaction_key(cd.id, "purchase"),
         ),
     )
     await post_transaction_update(db, child.id)
@@ -97,13 +101,14 @@ async def accept_cd(
     cd.accepted_at = datetime.utcnow()
     cd.matures_at = cd.accepted_at + timedelta(days=cd.term_days)
     await save_cd(db, cd)
+    notify_due_item(cd.matures_at)
     return cd
 
 
 @router.post("/{cd_id}/reject", response_model=CDRead)
 async def reject_cd(
     cd_id: int,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     cd = await _get_child_cd(db, cd_id, child.id)
@@ -118,7 +123,7 @@ async def reject_cd(
 async def redeem_cd_route(
     cd_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     cd = await get_cd(db, cd_id)
     if not cd:
@@ -132,7 +137,7 @@ async def redeem_cd_route(
 @router.post("/{cd_id}/redeem-early", response_model=CDRead)
 async def redeem_cd_early_route(
     cd_id: int,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     cd = await _get_child_cd(db, cd_id, child.id)
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
-from app.models import Chore, User, Child, Transaction
+from app.models import Chore, Child, Transaction
 from app.schemas import ChoreCreate, ChoreRead, ChoreUpdate
 from app.crud import (
     create_chore,
@@ -19,7 +19,10 @@ from app.crud import (
 from app.auth import (
     get_current_user,
     get_current_child,
-    get_current_identity,
+    authorize_child,
+    authorize_child_access,
+    ChildAccess,
+    Identity,
 )
 
 logger = logging.getLogger(__name__)
@@ -32,14 +35,8 @@ async def add_chore(
     child_id: int,
     data: ChoreCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    access: ChildAccess = Depends(authorize_child()),
 ):
-    if current_user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, current_user.id)
-        if child_id not in [c.id for c in children]:
-            raise HTTPException(status_code=404, detail="Child not found")
     chore = Chore(
         child_id=child_id,
         description=data.description,
@@ -50,14 +47,16 @@ async def add_chore(
         active=True,
     )
     new_chore = await create_chore(db, chore)
-    logger.info("Chore created for child %s by user %s", child_id, current_user.id)
+    logger.info(
+        "Chore created for child %s by user %s", child_id, access.identity.id
+    )
     return new_chore
 
 
 @router.post("/propose", response_model=ChoreRead)
 async def propose_chore(
     data: ChoreCreate,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     chore = Chore(
@@ -79,27 +78,14 @@ async def propose_chore(
 async def list_chores(
     child_id: int,
     db: AsyncSession = Depends(get_session),
-    identity: tuple[str, Child | User] = Depends(get_current_identity),
+    access: ChildAccess = Depends(authorize_child(allow_child=True)),
 ):
-    kind, obj = identity
-    if kind == "child":
-        child = obj
-        if child.id != child_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    else:
-        user: User = obj
-        if user.role != "admin":
-            from app.crud import get_children_by_user
-
-            children = await get_children_by_user(db, user.id)
-            if child_id not in [c.id for c in children]:
-                raise HTTPException(status_code=404, detail="Child not found")
     return await get_chores_by_child(db, child_id)
 
 
 @router.get("/mine", response_model=List[ChoreRead])
 async def list_my_chores(
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     return await get_chores_by_child(db, child.id)
@@ -108,7 +94,7 @@ async def list_my_chores(
 @router.post("/{chore_id}/complete", response_model=ChoreRead)
 async def mark_complete(
     chore_id: int,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     chore = await get_chore(db, chore_id)
@@ -126,17 +112,12 @@ async def mark_complete(
 async def approve_chore(
     chore_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Identity = Depends(get_current_user),
 ):
     chore = await get_chore(db, chore_id)
     if not chore:
         raise HTTPException(status_code=404, detail="Chore not found")
-    if current_user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, current_user.id)
-        if chore.child_id not in [c.id for c in children]:
-            raise HTTPException(status_code=404, detail="Child not found")
+    await authorize_child_access(db, current_user, chore.child_id)
     if chore.status == "awaiting_approval":
         tx = Transaction(
             child_id=chore.child_id,
@@ -145,6 +126,8 @@ async def approve_chore(
             memo=f"Chore: {chore.description}",
             initiated_by="parent",
             initiator_id=current_user.id,
+            source_type="chore",
+            source_id=chore.id,
         )
         await create_transaction(db, tx)
         if chore.interval_days:
@@ -170,17 +153,12 @@ async def approve_chore(
 async def reject_chore(
     chore_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Identity = Depends(get_current_user),
 ):
     chore = await get_chore(db, chore_id)
     if not chore:
         raise HTTPException(status_code=404, detail="Chore not found")
-    if current_user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, current_user.id)
-        if chore.child_id not in [c.id for c in children]:
-            raise HTTPException(status_code=404, detail="Child not found")
+    await authorize_child_access(db, current_user, chore.child_id)
     if chore.status == "awaiting_approval":
         chore.status = "pending"
         updated = await save_chore(db, chore)
@@ -200,17 +178,12 @@ async def update_chore(
     chore_id: int,
     data: ChoreUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Identity = Depends(get_current_user),
 ):
     chore = await get_chore(db, chore_id)
     if not chore:
         raise HTTPException(status_code=404, detail="Chore not found")
-    if current_user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, current_user.id)
-        if chore.child_id not in [c.id for c in children]:
-            raise HTTPException(status_code=404, detail="Child not found")
+    await authorize_child_access(db, current_user, chore.child_id)
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(chore, field, value)
     updated = await save_chore(db, chore)
@@ -222,17 +195,12 @@ async def update_chore(
 async def delete_chore_route(
     chore_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Identity = Depends(get_current_user),
 ):
     chore = await get_chore(db, chore_id)
     if not chore:
         raise HTTPException(status_code=404, detail="Chore not found")
-    if current_user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, current_user.id)
-        if chore.child_id not in [c.id for c in children]:
-            raise HTTPException(status_code=404, detail="Child not found")
+    await authorize_child_access(db, current_user, chore.child_id)
     await delete_chore(db, chore)
     logger.info("Chore %s deleted by user %s", chore_id, current_user.id)
     return None
@@ -6,9 +6,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
-from app.auth import require_permissions, get_current_user, get_current_identity
+from app.auth import (
+    Identity,
+    authorize_child_access,
+    get_current_identity,
+    get_current_user,
+    require_permissions,
+)
 from app.acl import PERM_DEPOSIT
-from app.models import Coupon, CouponRedemption, Transaction, Child, User
+from app.models import Coupon, CouponRedemption, Transaction, Child
 from app.schemas import (
     CouponCreate,
     CouponRead,
@@ -51,16 +57,14 @@ def _generate_qr(code: str) -> str | None:
 async def create_coupon_route(
     data: CouponCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_DEPOSIT)),
+    current_user: Identity = Depends(require_permissions(PERM_DEPOSIT)),
 ):
     if current_user.role != "admin" and data.scope == "all_children":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     if data.scope == "child":
         if data.child_id is None:
             raise HTTPException(status_code=400, detail="child_id required")
-        link = await get_child_user_link(db, current_user.id, data.child_id)
-        if not link:
-            raise HTTPException(status_code=404, detail="Child not found")
+        await authorize_child_access(db, current_user, data.child_id)
     code = uuid.uuid4().hex[:8]
     settings = await get_settings(db)
     base = settings.site_url.rstrip("/")
@@ -84,7 +88,7 @@ async def create_coupon_route(
 @router.get("", response_model=list[CouponRead])
 async def list_coupons(
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Identity = Depends(get_current_user),
 ):
     return await list_coupons_by_creator(db, current_user.id)
 
@@ -94,7 +98,7 @@ async def list_all_coupons_route(
     search: str | None = None,
     scope: str | None = None,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_DEPOSIT)),
+    current_user: Identity = Depends(require_permissions(PERM_DEPOSIT)),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Insufficient permissions")
@@ -105,7 +109,7 @@ async def list_all_coupons_route(
 async def redeem_coupon_route(
     data: CouponRedeem,
     db: AsyncSession = Depends(get_session),
-    identity: tuple[str, Child | User] = Depends(get_current_identity),
+    identity: tuple[str, Identity] = Depends(get_current_identity),
 ):
     kind, obj = identity
     if kind != "child":
@@ -131,6 +135,8 @@ async def redeem_coupon_route(
         memo=coupon.memo,
         initiated_by="child",
         initiator_id=child.id,
+        source_type="coupon",
+        source_id=coupon.id,
     )
     await create_transaction(db, tx)
     redemption = CouponRedemption(coupon_id=coupon.id, child_id=child.id)
@@ -145,7 +151,7 @@ async def redeem_coupon_route(
 async def delete_coupon_route(
     coupon_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_DEPOSIT)),
+    current_user: Identity = Depends(require_permissions(PERM_DEPOSIT)),
 ):
     coupon = await get_coupon(db, coupon_id)
     if not coupon or (
@@ -159,7 +165,7 @@ async def delete_coupon_route(
 @router.get("/redemptions", response_model=list[CouponRedemptionRead])
 async def list_my_redemptions(
     db: AsyncSession = Depends(get_session),
-    identity: tuple[str, Child | User] = Depends(get_current_identity),
+    identity: tuple[str, Identity] = Depends(get_current_identity),
 ):
     kind, obj = identity
     if kind != "child":
@@ -0,0 +1,30 @@
+"""Aggregate summary of every child a parent can see, for the dashboard."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.acl import PERM_VIEW_TRANSACTIONS
+from app.auth import Identity, require_permissions
+from app.crud import get_child_dashboards, get_children_with_accounts
+from app.database import get_session
+from app.schemas import DashboardResponse
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    db: AsyncSession = Depends(get_session),
+    current_user: Identity = Depends(require_permissions(PERM_VIEW_TRANSACTIONS)),
+):
+    """Return balances and open items for each child linked to the caller.
+
+    Only links that own the child or grant ``view_transactions`` are
+    included.  Replaces one ledger, withdrawal, chore, loan and CD request
+    per child with a fixed handful of grouped queries.
+    """
+
+    rows = await get_children_with_accounts(
+        db, user_id=current_user.id, permission=PERM_VIEW_TRANSACTIONS
+    )
+    return {"children": await get_child_dashboards(db, rows)}
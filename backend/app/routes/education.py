@@ -3,8 +3,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_session
-from app.auth import get_current_child, get_current_user
-from app.models import Child, User, EducationModule
+from app.auth import (
+    ChildAccess,
+    Identity,
+    authorize_child,
+    get_current_child,
+    get_current_user,
+)
+from app.models import EducationModule
 from app.schemas import (
     ModuleRead,
     QuizSubmission,
@@ -25,7 +31,7 @@ router = APIRouter(prefix="/education", tags=["education"])
 
 @router.get("/modules", response_model=list[ModuleRead])
 async def list_modules(
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     modules = await get_enabled_modules(db)
@@ -50,7 +56,7 @@ async def list_modules(
 async def submit_quiz(
     module_id: int,
     submission: QuizSubmission,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     questions = await get_questions_for_module(db, module_id)
@@ -69,7 +75,7 @@ async def submit_quiz(
 
 @router.get("/badges/me", response_model=list[BadgeRead])
 async def my_badges(
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     badges = await get_child_badges(db, child.id)
@@ -80,17 +86,11 @@ async def my_badges(
 async def award_badge(
     module_id: int,
     child_id: int,
-    user: User = Depends(get_current_user),
+    access: ChildAccess = Depends(authorize_child()),
     db: AsyncSession = Depends(get_session),
 ):
-    if user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, user.id)
-        if child_id not in [c.id for c in children]:
-            raise HTTPException(403, detail="Not authorized")
     awarded = await award_badge_for_module(
-        db, child_id, module_id, awarded_by=user.id, source="manual"
+        db, child_id, module_id, awarded_by=access.identity.id, source="manual"
     )
     if not awarded:
         raise HTTPException(400, detail="Badge already awarded")
@@ -101,7 +101,7 @@ async def award_badge(
 async def update_module(
     module_id: int,
     data: ModuleUpdate,
-    user: User = Depends(get_current_user),
+    user: Identity = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
     if user.role != "admin":
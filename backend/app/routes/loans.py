@@ -3,17 +3,22 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
-from app.models import Loan, LoanTransaction, Child, User, Transaction
+from app.models import Loan, LoanTransaction, Transaction
 from app.schemas import LoanCreate, LoanRead, LoanApprove, LoanPayment, LoanRateUpdate
-from app.auth import get_current_child, require_permissions
+from app.auth import (
+    Identity,
+    authorize_child_access,
+    get_current_child,
+    require_permissions,
+)
 from app.acl import PERM_OFFER_LOAN, PERM_MANAGE_LOAN
 from app.crud import (
+    capitalize_loan_accrued_interest,
     create_loan,
     get_loan,
     save_loan,
     get_loans_by_child,
     record_loan_transaction,
-    get_child_user_link,
     create_transaction,
     post_transaction_update,
 )
@@ -26,7 +31,7 @@ router = APIRouter(prefix="/loans", tags=["loans"])
 @router.post("/", response_model=LoanRead)
 async def request_loan(
     data: LoanCreate,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     if data.amount <= 0:
@@ -37,7 +42,7 @@ async def request_loan(
 
 @router.get("/child", response_model=list[LoanRead])
 async def my_loans(
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     return await get_loans_by_child(db, child.id)
@@ -46,7 +51,7 @@ async def my_loans(
 @router.post("/{loan_id}/accept", response_model=LoanRead)
 async def accept_loan(
     loan_id: int,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     loan = await get_loan(db, loan_id)
@@ -63,6 +68,8 @@ async def accept_loan(
             memo=f"Loan #{loan.id} disbursement",
             initiated_by="child",
             initiator_id=child.id,
+            source_type="loan",
+            source_id=loan.id,
         ),
     )
     await post_transaction_update(db, child.id)
@@ -86,15 +93,12 @@ async def accept_loan(
 async def close_loan(
     loan_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_MANAGE_LOAN)),
+    current_user: Identity = Depends(require_permissions(PERM_MANAGE_LOAN)),
 ):
     loan = await get_loan(db, loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, loan.child_id)
-        if not link or (PERM_MANAGE_LOAN not in link.permissions and not link.is_owner):
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    await authorize_child_access(db, current_user, loan.child_id, PERM_MANAGE_LOAN)
     loan.status = "closed"
     await record_loan_transaction(
         db,
@@ -114,7 +118,7 @@ async def approve_loan_route(
     loan_id: int,
     data: LoanApprove,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_OFFER_LOAN)),
+    current_user: Identity = Depends(require_permissions(PERM_OFFER_LOAN)),
 ):
     if not 0 <= data.interest_rate <= MAX_RATE:
         raise HTTPException(
@@ -123,10 +127,7 @@ async def approve_loan_route(
     loan = await get_loan(db, loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, loan.child_id)
-        if not link or (PERM_OFFER_LOAN not in link.permissions and not link.is_owner):
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    await authorize_child_access(db, current_user, loan.child_id, PERM_OFFER_LOAN)
     loan.status = "approved"
     loan.parent_id = current_user.id
     loan.interest_rate = quantize_rate(data.interest_rate)
@@ -140,15 +141,12 @@ async def approve_loan_route(
 async def deny_loan_route(
     loan_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_OFFER_LOAN)),
+    current_user: Identity = Depends(require_permissions(PERM_OFFER_LOAN)),
 ):
     loan = await get_loan(db, loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, loan.child_id)
-        if not link or (PERM_OFFER_LOAN not in link.permissions and not link.is_owner):
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    await authorize_child_access(db, current_user, loan.child_id, PERM_OFFER_LOAN)
     loan.status = "denied"
     loan.parent_id = current_user.id
     await save_loan(db, loan)
@@ -158,7 +156,7 @@ async def deny_loan_route(
 @router.post("/{loan_id}/decline", response_model=LoanRead)
 async def decline_loan(
     loan_id: int,
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     loan = await get_loan(db, loan_id)
@@ -175,16 +173,11 @@ async def decline_loan(
 async def parent_loans(
     child_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_MANAGE_LOAN)),
+    current_user: Identity = Depends(require_permissions(PERM_MANAGE_LOAN)),
 ):
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, child_id)
-        if not link or (
-            PERM_MANAGE_LOAN not in link.permissions
-            and PERM_OFFER_LOAN not in link.permissions
-            and not link.is_owner
-        ):
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    access = await authorize_child_access(db, current_user, child_id)
+    if not (access.can(PERM_MANAGE_LOAN) or access.can(PERM_OFFER_LOAN)):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
     return await get_loans_by_child(db, child_id)
 
 
@@ -193,7 +186,7 @@ async def update_interest_rate(
     loan_id: int,
     data: LoanRateUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_MANAGE_LOAN)),
+    current_user: Identity = Depends(require_permissions(PERM_MANAGE_LOAN)),
 ):
     if not 0 <= data.interest_rate <= MAX_RATE:
         raise HTTPException(
@@ -202,10 +195,7 @@ async def update_interest_rate(
     loan = await get_loan(db, loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, loan.child_id)
-        if not link or (PERM_MANAGE_LOAN not in link.permissions and not link.is_owner):
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    await authorize_child_access(db, current_user, loan.child_id, PERM_MANAGE_LOAN)
     loan.interest_rate = quantize_rate(data.interest_rate)
     await record_loan_transaction(
         db,
@@ -225,17 +215,15 @@ async def record_payment(
     loan_id: int,
     data: LoanPayment,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_MANAGE_LOAN)),
+    current_user: Identity = Depends(require_permissions(PERM_MANAGE_LOAN)),
 ):
     if data.amount <= 0:
         raise HTTPException(status_code=400, detail="Payment amount must be greater than zero")
     loan = await get_loan(db, loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, loan.child_id)
-        if not link or (PERM_MANAGE_LOAN not in link.permissions and not link.is_owner):
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    await authorize_child_access(db, current_user, loan.child_id, PERM_MANAGE_LOAN)
+    capitalize_loan_accrued_interest(db, loan)
     if data.amount > loan.principal_remaining:
         raise HTTPException(
             status_code=400, detail="Payment amount cannot exceed principal remaining"
@@ -249,6 +237,8 @@ async def record_payment(
             memo=f"Loan #{loan.id} payment",
             initiated_by="parent",
             initiator_id=current_user.id,
+            source_type="loan",
+            source_id=loan.id,
         ),
     )
     await post_transaction_update(db, loan.child_id)
@@ -4,8 +4,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_session
 from app.schemas import MessageCreate, MessageRead, BroadcastMessageCreate
-from app.models import User, Child, Message
-from app.auth import get_current_identity, get_current_user
+from app.models import Child, Message
+from app.auth import (
+    Identity,
+    authorize_child_access,
+    get_current_identity,
+    get_current_user,
+)
 from app.acl import PERM_SEND_MESSAGE
 from app.crud import (
     create_message,
@@ -37,21 +42,13 @@ async def send_message(
     msg = Message(subject=data.subject, body=data.body)
     if sender_type == "user":
         if sender.role != "admin":
-            user_perms = {p.name for p in sender.permissions}
-            if PERM_SEND_MESSAGE not in user_perms:
+            if PERM_SEND_MESSAGE not in sender.permissions:
                 raise HTTPException(status_code=403, detail="Insufficient permissions")
         msg.sender_user_id = sender.id
         if data.recipient_child_id:
-            if sender.role != "admin":
-                link = await get_child_user_link(
-                    db, sender.id, data.recipient_child_id
-                )
-                if not link:
-                    raise HTTPException(status_code=404, detail="Child not found")
-                if PERM_SEND_MESSAGE not in link.permissions and not link.is_owner:
-                    raise HTTPException(
-                        status_code=403, detail="Insufficient permissions"
-                    )
+            await authorize_child_access(
+                db, sender, data.recipient_child_id, PERM_SEND_MESSAGE
+            )
             msg.recipient_child_id = data.recipient_child_id
         else:
             if sender.role != "admin":
@@ -73,7 +70,7 @@ async def send_message(
 @router.post("/broadcast")
 async def broadcast_message(
     data: BroadcastMessageCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Identity = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
     if current_user.role != "admin":
@@ -165,7 +162,7 @@ async def archive_msg(
 
 @router.get("/all", response_model=list[MessageRead])
 async def all_messages(
-    current_user: User = Depends(get_current_user),
+    current_user: Identity = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
     if current_user.role != "admin":
@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime, time
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 """Endpoints for configuring recurring transactions on child accounts."""
@@ -6,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
-from app.models import RecurringCharge, User, Child
+from app.models import RecurringCharge, Child
 from app.schemas import (
     RecurringChargeCreate,
     RecurringChargeRead,
@@ -19,11 +20,15 @@ from app.crud import (
     save_recurring_charge,
     delete_recurring_charge,
 )
+from app.services.scheduler import notify_due_item
 from app.auth import (
     require_permissions,
     get_current_user,
-    get_current_identity,
     get_current_child,
+    authorize_child,
+    authorize_child_access,
+    ChildAccess,
+    Identity,
 )
 from app.acl import (
     PERM_ADD_RECURRING,
@@ -42,14 +47,8 @@ async def add_recurring_charge(
     child_id: int,
     data: RecurringChargeCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_ADD_RECURRING)),
+    access: ChildAccess = Depends(authorize_child(global_perm=PERM_ADD_RECURRING)),
 ):
-    if current_user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, current_user.id)
-        if child_id not in [c.id for c in children]:
-            raise HTTPException(status_code=404, detail="Child not found")
     from datetime import date
     if data.next_run < date.today():
         raise HTTPException(
@@ -64,8 +63,9 @@ async def add_recurring_charge(
         next_run=data.next_run,
     )
     new_rc = await create_recurring_charge(db, rc)
+    notify_due_item(datetime.combine(new_rc.next_run, time.min))
     logger.info(
-        "Recurring charge created for child %s by user %s", child_id, current_user.id
+        "Recurring charge created for child %s by user %s", child_id, access.identity.id
     )
     return new_rc
 
@@ -74,30 +74,16 @@ async def add_recurring_charge(
 async def list_recurring_charges(
     child_id: int,
     db: AsyncSession = Depends(get_session),
-    identity: tuple[str, Child | User] = Depends(get_current_identity),
+    access: ChildAccess = Depends(
+        authorize_child(global_perm=PERM_VIEW_TRANSACTIONS, allow_child=True)
+    ),
 ):
-    kind, obj = identity
-    if kind == "child":
-        child = obj
-        if child.id != child_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    else:
-        user: User = obj
-        if user.role != "admin":
-            user_perms = {p.name for p in user.permissions}
-            if PERM_VIEW_TRANSACTIONS not in user_perms:
-                raise HTTPException(status_code=403, detail="Insufficient permissions")
-            from app.crud import get_children_by_user
-
-            children = await get_children_by_user(db, user.id)
-            if child_id not in [c.id for c in children]:
-                raise HTTPException(status_code=404, detail="Child not found")
     return await get_recurring_charges_by_child(db, child_id)
 
 
 @router.get("/mine", response_model=List[RecurringChargeRead])
 async def list_my_recurring_charges(
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
     db: AsyncSession = Depends(get_session),
 ):
     return await get_recurring_charges_by_child(db, child.id)
@@ -108,17 +94,12 @@ async def update_recurring_charge(
     charge_id: int,
     data: RecurringChargeUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_EDIT_RECURRING)),
+    current_user: Identity = Depends(require_permissions(PERM_EDIT_RECURRING)),
 ):
     rc = await get_recurring_charge(db, charge_id)
     if not rc:
         raise HTTPException(status_code=404, detail="Recurring charge not found")
-    if current_user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, current_user.id)
-        if rc.child_id not in [c.id for c in children]:
-            raise HTTPException(status_code=404, detail="Child not found")
+    await authorize_child_access(db, current_user, rc.child_id)
     from datetime import date
     for field, value in data.model_dump(exclude_unset=True).items():
         if field == "next_run" and value < date.today():
@@ -127,6 +108,8 @@ async def update_recurring_charge(
             )
         setattr(rc, field, value)
     updated = await save_recurring_charge(db, rc)
+    if updated.active:
+        notify_due_item(datetime.combine(updated.next_run, time.min))
     logger.info("Recurring charge %s updated by user %s", charge_id, current_user.id)
     return updated
 
@@ -135,17 +118,12 @@ async def update_recurring_charge(
 async def delete_recurring_charge_route(
     charge_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_DELETE_RECURRING)),
+    current_user: Identity = Depends(require_permissions(PERM_DELETE_RECURRING)),
 ):
     rc = await get_recurring_charge(db, charge_id)
     if not rc:
         raise HTTPException(status_code=404, detail="Recurring charge not found")
-    if current_user.role != "admin":
-        from app.crud import get_children_by_user
-
-        children = await get_children_by_user(db, current_user.id)
-        if rc.child_id not in [c.id for c in children]:
-            raise HTTPException(status_code=404, detail="Child not found")
+    await authorize_child_access(db, current_user, rc.child_id)
     await delete_recurring_charge(db, rc)
     logger.info("Recurring charge %s deleted by user %s", charge_id, current_user.id)
     return None
@@ -1,11 +1,12 @@
 """Endpoints for viewing and updating site-wide settings."""
 
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
-from app.models import User
-from app.auth import require_role
+from app.auth import require_role, Identity
 from app.schemas import SettingsRead, SettingsUpdate
 from app.crud import get_settings, save_settings
 from app.schemas.validation import MAX_RATE
@@ -13,11 +14,24 @@ from app.schemas.validation import MAX_RATE
 router = APIRouter(prefix="/settings", tags=["settings"])
 
 
+def _etag(body: SettingsRead) -> str:
+    digest = hashlib.sha256(body.model_dump_json().encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
 @router.get("/", response_model=SettingsRead)
-async def read_settings(db: AsyncSession = Depends(get_session)):
-    """Retrieve the current configuration values."""
+async def read_settings(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_session),
+):
+    """Retrieve the current configuration values.
+
+    The response carries an ``ETag``; a request whose ``If-None-Match``
+    matches it gets ``304 Not Modified`` without a body.
+    """
     settings = await get_settings(db)
-    return SettingsRead(
+    body = SettingsRead(
         site_name=settings.site_name,
         site_url=settings.site_url,
         default_interest_rate=settings.default_interest_rate,
@@ -30,14 +44,22 @@ async def read_settings(db: AsyncSession = Depends(get_session)):
         overdraft_fee_daily=settings.overdraft_fee_daily,
         currency_symbol=settings.currency_symbol,
         public_registration_disabled=settings.public_registration_disabled,
+        interest_posting_frequency=settings.interest_posting_frequency,
+        daily_job_chunk_size=settings.daily_job_chunk_size,
     )
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return body
 
 
 @router.put("/", response_model=SettingsRead)
 async def update_settings(
     data: SettingsUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     """Update settings; only admins may change configuration."""
     if data.default_interest_rate is not None and not 0 <= data.default_interest_rate <= MAX_RATE:
@@ -54,10 +76,7 @@ async def update_settings(
     if data.overdraft_fee_is_percentage and data.overdraft_fee_amount is not None and data.overdraft_fee_amount > 1:
         raise HTTPException(status_code=400, detail="Overdraft fee percentage must be between 0 and 1")
 
-    settings = await get_settings(db)
-    for field, value in data.model_dump(exclude_unset=True).items():
-        setattr(settings, field, value)
-    updated = await save_settings(db, settings)
+    updated = await save_settings(db, data.model_dump(exclude_unset=True))
     return SettingsRead(
         site_name=updated.site_name,
         site_url=updated.site_url,
@@ -71,4 +90,6 @@ async def update_settings(
         overdraft_fee_daily=updated.overdraft_fee_daily,
         currency_symbol=updated.currency_symbol,
         public_registration_disabled=updated.public_registration_disabled,
+        interest_posting_frequency=updated.interest_posting_frequency,
+        daily_job_chunk_size=updated.daily_job_chunk_size,
     )
@@ -1,12 +1,17 @@
+import base64
+import binascii
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 """Endpoints for recording and viewing ledger transactions."""
 
 from app.database import get_session
-from app.models import Transaction, User, Child
+from app.models import Transaction, Child
 from app.schemas import (
     TransactionCreate,
     TransactionRead,
@@ -16,14 +21,23 @@ from app.schemas import (
 from app.crud import (
     create_transaction,
     get_transactions_by_child,
+    get_transactions_page,
     calculate_balance,
+    get_account_by_child,
+    get_accrued_interest,
     get_transaction,
     save_transaction,
     delete_transaction,
     post_transaction_update,
-    get_child_user_link,
 )
-from app.auth import require_permissions, get_current_user, get_current_identity
+from app.auth import (
+    ChildAccess,
+    Identity,
+    authorize_child,
+    authorize_child_access,
+    get_current_user,
+    require_permissions,
+)
 from app.acl import (
     PERM_ADD_TRANSACTION,
     PERM_VIEW_TRANSACTIONS,
@@ -37,12 +51,30 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
+DEFAULT_LEDGER_PAGE_SIZE = 50
+MAX_LEDGER_PAGE_SIZE = 500
+
+
+def _encode_cursor(key: tuple[datetime, int]) -> str:
+    timestamp, tx_id = key
+    raw = f"{timestamp.isoformat()}|{tx_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        timestamp, tx_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(tx_id)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
 @router.post("/", response_model=TransactionRead)
 async def add_transaction(
     transaction: TransactionCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_ADD_TRANSACTION)),
+    current_user: Identity = Depends(require_permissions(PERM_ADD_TRANSACTION)),
 ):
     """Create a new credit or debit transaction."""
     if transaction.amount <= 0:
@@ -50,24 +82,10 @@ async def add_transaction(
             status_code=400, detail="Transaction amount must be greater than zero"
         )
 
-    user_perm_names = {p.name for p in current_user.permissions}
-    if current_user.role != "admin":
-        if transaction.type == "credit" and PERM_DEPOSIT not in user_perm_names:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions"
-            )
-        if transaction.type == "debit" and PERM_DEBIT not in user_perm_names:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions"
-            )
-
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, transaction.child_id)
-        if not link:
-            raise HTTPException(status_code=404, detail="Child not found")
-        perm_needed = PERM_DEPOSIT if transaction.type == "credit" else PERM_DEBIT
-        if perm_needed not in link.permissions and not link.is_owner:
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    perm_needed = PERM_DEPOSIT if transaction.type == "credit" else PERM_DEBIT
+    await authorize_child_access(
+        db, current_user, transaction.child_id, perm_needed, global_perm=perm_needed
+    )
 
     tx_model = Transaction(
         child_id=transaction.child_id,
@@ -94,7 +112,7 @@ async def update_transaction_route(
     transaction_id: int,
     data: TransactionUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_EDIT_TRANSACTION)),
+    current_user: Identity = Depends(require_permissions(PERM_EDIT_TRANSACTION)),
 ):
     tx = await get_transaction(db, transaction_id)
     if not tx:
@@ -115,7 +133,7 @@ async def update_transaction_route(
 async def delete_transaction_route(
     transaction_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_permissions(PERM_DELETE_TRANSACTION)),
+    current_user: Identity = Depends(require_permissions(PERM_DELETE_TRANSACTION)),
 ):
     tx = await get_transaction(db, transaction_id)
     if not tx:
@@ -128,29 +146,53 @@ async def delete_transaction_route(
 @router.get("/child/{child_id}", response_model=LedgerResponse)
 async def get_ledger(
     child_id: int,
+    limit: int = Query(
+        default=DEFAULT_LEDGER_PAGE_SIZE, ge=1, le=MAX_LEDGER_PAGE_SIZE
+    ),
+    cursor: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    tx_type: Literal["credit", "debit"] | None = Query(default=None, alias="type"),
+    initiated_by: Literal["child", "parent", "system"] | None = None,
+    legacy: bool = False,
     db: AsyncSession = Depends(get_session),
-    identity: tuple[str, Child | User] = Depends(get_current_identity),
+    access: ChildAccess = Depends(
+        authorize_child(
+            PERM_VIEW_TRANSACTIONS,
+            global_perm=PERM_VIEW_TRANSACTIONS,
+            allow_child=True,
+        )
+    ),
 ):
-    """Return the full ledger and balance for a child."""
-    kind, obj = identity
-    if kind == "child":
-        child = obj
-        if child.id != child_id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    else:
-        user: User = obj
-        if user.role != "admin":
-            user_perms = {p.name for p in user.permissions}
-            if PERM_VIEW_TRANSACTIONS not in user_perms:
-                raise HTTPException(status_code=403, detail="Insufficient permissions")
-            link = await get_child_user_link(db, user.id, child_id)
-            if not link:
-                raise HTTPException(status_code=404, detail="Child not found")
-            if (
-                PERM_VIEW_TRANSACTIONS not in link.permissions
-                and not link.is_owner
-            ):
-                raise HTTPException(status_code=403, detail="Insufficient permissions")
-    transactions = await get_transactions_by_child(db, child_id)
+    """Return a page of a child's ledger, newest first, plus the balance.
+
+    Pass ``next_cursor`` back as ``cursor`` to fetch the following page.
+    ``start``/``end`` bound ``timestamp`` (inclusive/exclusive).  ``legacy=true``
+    returns the full, oldest-first ledger in one response for older clients.
+    """
     balance = await calculate_balance(db, child_id)
-    return {"balance": balance, "transactions": transactions}
+    account = await get_account_by_child(db, child_id)
+    accrued = await get_accrued_interest(db, account) if account else 0
+    if legacy:
+        transactions = await get_transactions_by_child(db, child_id)
+        return {
+            "balance": balance,
+            "accrued_interest": accrued,
+            "transactions": transactions,
+        }
+    transactions, next_key = await get_transactions_page(
+        db,
+        child_id,
+        limit=limit,
+        after=_decode_cursor(cursor) if cursor else None,
+        start=start,
+        end=end,
+        tx_type=tx_type,
+        initiated_by=initiated_by,
+    )
+    return {
+        "balance": balance,
+        "accrued_interest": accrued,
+        "transactions": transactions,
+        "next_cursor": _encode_cursor(next_key) if next_key else None,
+    }
@@ -6,7 +6,12 @@ from app.schemas import UserCreate, UserResponse, UserMeResponse, PasswordChange
 from app.models import User
 from app.database import get_session
 from app.crud import create_user, get_user_by_email, save_user
-from app.auth import get_password_hash, require_role, get_current_user
+from app.auth import (
+    Identity,
+    get_current_user_record,
+    get_password_hash_async,
+    require_role,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -14,20 +19,22 @@ router = APIRouter(prefix="/users", tags=["users"])
 async def create_user_route(
     user: UserCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Identity = Depends(require_role("admin")),
 ):
     """Create a new user; only admins may call this endpoint."""
 
     existing = await get_user_by_email(db, user.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed = get_password_hash(user.password)
-    user_model = User(name=user.name, email=user.email, password_hash=hashed)
+    hashed = await get_password_hash_async(user.password)
+    user_model = User(
+        name=user.name, email=user.email, password_hash=hashed, password_migrated=True
+    )
     return await create_user(db, user_model)
 
 
 @router.get("/me", response_model=UserMeResponse)
-async def read_current_user(current_user: User = Depends(get_current_user)):
+async def read_current_user(current_user: User = Depends(get_current_user_record)):
     """Return details for the authenticated user."""
     return UserMeResponse(
         id=current_user.id,
@@ -43,10 +50,11 @@ async def read_current_user(current_user: User = Depends(get_current_user)):
 async def change_password(
     data: PasswordChange,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
 ):
     """Allow the authenticated user to change their password."""
 
-    current_user.password_hash = get_password_hash(data.password)
+    current_user.password_hash = await get_password_hash_async(data.password)
+    current_user.password_migrated = True
     await save_user(db, current_user)
     return Response(status_code=204)
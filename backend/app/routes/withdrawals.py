@@ -6,8 +6,13 @@ from sqlmodel import select
 """Endpoints for handling child withdrawal requests."""
 
 from app.database import get_session
-from app.auth import get_current_child, require_permissions
-from app.models import WithdrawalRequest, Transaction, Child, User
+from app.auth import (
+    Identity,
+    authorize_child_access,
+    get_current_child,
+    require_permissions,
+)
+from app.models import WithdrawalRequest, Transaction
 from app.acl import PERM_MANAGE_WITHDRAWALS
 from app.crud import (
     create_withdrawal_request,
@@ -16,9 +21,7 @@ from app.crud import (
     get_withdrawal_request,
     save_withdrawal_request,
     create_transaction,
-    get_children_by_user,
     post_transaction_update,
-    get_child_user_link,
 )
 from app.schemas import WithdrawalRequestCreate, WithdrawalRequestRead, DenyRequest
 
@@ -29,7 +32,7 @@ router = APIRouter(prefix="/withdrawals", tags=["withdrawals"])
 async def request_withdrawal(
     data: WithdrawalRequestCreate,
     db: AsyncSession = Depends(get_session),
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
 ):
     """Children create a withdrawal request for parent approval."""
     if data.amount <= 0:
@@ -43,7 +46,7 @@ async def request_withdrawal(
 @router.get("/mine", response_model=list[WithdrawalRequestRead])
 async def my_requests(
     db: AsyncSession = Depends(get_session),
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
 ):
     return await get_withdrawal_requests_by_child(db, child.id)
 
@@ -51,37 +54,27 @@ async def my_requests(
 @router.get("/", response_model=list[WithdrawalRequestRead])
 async def pending_requests(
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(
+    current_user: Identity = Depends(
         require_permissions(PERM_MANAGE_WITHDRAWALS)
     ),
 ):
     return await get_pending_withdrawals_for_parent(db, current_user.id)
 
 
-async def _ensure_parent_owns_request(db: AsyncSession, req: WithdrawalRequest, parent_id: int) -> None:
-    children = await get_children_by_user(db, parent_id)
-    if req.child_id not in [c.id for c in children]:
-        raise HTTPException(status_code=404, detail="Request not found")
-
-
 @router.post("/{request_id}/approve", response_model=WithdrawalRequestRead)
 async def approve_request(
     request_id: int,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(
+    current_user: Identity = Depends(
         require_permissions(PERM_MANAGE_WITHDRAWALS)
     ),
 ):
     req = await get_withdrawal_request(db, request_id)
     if not req or req.status != "pending":
         raise HTTPException(status_code=404, detail="Request not found")
-    await _ensure_parent_owns_request(db, req, current_user.id)
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, req.child_id)
-        if not link or (
-            PERM_MANAGE_WITHDRAWALS not in link.permissions and not link.is_owner
-        ):
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    await authorize_child_access(
+        db, current_user, req.child_id, PERM_MANAGE_WITHDRAWALS
+    )
 
     tx = Transaction(
         child_id=req.child_id,
@@ -90,6 +83,8 @@ async def approve_request(
         memo=req.memo,
         initiated_by="child",
         initiator_id=req.child_id,
+        source_type="withdrawal",
+        source_id=req.id,
     )
     await create_transaction(db, tx)
     await post_transaction_update(db, req.child_id)
@@ -106,20 +101,16 @@ async def deny_request(
     request_id: int,
     reason: DenyRequest,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(
+    current_user: Identity = Depends(
         require_permissions(PERM_MANAGE_WITHDRAWALS)
     ),
 ):
     req = await get_withdrawal_request(db, request_id)
     if not req or req.status != "pending":
         raise HTTPException(status_code=404, detail="Request not found")
-    await _ensure_parent_owns_request(db, req, current_user.id)
-    if current_user.role != "admin":
-        link = await get_child_user_link(db, current_user.id, req.child_id)
-        if not link or (
-            PERM_MANAGE_WITHDRAWALS not in link.permissions and not link.is_owner
-        ):
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    await authorize_child_access(
+        db, current_user, req.child_id, PERM_MANAGE_WITHDRAWALS
+    )
     req.status = "denied"
     req.denial_reason = reason.reason
     req.responded_at = datetime.utcnow()
@@ -132,7 +123,7 @@ async def deny_request(
 async def cancel_request(
     request_id: int,
     db: AsyncSession = Depends(get_session),
-    child: Child = Depends(get_current_child),
+    child: Identity = Depends(get_current_child),
 ):
     req = await get_withdrawal_request(db, request_id)
     if not req or req.status != "pending" or req.child_id != child.id:
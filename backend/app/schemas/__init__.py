@@ -51,6 +51,8 @@ from .coupon import (
     CouponRedeem,
     CouponRedemptionRead,
 )
+from .job_run import JobRunRead
+from .dashboard import DashboardCD, DashboardChild, DashboardResponse
 from .education import (
     QuizQuestionRead,
     ModuleRead,
@@ -115,4 +117,8 @@ __all__ = [
     "QuizResult",
     "BadgeRead",
     "ModuleUpdate",
+    "JobRunRead",
+    "DashboardCD",
+    "DashboardChild",
+    "DashboardResponse",
 ]
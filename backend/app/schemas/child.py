@@ -25,10 +25,26 @@ class ChildRead(BaseModel):
     penalty_interest_rate: float | None = None
     cd_penalty_rate: float | None = None
     total_interest_earned: float | None = None
+    accrued_interest: float | None = None
 
     class Config:
         model_config = {"from_attributes": True}
 
+    @classmethod
+    def from_child(cls, child, account=None, accrued_interest=None) -> "ChildRead":
+        """Combine a ``Child`` row with its optional ``Account`` row."""
+
+        return cls(
+            id=child.id,
+            first_name=child.first_name,
+            account_frozen=child.account_frozen,
+            interest_rate=account.interest_rate if account else None,
+            penalty_interest_rate=account.penalty_interest_rate if account else None,
+            cd_penalty_rate=account.cd_penalty_rate if account else None,
+            total_interest_earned=account.total_interest_earned if account else None,
+            accrued_interest=accrued_interest if account else None,
+        )
+
 
 class ChildLogin(BaseModel):
     access_code: Annotated[str, SanitizedAccessCode]
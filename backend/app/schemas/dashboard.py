@@ -0,0 +1,30 @@
+"""Schemas for the parent dashboard summary."""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class DashboardCD(BaseModel):
+    id: int
+    amount: float
+    interest_rate: float
+    matures_at: datetime | None = None
+
+
+class DashboardChild(BaseModel):
+    id: int
+    first_name: str
+    frozen: bool
+    balance: float
+    accrued_interest: float
+    last_activity: datetime | None = None
+    pending_withdrawals: int = 0
+    chores_awaiting_approval: int = 0
+    active_loans: int = 0
+    active_loan_principal: float = 0.0
+    upcoming_cds: list[DashboardCD] = []
+
+
+class DashboardResponse(BaseModel):
+    children: list[DashboardChild]
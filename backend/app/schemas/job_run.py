@@ -0,0 +1,25 @@
+"""Schemas for scheduled job run history."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobRunRead(BaseModel):
+    id: int
+    job_name: str
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    error: Optional[str] = None
+    checkpoint: Optional[int] = None
+    critical_path_seconds: Optional[float] = None
+    rows_read: Optional[int] = None
+    rows_written: Optional[int] = None
+    commits: Optional[int] = None
+    max_item_ms: Optional[float] = None
+    max_lag_seconds: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
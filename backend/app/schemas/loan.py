@@ -33,6 +33,7 @@ class LoanRead(BaseModel):
     terms: Optional[str]
     status: str
     principal_remaining: float
+    accrued_interest: float = 0.0
     created_at: datetime
 
     class Config:
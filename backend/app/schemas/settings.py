@@ -1,6 +1,6 @@
 """Pydantic models for application configuration settings."""
 
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field
 
@@ -20,6 +20,8 @@ class SettingsRead(BaseModel):
     overdraft_fee_daily: bool
     currency_symbol: str
     public_registration_disabled: bool
+    interest_posting_frequency: str
+    daily_job_chunk_size: int
 
 
 class SettingsUpdate(BaseModel):
@@ -35,3 +37,5 @@ class SettingsUpdate(BaseModel):
     overdraft_fee_daily: bool | None = None
     currency_symbol: str | None = Field(default=None, min_length=1, max_length=8)
     public_registration_disabled: bool | None = None
+    interest_posting_frequency: Literal["daily", "weekly", "monthly"] | None = None
+    daily_job_chunk_size: int | None = Field(default=None, ge=1, le=10000)
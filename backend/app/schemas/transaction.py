@@ -44,6 +44,8 @@ class TransactionUpdate(BaseModel):
 class TransactionRead(TransactionBase):
     transaction_id: int = Field(alias="id")
     timestamp: datetime
+    source_type: Optional[str] = None
+    source_id: Optional[int] = None
 
     class Config:
         model_config = {"from_attributes": True}
@@ -51,4 +53,6 @@ class TransactionRead(TransactionBase):
 
 class LedgerResponse(BaseModel):
     balance: float
+    accrued_interest: float = 0.0
     transactions: list[TransactionRead]
+    next_cursor: Optional[str] = None
@@ -6,46 +6,115 @@ embedded directly in ``app.main``.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import date, datetime, time, timedelta
-from typing import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Awaitable, Callable, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import update
+from sqlalchemy.pool import StaticPool
 from sqlmodel import select
 
 from app.crud import (
-    apply_overdraft_fee,
-    apply_service_fee,
-    get_all_accounts,
+    Shard,
+    apply_interest_and_fees_batch,
+    get_next_due_at,
     get_settings,
     process_due_recurring_charges,
     process_loan_interest,
-    recalc_interest,
     redeem_matured_cds,
 )
+from app.job_metrics import JobMetrics
 from app.models import JobRun
+from app.services.leases import LeaseFence, LeaseLostError
 
 logger = logging.getLogger(__name__)
 
 PIPELINE_JOB_NAME = "daily_jobs_pipeline"
 
 
-async def _create_job_run(db: AsyncSession, job_name: str) -> JobRun:
-    run = JobRun(job_name=job_name, status="running")
+class JobContext:
+    """Progress handle passed to stages and pipeline runners.
+
+    ``resume_after`` is the checkpoint left by an unfinished run of the same
+    stage earlier today, or ``None`` to start from the beginning.
+    ``metrics`` and, when set, ``critical_path_seconds`` are recorded on the
+    ``JobRun``.
+    """
+
+    def __init__(self, run_id: int, resume_after: int | None) -> None:
+        self.run_id = run_id
+        self.resume_after = resume_after
+        self.metrics = JobMetrics()
+        self.critical_path_seconds: float | None = None
+
+    async def save_checkpoint(self, db: AsyncSession, key: int) -> None:
+        """Stage ``key`` as the last processed item; it commits with ``db``."""
+
+        await db.execute(
+            update(JobRun).where(JobRun.id == self.run_id).values(checkpoint=key)
+        )
+
+
+async def _resume_checkpoint(db: AsyncSession, job_name: str) -> int | None:
+    """Return the checkpoint of today's latest run if it did not succeed.
+
+    "Today" is the local ``date.today()`` the stages process, so a run
+    from the previous local day is never resumed into the wrong date.
+    ``started_at`` is naive UTC, hence the local midnight is converted.
+    """
+
+    start = (
+        datetime.combine(date.today(), time.min)
+        .astimezone(timezone.utc)
+        .replace(tzinfo=None)
+    )
+    result = await db.execute(
+        select(JobRun)
+        .where(JobRun.job_name == job_name, JobRun.started_at >= start)
+        .order_by(JobRun.started_at.desc(), JobRun.id.desc())
+        .limit(1)
+    )
+    last = result.scalar_one_or_none()
+    if last is None or last.status == "success":
+        return None
+    return last.checkpoint
+
+
+async def _create_job_run(
+    db: AsyncSession, job_name: str, checkpoint: int | None = None
+) -> JobRun:
+    run = JobRun(job_name=job_name, status="running", checkpoint=checkpoint)
     db.add(run)
     await db.commit()
     await db.refresh(run)
     return run
 
 
+def _rounded(value: float | None) -> float | None:
+    return round(value, 3) if value is not None else None
+
+
 async def _finalize_job_run(
     db: AsyncSession,
     run: JobRun,
     *,
     status: str,
     error: str | None = None,
+    context: JobContext | None = None,
 ) -> None:
     run.status = status
+    if context is not None:
+        metrics = context.metrics
+        run.rows_read = metrics.rows_read
+        run.rows_written = metrics.rows_written
+        run.commits = metrics.commits
+        run.max_item_ms = _rounded(metrics.max_item_ms)
+        run.max_lag_seconds = _rounded(metrics.max_lag_seconds)
+        run.critical_path_seconds = _rounded(context.critical_path_seconds)
     run.error = (error or "")[:2000] or None
     run.finished_at = datetime.utcnow()
     db.add(run)
@@ -56,18 +125,49 @@ async def run_tracked_job(
     session_factory: async_sessionmaker[AsyncSession],
     *,
     job_name: str,
-    runner: Callable[[AsyncSession], Awaitable[None]],
+    runner: Callable[..., Awaitable[None]],
+    resumable: bool = False,
+    takes_context: bool = False,
+    fence: LeaseFence | None = None,
+    timeout_seconds: float | None = None,
 ) -> None:
+    """Run ``runner`` and record the outcome as a ``JobRun``.
+
+    Resumable runners, and runners flagged ``takes_context``, are called as
+    ``runner(db, context)`` with a :class:`JobContext`.  Resumable runners
+    pick up after the checkpoint of an unfinished run from earlier today and
+    save their own progress as they commit.  Reads, writes and commits on
+    the runner's session are counted into ``context.metrics`` either way.
+    With a ``fence``, every commit of the runner's session first verifies
+    that the scheduler lease is still held.  A runner exceeding ``timeout_seconds`` is cancelled and recorded
+    as an error.
+    """
+
     async with session_factory() as run_db:
-        run = await _create_job_run(run_db, job_name)
+        resume_after = (
+            await _resume_checkpoint(run_db, job_name) if resumable else None
+        )
+        run = await _create_job_run(run_db, job_name, resume_after)
 
+    context = JobContext(run.id, resume_after)
     try:
         async with session_factory() as db:
-            await runner(db)
+            context.metrics.attach(db)
+            if fence is not None:
+                fence.attach(db)
+            work = runner(db, context) if resumable or takes_context else runner(db)
+            try:
+                await asyncio.wait_for(work, timeout_seconds)
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"{job_name} timed out after {timeout_seconds:g}s"
+                ) from None
         async with session_factory() as run_db:
             fresh_run = await run_db.get(JobRun, run.id)
             if fresh_run:
-                await _finalize_job_run(run_db, fresh_run, status="success")
+                await _finalize_job_run(
+                    run_db, fresh_run, status="success", context=context
+                )
     except Exception as exc:
         async with session_factory() as run_db:
             fresh_run = await run_db.get(JobRun, run.id)
@@ -76,7 +176,8 @@ async def run_tracked_job(
                     run_db,
                     fresh_run,
                     status="error",
-                    error=str(exc),
+                    error=str(exc) or type(exc).__name__,
+                    context=context,
                 )
         raise
 
@@ -100,29 +201,296 @@ async def has_successful_run_for_day(
     return result.first() is not None
 
 
-async def run_due_recurring_charges(db: AsyncSession) -> None:
-    await process_due_recurring_charges(db)
+def shard_job_name(job_name: str, shard: Shard | None) -> str:
+    """Return the ``job_runs`` name for ``job_name`` within ``shard``."""
 
+    if shard is None:
+        return job_name
+    index, count = shard
+    return f"{job_name}@{index}/{count}"
 
-async def run_account_interest_and_fees(db: AsyncSession) -> None:
+
+async def run_due_recurring_charges(
+    db: AsyncSession,
+    context: JobContext | None = None,
+    shard: Shard | None = None,
+) -> None:
+    await process_due_recurring_charges(
+        db, shard, context.metrics if context else None
+    )
+
+
+async def run_account_interest_and_fees(
+    db: AsyncSession,
+    context: JobContext | None = None,
+    shard: Shard | None = None,
+) -> None:
     settings = await get_settings(db)
-    accounts = await get_all_accounts(db)
-    for account in accounts:
-        await recalc_interest(db, account.child_id)
 
-    accounts = await get_all_accounts(db)
-    today = date.today()
-    for account in accounts:
-        await apply_service_fee(db, account, settings, today)
-        await apply_overdraft_fee(db, account, settings, today)
+    async def _checkpoint(child_id: int) -> None:
+        await context.save_checkpoint(db, child_id)
+
+    await apply_interest_and_fees_batch(
+        db,
+        settings,
+        date.today(),
+        after_child_id=context.resume_after if context else None,
+        on_chunk=_checkpoint if context else None,
+        shard=shard,
+        metrics=context.metrics if context else None,
+    )
+
+
+async def run_loan_interest(
+    db: AsyncSession,
+    context: JobContext | None = None,
+    shard: Shard | None = None,
+) -> None:
+    await process_loan_interest(db, shard, context.metrics if context else None)
+
+
+async def run_cd_redemptions(
+    db: AsyncSession,
+    context: JobContext | None = None,
+    shard: Shard | None = None,
+) -> None:
+    await redeem_matured_cds(db, shard, context.metrics if context else None)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the daily pipeline.
+
+    ``runner`` is called as ``runner(db, context, shard=...)``; only
+    ``resumable`` stages get a checkpoint to resume from.  A stage starts
+    once every stage named in ``depends_on`` has succeeded; if one of them
+    fails the stage is skipped.  Failed attempts, including timeouts, are
+    retried up to ``max_attempts`` with exponential backoff.
+    """
+
+    name: str
+    runner: Callable[..., Awaitable[None]]
+    depends_on: tuple[str, ...] = ()
+    resumable: bool = False
+    timeout_seconds: float | None = None
+    max_attempts: int = 3
+    backoff_seconds: float = 5.0
+
+
+# Recurring charges land before the day's interest and fees so that both
+# see the same balance; CD payouts come after, matching the overdraft state
+# the fees were computed from.  Loans touch no transactions and run
+# alongside the account stages.
+DAILY_STAGES: tuple[Stage, ...] = (
+    Stage(
+        "daily.recurring_charges",
+        run_due_recurring_charges,
+        timeout_seconds=900,
+    ),
+    Stage(
+        "daily.account_interest_and_fees",
+        run_account_interest_and_fees,
+        depends_on=("daily.recurring_charges",),
+        resumable=True,
+        timeout_seconds=3600,
+    ),
+    Stage(
+        "daily.loan_interest",
+        run_loan_interest,
+        timeout_seconds=1800,
+    ),
+    Stage(
+        "daily.cd_redemptions",
+        run_cd_redemptions,
+        depends_on=("daily.account_interest_and_fees",),
+        timeout_seconds=900,
+    ),
+)
+
+DUE_ITEM_STAGE_NAMES = ("daily.recurring_charges", "daily.cd_redemptions")
+
+
+def select_stages(
+    stages: Sequence[Stage], names: Sequence[str]
+) -> tuple[Stage, ...]:
+    """Return the stages named in ``names`` with dependencies outside the
+    selection dropped, keeping the registry order."""
+
+    wanted = set(names)
+    return tuple(
+        Stage(
+            stage.name,
+            stage.runner,
+            depends_on=tuple(dep for dep in stage.depends_on if dep in wanted),
+            resumable=stage.resumable,
+            timeout_seconds=stage.timeout_seconds,
+            max_attempts=stage.max_attempts,
+            backoff_seconds=stage.backoff_seconds,
+        )
+        for stage in stages
+        if stage.name in wanted
+    )
 
 
-async def run_loan_interest(db: AsyncSession) -> None:
-    await process_loan_interest(db)
+def _topological_order(stages: Sequence[Stage]) -> list[Stage]:
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Duplicate stage names in pipeline")
+    ordered: list[Stage] = []
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(stage: Stage) -> None:
+        if stage.name in done:
+            return
+        if stage.name in visiting:
+            raise ValueError(f"Dependency cycle through stage '{stage.name}'")
+        visiting.add(stage.name)
+        for dep in stage.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown '{dep}'")
+            visit(by_name[dep])
+        visiting.discard(stage.name)
+        done.add(stage.name)
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
+
+
+def _max_concurrency(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """Stages share nothing but the engine; a single-connection pool (such
+    as in-memory SQLite) cannot host concurrent transactions."""
+
+    bind = session_factory.kw.get("bind")
+    if bind is not None and isinstance(bind.pool, StaticPool):
+        return 1
+    return len(DAILY_STAGES)
+
+
+async def _run_stage(
+    session_factory: async_sessionmaker[AsyncSession],
+    stage: Stage,
+    shard: Shard | None,
+    fence: LeaseFence | None,
+) -> None:
+    job_name = shard_job_name(stage.name, shard)
+    for attempt in range(1, stage.max_attempts + 1):
+        try:
+            await run_tracked_job(
+                session_factory,
+                job_name=job_name,
+                runner=partial(stage.runner, shard=shard),
+                resumable=stage.resumable,
+                takes_context=True,
+                fence=fence,
+                timeout_seconds=stage.timeout_seconds,
+            )
+            return
+        except LeaseLostError:
+            raise
+        except Exception:
+            if attempt == stage.max_attempts:
+                raise
+            delay = stage.backoff_seconds * 2 ** (attempt - 1)
+            logger.warning(
+                "Stage %s failed (attempt %s/%s); retrying in %.1fs",
+                job_name,
+                attempt,
+                stage.max_attempts,
+                delay,
+                exc_info=True,
+            )
+            await asyncio.sleep(delay)
 
 
-async def run_cd_redemptions(db: AsyncSession) -> None:
-    await redeem_matured_cds(db)
+async def run_stage_graph(
+    session_factory: async_sessionmaker[AsyncSession],
+    stages: Sequence[Stage],
+    *,
+    shard: Shard | None = None,
+    fence: LeaseFence | None = None,
+) -> float:
+    """Run ``stages`` in dependency order, independent ones concurrently.
+
+    Each stage runs in its own session and records its own ``JobRun``.
+    Stages downstream of a failure are skipped while unrelated branches
+    finish; the first failure is then re-raised.  Returns the critical-path
+    time: the slowest chain of dependent stages, retries included.
+    """
+
+    ordered = _topological_order(stages)
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(_max_concurrency(session_factory))
+    tasks: dict[str, asyncio.Task] = {}
+    path_seconds: dict[str, float] = {}
+
+    async def run_one(stage: Stage) -> None:
+        for dep in stage.depends_on:
+            try:
+                await tasks[dep]
+            except Exception as exc:
+                logger.warning(
+                    "Skipping stage %s because %s failed",
+                    shard_job_name(stage.name, shard),
+                    dep,
+                )
+                raise RuntimeError(
+                    f"{stage.name} skipped: dependency {dep} failed"
+                ) from exc
+        async with limit:
+            started = loop.time()
+            await _run_stage(session_factory, stage, shard, fence)
+            elapsed = loop.time() - started
+        path_seconds[stage.name] = elapsed + max(
+            (path_seconds[dep] for dep in stage.depends_on), default=0.0
+        )
+
+    for stage in ordered:
+        tasks[stage.name] = asyncio.create_task(run_one(stage))
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return max(path_seconds.values(), default=0.0)
+
+
+async def _run_stages(
+    session_factory: async_sessionmaker[AsyncSession],
+    shard: Shard | None,
+    fence: LeaseFence | None = None,
+) -> float:
+    return await run_stage_graph(
+        session_factory, DAILY_STAGES, shard=shard, fence=fence
+    )
+
+
+async def run_due_items_once(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    shard: Shard | None = None,
+    fence: LeaseFence | None = None,
+) -> bool:
+    """Process recurring charges and CD maturities that fell due since the
+    daily pipeline ran.
+
+    Both stages are idempotent per item, so this is safe to call between
+    daily runs.  Returns ``False`` without recording anything when nothing
+    is due.
+    """
+
+    async with session_factory() as db:
+        due_at = await get_next_due_at(db, shard)
+    if due_at is None or due_at > datetime.utcnow():
+        return False
+    await run_stage_graph(
+        session_factory,
+        select_stages(DAILY_STAGES, DUE_ITEM_STAGE_NAMES),
+        shard=shard,
+        fence=fence,
+    )
+    return True
 
 
 async def run_daily_jobs_once(
@@ -130,6 +498,7 @@ async def run_daily_jobs_once(
     *,
     run_date: date | None = None,
     skip_if_completed: bool = True,
+    fence: LeaseFence | None = None,
 ) -> bool:
     """Run the full daily pipeline once.
 
@@ -153,31 +522,93 @@ async def run_daily_jobs_once(
             )
             return False
 
-    async def _run_pipeline(_: AsyncSession) -> None:
-        await run_tracked_job(
-            session_factory,
-            job_name="daily.recurring_charges",
-            runner=run_due_recurring_charges,
-        )
-        await run_tracked_job(
-            session_factory,
-            job_name="daily.account_interest_and_fees",
-            runner=run_account_interest_and_fees,
-        )
-        await run_tracked_job(
-            session_factory,
-            job_name="daily.loan_interest",
-            runner=run_loan_interest,
-        )
-        await run_tracked_job(
-            session_factory,
-            job_name="daily.cd_redemptions",
-            runner=run_cd_redemptions,
+    async def _run_pipeline(_: AsyncSession, context: JobContext) -> None:
+        context.critical_path_seconds = await _run_stages(
+            session_factory, None, fence
         )
 
     await run_tracked_job(
         session_factory,
         job_name=PIPELINE_JOB_NAME,
         runner=_run_pipeline,
+        takes_context=True,
     )
     return True
+
+
+async def run_daily_shard_once(
+    session_factory: async_sessionmaker[AsyncSession],
+    shard: Shard,
+    *,
+    run_date: date | None = None,
+    skip_if_completed: bool = True,
+    fence: LeaseFence | None = None,
+) -> bool:
+    """Run every daily stage for one shard of children.
+
+    The shard's progress is tracked as ``daily_jobs_pipeline@<index>/<count>``.
+    Whichever shard finishes last also records the overall
+    ``daily_jobs_pipeline`` success, so per-day deduplication keeps working.
+    Returns ``True`` when this call executed the shard.
+    """
+
+    target_day = run_date or datetime.utcnow().date()
+    shard_pipeline = shard_job_name(PIPELINE_JOB_NAME, shard)
+
+    if skip_if_completed:
+        async with session_factory() as db:
+            already_ran = await has_successful_run_for_day(
+                db, job_name=shard_pipeline, day=target_day
+            )
+        if already_ran:
+            logger.info(
+                "Daily shard %s already completed for %s",
+                shard_pipeline,
+                target_day.isoformat(),
+            )
+            return False
+
+    async def _run_pipeline(_: AsyncSession, context: JobContext) -> None:
+        context.critical_path_seconds = await _run_stages(
+            session_factory, shard, fence
+        )
+
+    await run_tracked_job(
+        session_factory,
+        job_name=shard_pipeline,
+        runner=_run_pipeline,
+        takes_context=True,
+    )
+    await _complete_sharded_pipeline(session_factory, shard[1], target_day)
+    return True
+
+
+async def _complete_sharded_pipeline(
+    session_factory: async_sessionmaker[AsyncSession],
+    shard_count: int,
+    day: date,
+) -> bool:
+    """Record ``daily_jobs_pipeline`` success once every shard has succeeded."""
+
+    async with session_factory() as db:
+        if await has_successful_run_for_day(db, job_name=PIPELINE_JOB_NAME, day=day):
+            return False
+        for index in range(shard_count):
+            if not await has_successful_run_for_day(
+                db,
+                job_name=shard_job_name(PIPELINE_JOB_NAME, (index, shard_count)),
+                day=day,
+            ):
+                return False
+        now = datetime.utcnow()
+        db.add(
+            JobRun(
+                job_name=PIPELINE_JOB_NAME,
+                status="success",
+                started_at=now,
+                finished_at=now,
+            )
+        )
+        await db.commit()
+    logger.info("All %s daily shards completed for %s", shard_count, day.isoformat())
+    return True
@@ -0,0 +1,149 @@
+"""Lease heartbeats and fencing for scheduler locks.
+
+A scheduler lease is a ``scheduler_locks`` row.  Every change of owner bumps
+its ``fencing_token``.  While work is in flight, :class:`LeaseHeartbeat`
+keeps extending ``locked_until`` in the background.  :class:`LeaseFence`
+checks before every commit of a stage session that the token is still
+ours, so a replica that lost its lease cannot write after another one has
+taken over.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLostError(RuntimeError):
+    """Raised when a lease changed owner while its holder was still working."""
+
+
+async def renew_scheduler_lock(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    lock_name: str,
+    owner_id: str,
+    token: int,
+    ttl_seconds: int,
+) -> bool:
+    """Extend a held lease; ``False`` means it has been taken over."""
+
+    now = datetime.utcnow()
+    async with session_factory() as db:
+        result = await db.execute(
+            text(
+                """
+                UPDATE scheduler_locks
+                SET locked_until = :locked_until,
+                    updated_at = :now
+                WHERE name = :name
+                  AND owner_id = :owner_id
+                  AND fencing_token = :token
+                """
+            ),
+            {
+                "name": lock_name,
+                "owner_id": owner_id,
+                "token": token,
+                "locked_until": now + timedelta(seconds=ttl_seconds),
+                "now": now,
+            },
+        )
+        await db.commit()
+        return (result.rowcount or 0) > 0
+
+
+class LeaseFence:
+    """Rejects commits once ``token`` is no longer the lease's current token."""
+
+    def __init__(self, lock_name: str, owner_id: str, token: int) -> None:
+        self.lock_name = lock_name
+        self.owner_id = owner_id
+        self.token = token
+
+    def attach(self, db: AsyncSession) -> None:
+        """Check the fence before every commit issued on ``db``."""
+
+        event.listen(db.sync_session, "before_commit", self._check)
+
+    def _check(self, session: Session) -> None:
+        held = session.execute(
+            text(
+                """
+                SELECT 1 FROM scheduler_locks
+                WHERE name = :name
+                  AND owner_id = :owner_id
+                  AND fencing_token = :token
+                """
+            ),
+            {"name": self.lock_name, "owner_id": self.owner_id, "token": self.token},
+        ).first()
+        if held is None:
+            raise LeaseLostError(
+                f"Lease '{self.lock_name}' token {self.token} is no longer held "
+                f"by {self.owner_id}"
+            )
+
+
+class LeaseHeartbeat:
+    """Async context manager that renews a lease until the block exits.
+
+    Yields the :class:`LeaseFence` for the lease.  Renewal runs every
+    ``interval_seconds`` (a third of the TTL by default).  It stops quietly
+    once the lease has been taken over; the fence then fails the next commit.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        lock_name: str,
+        owner_id: str,
+        token: int,
+        ttl_seconds: int,
+        interval_seconds: float | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._ttl_seconds = ttl_seconds
+        self._interval = interval_seconds or max(ttl_seconds / 3, 1)
+        self._task: asyncio.Task | None = None
+        self.fence = LeaseFence(lock_name, owner_id, token)
+
+    async def __aenter__(self) -> LeaseFence:
+        self._task = asyncio.create_task(self._beat())
+        return self.fence
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                renewed = await renew_scheduler_lock(
+                    self._session_factory,
+                    lock_name=self.fence.lock_name,
+                    owner_id=self.fence.owner_id,
+                    token=self.fence.token,
+                    ttl_seconds=self._ttl_seconds,
+                )
+            except Exception:
+                logger.exception("Lease heartbeat for '%s' failed", self.fence.lock_name)
+                continue
+            if not renewed:
+                logger.warning(
+                    "Lease '%s' was taken over; stopping heartbeat",
+                    self.fence.lock_name,
+                )
+                return
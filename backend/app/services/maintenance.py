@@ -0,0 +1,67 @@
+"""Operator maintenance commands for existing installs.
+
+Run from the ``backend`` directory, e.g.::
+
+    python -m app.services.maintenance rebuild-balances
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+
+from app.crud import backfill_transaction_sources, rebuild_account_balances
+from app.database import async_session, create_db_and_tables
+
+logger = logging.getLogger(__name__)
+
+
+async def run_rebuild_balances(child_id: int | None = None) -> int:
+    """Recompute materialized account balances from the ledger."""
+
+    await create_db_and_tables()
+    async with async_session() as db:
+        return await rebuild_account_balances(db, child_id=child_id)
+
+
+async def run_backfill_transaction_sources() -> int:
+    """Classify legacy ledger rows by the CD, loan, fee, etc. behind them."""
+
+    await create_db_and_tables()
+    async with async_session() as db:
+        return await backfill_transaction_sources(db)
+
+
+async def _run_cli() -> None:
+    parser = argparse.ArgumentParser(description="Uncle Jon's Bank maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-balances",
+        help="Recompute Account.balance from the transaction ledger",
+    )
+    rebuild.add_argument(
+        "--child-id",
+        type=int,
+        default=None,
+        help="Only rebuild the account for this child",
+    )
+    commands.add_parser(
+        "backfill-transaction-sources",
+        help="Derive Transaction.source_type/source_id from legacy memos",
+    )
+    args = parser.parse_args()
+
+    if args.command == "rebuild-balances":
+        count = await run_rebuild_balances(child_id=args.child_id)
+        logger.info("Rebuilt balances for %s account(s)", count)
+    elif args.command == "backfill-transaction-sources":
+        count = await run_backfill_transaction_sources()
+        logger.info("Classified %s transaction(s)", count)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper()))
+    asyncio.run(_run_cli())
@@ -1,4 +1,4 @@
-"""Scheduler runner with DB-backed leader election."""
+"""Scheduler runner with DB-backed leader election and optional sharding."""
 
 from __future__ import annotations
 
@@ -8,18 +8,26 @@ import logging
 import os
 import socket
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.database import async_session, create_db_and_tables
-from app.services.daily_jobs import run_daily_jobs_once
+from app.crud import get_next_due_at
+from app.services.daily_jobs import (
+    run_daily_jobs_once,
+    run_daily_shard_once,
+    run_due_items_once,
+)
+from app.services.leases import LeaseHeartbeat
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_LOCK_NAME = "daily_jobs_lock"
+DEFAULT_POLL_SECONDS = 900
+MIN_SLEEP_SECONDS = 1
 
 
 def _int_env(name: str, default: int) -> int:
@@ -40,13 +48,19 @@ def build_owner_id() -> str:
     return f"{host}:{pid}:{suffix}"
 
 
-async def try_acquire_scheduler_lock(
+async def acquire_scheduler_lease(
     session_factory: async_sessionmaker[AsyncSession],
     *,
     lock_name: str,
     owner_id: str,
     ttl_seconds: int,
-) -> bool:
+) -> int | None:
+    """Acquire or renew ``lock_name`` and return its fencing token.
+
+    The token increases every time the lease changes owner.  Returns ``None``
+    when another owner holds an unexpired lease.
+    """
+
     now = datetime.utcnow()
     locked_until = now + timedelta(seconds=ttl_seconds)
 
@@ -55,7 +69,11 @@ async def try_acquire_scheduler_lock(
             text(
                 """
                 UPDATE scheduler_locks
-                SET owner_id = :owner_id,
+                SET fencing_token = CASE
+                        WHEN owner_id = :owner_id THEN fencing_token
+                        ELSE fencing_token + 1
+                    END,
+                    owner_id = :owner_id,
                     locked_until = :locked_until,
                     updated_at = :now
                 WHERE name = :name
@@ -70,15 +88,21 @@ async def try_acquire_scheduler_lock(
             },
         )
         if (result.rowcount or 0) > 0:
+            token = await db.execute(
+                text("SELECT fencing_token FROM scheduler_locks WHERE name = :name"),
+                {"name": lock_name},
+            )
+            fencing_token = token.scalar_one()
             await db.commit()
-            return True
+            return fencing_token
 
         try:
             await db.execute(
                 text(
                     """
-                    INSERT INTO scheduler_locks (name, owner_id, locked_until, updated_at)
-                    VALUES (:name, :owner_id, :locked_until, :now)
+                    INSERT INTO scheduler_locks
+                        (name, owner_id, locked_until, updated_at, fencing_token)
+                    VALUES (:name, :owner_id, :locked_until, :now, 1)
                     """
                 ),
                 {
@@ -89,14 +113,136 @@ async def try_acquire_scheduler_lock(
                 },
             )
             await db.commit()
-            return True
+            return 1
         except IntegrityError:
             await db.rollback()
-            return False
+            return None
+
+
+async def try_acquire_scheduler_lock(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    lock_name: str,
+    owner_id: str,
+    ttl_seconds: int,
+) -> bool:
+    token = await acquire_scheduler_lease(
+        session_factory,
+        lock_name=lock_name,
+        owner_id=owner_id,
+        ttl_seconds=ttl_seconds,
+    )
+    return token is not None
+
+
+async def release_scheduler_lock(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    lock_name: str,
+    owner_id: str,
+) -> None:
+    """Expire ``lock_name`` early if ``owner_id`` still holds it."""
+
+    now = datetime.utcnow()
+    async with session_factory() as db:
+        await db.execute(
+            text(
+                """
+                UPDATE scheduler_locks
+                SET locked_until = :now, updated_at = :now
+                WHERE name = :name AND owner_id = :owner_id
+                """
+            ),
+            {"name": lock_name, "owner_id": owner_id, "now": now},
+        )
+        await db.commit()
+
+
+def shard_lock_name(lock_name: str, index: int, count: int) -> str:
+    return f"{lock_name}@{index}/{count}"
+
+
+async def run_available_shards(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    lock_name: str,
+    owner_id: str,
+    shard_count: int,
+    ttl_seconds: int,
+    skip_if_completed: bool = True,
+) -> int:
+    """Claim and run every shard whose lease is free; return how many ran.
+
+    A shard whose daily run already finished still picks up recurring
+    charges and CDs that fell due since.  Each shard has its own
+    ``scheduler_locks`` row.  Replicas start at
+    different offsets so they tend to claim different shards first, and a
+    shard's lease is released as soon as its work finishes.
+    """
+
+    ran = 0
+    offset = sum(owner_id.encode()) % shard_count
+    for step in range(shard_count):
+        index = (offset + step) % shard_count
+        shard_lock = shard_lock_name(lock_name, index, shard_count)
+        token = await acquire_scheduler_lease(
+            session_factory,
+            lock_name=shard_lock,
+            owner_id=owner_id,
+            ttl_seconds=ttl_seconds,
+        )
+        if token is None:
+            continue
+        try:
+            async with LeaseHeartbeat(
+                session_factory,
+                lock_name=shard_lock,
+                owner_id=owner_id,
+                token=token,
+                ttl_seconds=ttl_seconds,
+            ) as fence:
+                shard = (index, shard_count)
+                if await run_daily_shard_once(
+                    session_factory,
+                    shard,
+                    skip_if_completed=skip_if_completed,
+                    fence=fence,
+                ) or await run_due_items_once(
+                    session_factory, shard=shard, fence=fence
+                ):
+                    ran += 1
+        finally:
+            await release_scheduler_lock(
+                session_factory, lock_name=shard_lock, owner_id=owner_id
+            )
+    return ran
+
+
+_active_schedulers: set["DailyScheduler"] = set()
+
+
+def notify_due_item(due_at: datetime) -> None:
+    """Wake in-process schedulers early for an item due at ``due_at``.
+
+    Routes call this after creating or rescheduling a recurring charge or
+    accepting a CD.  Schedulers only wake if ``due_at`` is earlier than the
+    wake-up they already planned.  Other replicas catch up through their
+    fallback poll.
+    """
+
+    for scheduler in list(_active_schedulers):
+        scheduler.wake_if_earlier(due_at)
 
 
 class DailyScheduler:
-    """Poll-based scheduler that executes daily jobs under a leader lock."""
+    """Scheduler that sleeps until the next due item under a leader lock.
+
+    Each cycle runs the daily pipeline once per UTC day and, between daily
+    runs, any recurring charges or CD maturities that have fallen due.  It then
+    sleeps until the earliest of the next midnight, the next due item, or
+    ``poll_seconds`` (a long fallback), unless :func:`notify_due_item` wakes
+    it sooner.
+    """
 
     def __init__(
         self,
@@ -106,63 +252,153 @@ class DailyScheduler:
         owner_id: str,
         poll_seconds: int,
         lock_ttl_seconds: int,
+        shard_count: int = 1,
     ) -> None:
         self._session_factory = session_factory
         self._lock_name = lock_name
         self._owner_id = owner_id
         self._poll_seconds = poll_seconds
         self._lock_ttl_seconds = lock_ttl_seconds
+        self._shard_count = shard_count
+        self._wake_event = asyncio.Event()
+        self._next_wake: datetime | None = None
+
+    def wake_if_earlier(self, due_at: datetime) -> None:
+        if self._next_wake is None or due_at < self._next_wake:
+            self._wake_event.set()
+
+    async def next_wake_at(self, now: datetime) -> datetime:
+        """Earliest of next UTC midnight, next due item, and the fallback poll."""
+
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        wake_at = min(midnight, now + timedelta(seconds=self._poll_seconds))
+        async with self._session_factory() as db:
+            due_at = await get_next_due_at(db)
+        # Items already overdue are left to the lease holder; waking for them
+        # here would spin while another replica works through them.
+        if due_at is not None and due_at > now:
+            wake_at = min(wake_at, due_at)
+        return max(wake_at, now + timedelta(seconds=MIN_SLEEP_SECONDS))
+
+    async def run_cycle(self) -> None:
+        if self._shard_count > 1:
+            ran = await run_available_shards(
+                self._session_factory,
+                lock_name=self._lock_name,
+                owner_id=self._owner_id,
+                shard_count=self._shard_count,
+                ttl_seconds=self._lock_ttl_seconds,
+            )
+            if ran:
+                logger.info("Completed work for %s daily shard(s)", ran)
+            return
+        token = await acquire_scheduler_lease(
+            self._session_factory,
+            lock_name=self._lock_name,
+            owner_id=self._owner_id,
+            ttl_seconds=self._lock_ttl_seconds,
+        )
+        if token is None:
+            return
+        async with LeaseHeartbeat(
+            self._session_factory,
+            lock_name=self._lock_name,
+            owner_id=self._owner_id,
+            token=token,
+            ttl_seconds=self._lock_ttl_seconds,
+        ) as fence:
+            if await run_daily_jobs_once(self._session_factory, fence=fence):
+                logger.info("Daily scheduler pipeline completed")
+            elif await run_due_items_once(self._session_factory, fence=fence):
+                logger.info("Processed items that fell due since the daily run")
 
     async def run_forever(self) -> None:
         logger.info(
-            "Scheduler started owner=%s lock=%s poll_seconds=%s ttl_seconds=%s",
+            "Scheduler started owner=%s lock=%s poll_seconds=%s ttl_seconds=%s shards=%s",
             self._owner_id,
             self._lock_name,
             self._poll_seconds,
             self._lock_ttl_seconds,
+            self._shard_count,
         )
-        while True:
-            try:
-                is_leader = await try_acquire_scheduler_lock(
-                    self._session_factory,
-                    lock_name=self._lock_name,
-                    owner_id=self._owner_id,
-                    ttl_seconds=self._lock_ttl_seconds,
-                )
-                if is_leader:
-                    ran = await run_daily_jobs_once(self._session_factory)
-                    if ran:
-                        logger.info("Daily scheduler pipeline completed")
-            except Exception:
-                logger.exception("Scheduler loop iteration failed")
-
-            await asyncio.sleep(self._poll_seconds)
+        _active_schedulers.add(self)
+        try:
+            while True:
+                try:
+                    await self.run_cycle()
+                except Exception:
+                    logger.exception("Scheduler loop iteration failed")
+
+                now = datetime.utcnow()
+                try:
+                    self._next_wake = await self.next_wake_at(now)
+                except Exception:
+                    logger.exception("Could not compute next scheduler wake-up")
+                    self._next_wake = now + timedelta(seconds=self._poll_seconds)
+                self._wake_event.clear()
+                delay = (self._next_wake - now).total_seconds()
+                try:
+                    await asyncio.wait_for(self._wake_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._next_wake = None
+        finally:
+            _active_schedulers.discard(self)
 
 
 async def run_scheduler_once(
     *,
     force: bool = False,
     skip_lock: bool = False,
+    shard_count: int | None = None,
 ) -> bool:
-    """Run one scheduler cycle, intended for external schedulers/cron."""
+    """Run one scheduler cycle, intended for external schedulers/cron.
+
+    With more than one shard, every shard whose lease is free is claimed
+    and run; several cron jobs can then split the work between them.
+    """
 
     await create_db_and_tables()
     owner_id = os.getenv("SCHEDULER_OWNER_ID", build_owner_id())
     lock_name = os.getenv("SCHEDULER_LOCK_NAME", DEFAULT_LOCK_NAME)
     lock_ttl_seconds = _int_env("SCHEDULER_LOCK_TTL_SECONDS", 600)
+    if shard_count is None:
+        shard_count = _int_env("SCHEDULER_SHARD_COUNT", 1)
 
-    if not skip_lock:
-        is_leader = await try_acquire_scheduler_lock(
+    if shard_count > 1:
+        ran = await run_available_shards(
             async_session,
             lock_name=lock_name,
             owner_id=owner_id,
+            shard_count=shard_count,
             ttl_seconds=lock_ttl_seconds,
+            skip_if_completed=not force,
         )
-        if not is_leader:
-            logger.info("Skipping run because lock '%s' is held by another scheduler", lock_name)
-            return False
+        return ran > 0
 
-    return await run_daily_jobs_once(async_session, skip_if_completed=not force)
+    if skip_lock:
+        return await run_daily_jobs_once(async_session, skip_if_completed=not force)
+
+    token = await acquire_scheduler_lease(
+        async_session,
+        lock_name=lock_name,
+        owner_id=owner_id,
+        ttl_seconds=lock_ttl_seconds,
+    )
+    if token is None:
+        logger.info("Skipping run because lock '%s' is held by another scheduler", lock_name)
+        return False
+
+    async with LeaseHeartbeat(
+        async_session,
+        lock_name=lock_name,
+        owner_id=owner_id,
+        token=token,
+        ttl_seconds=lock_ttl_seconds,
+    ) as fence:
+        return await run_daily_jobs_once(
+            async_session, skip_if_completed=not force, fence=fence
+        )
 
 
 def start_scheduler_task() -> asyncio.Task | None:
@@ -177,8 +413,9 @@ def start_scheduler_task() -> asyncio.Task | None:
         async_session,
         lock_name=os.getenv("SCHEDULER_LOCK_NAME", DEFAULT_LOCK_NAME),
         owner_id=os.getenv("SCHEDULER_OWNER_ID", build_owner_id()),
-        poll_seconds=_int_env("SCHEDULER_POLL_SECONDS", 60),
+        poll_seconds=_int_env("SCHEDULER_POLL_SECONDS", DEFAULT_POLL_SECONDS),
         lock_ttl_seconds=_int_env("SCHEDULER_LOCK_TTL_SECONDS", 600),
+        shard_count=_int_env("SCHEDULER_SHARD_COUNT", 1),
     )
     return asyncio.create_task(scheduler.run_forever())
 
@@ -195,9 +432,17 @@ async def _run_cli() -> None:
         action="store_true",
         help="Do not acquire scheduler lock before running",
     )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Number of shards (defaults to SCHEDULER_SHARD_COUNT or 1)",
+    )
     args = parser.parse_args()
 
-    ran = await run_scheduler_once(force=args.force, skip_lock=args.skip_lock)
+    ran = await run_scheduler_once(
+        force=args.force, skip_lock=args.skip_lock, shard_count=args.shards
+    )
     if ran:
         logger.info("Scheduler run completed")
     else:
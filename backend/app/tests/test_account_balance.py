@@ -0,0 +1,157 @@
+"""Tests for the materialized ``Account.balance`` running balance."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, update
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.auth import get_password_hash
+from app.crud import (
+    apply_overdraft_fee,
+    calculate_balance,
+    calculate_ledger_balance,
+    create_child_for_user,
+    create_recurring_charge,
+    create_transaction,
+    delete_transaction,
+    get_account_by_child,
+    get_transaction,
+    process_due_recurring_charges,
+    rebuild_account_balances,
+    recalc_interest,
+    save_transaction,
+)
+from app.models import Account, Child, RecurringCharge, Settings, Transaction, User
+
+
+async def _setup():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _stored_balance(session, child_id: int) -> Decimal:
+    account = await get_account_by_child(session, child_id)
+    await session.refresh(account)
+    return Decimal(account.balance).quantize(Decimal("0.01"))
+
+
+def test_balance_tracks_every_ledger_write():
+    async def run():
+        Session = await _setup()
+        async with Session() as session:
+            parent = User(
+                name="Parent",
+                email="balance@example.com",
+                password_hash=get_password_hash("pass"),
+                role="parent",
+            )
+            session.add(parent)
+            await session.commit()
+            await session.refresh(parent)
+            child = await create_child_for_user(
+                session, Child(first_name="Kid", access_code="BAL"), parent.id
+            )
+            account = await get_account_by_child(session, child.id)
+            account.interest_rate = Decimal("0.010000")
+            session.add(account)
+            await session.commit()
+
+            start = date.today() - timedelta(days=3)
+            deposit = await create_transaction(
+                session,
+                Transaction(
+                    child_id=child.id,
+                    type="credit",
+                    amount=Decimal("100.00"),
+                    initiated_by="parent",
+                    initiator_id=parent.id,
+                    timestamp=datetime.combine(start, time.min),
+                ),
+            )
+            spend = await create_transaction(
+                session,
+                Transaction(
+                    child_id=child.id,
+                    type="debit",
+                    amount=Decimal("20.00"),
+                    initiated_by="parent",
+                    initiator_id=parent.id,
+                    timestamp=datetime.combine(start, time.min),
+                ),
+            )
+            assert await _stored_balance(session, child.id) == Decimal("80.00")
+
+            spend = await get_transaction(session, spend.id)
+            spend.type = "credit"
+            spend.amount = Decimal("25.00")
+            await save_transaction(session, spend)
+            assert await _stored_balance(session, child.id) == Decimal("125.00")
+
+            await delete_transaction(session, deposit)
+            assert await _stored_balance(session, child.id) == Decimal("25.00")
+
+            await recalc_interest(session, child.id)
+            await create_recurring_charge(
+                session,
+                RecurringCharge(
+                    child_id=child.id,
+                    amount=Decimal("40.00"),
+                    type="debit",
+                    memo="Phone",
+                    interval_days=7,
+                    next_run=date.today(),
+                ),
+            )
+            await process_due_recurring_charges(session)
+            settings = Settings(overdraft_fee_amount=Decimal("1.50"))
+            account = await get_account_by_child(session, child.id)
+            await apply_overdraft_fee(session, account, settings, date.today())
+
+            ledger = await calculate_ledger_balance(session, child.id)
+            assert ledger < Decimal("0.00")
+            assert await _stored_balance(session, child.id) == ledger
+            assert await calculate_balance(session, child.id) == ledger
+
+    asyncio.run(run())
+
+
+def test_rebuild_recomputes_balance_from_ledger():
+    async def run():
+        Session = await _setup()
+        async with Session() as session:
+            child = Child(first_name="Kid", access_code="REB")
+            session.add(child)
+            await session.commit()
+            await session.refresh(child)
+            session.add(Account(child_id=child.id))
+            await session.commit()
+            await create_transaction(
+                session,
+                Transaction(
+                    child_id=child.id,
+                    type="credit",
+                    amount=Decimal("12.34"),
+                    initiated_by="parent",
+                    initiator_id=1,
+                ),
+            )
+            await session.execute(
+                update(Account)
+                .where(Account.child_id == child.id)
+                .values(balance=Decimal("0.00"))
+            )
+            await session.commit()
+
+            updated = await rebuild_account_balances(session)
+            assert updated == 1
+            assert await _stored_balance(session, child.id) == Decimal("12.34")
+
+    asyncio.run(run())
@@ -3,6 +3,7 @@
 import asyncio
 import pathlib
 import sys
+from datetime import datetime, timedelta
 
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
@@ -13,7 +14,7 @@ sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
 from app.main import app
 from app.database import get_session
-from app.models import Permission, UserPermissionLink, User
+from app.models import JobRun, Permission, UserPermissionLink, User
 from app.crud import ensure_permissions_exist
 from app.acl import ALL_PERMISSIONS, ROLE_DEFAULT_PERMISSIONS
 
@@ -252,3 +253,65 @@ def test_admin_child_transaction_crud_and_promotion():
             assert resp.status_code == 404
 
     asyncio.run(run())
+
+
+def test_admin_job_run_history():
+    async def run():
+        TestSession = await _setup_test_db()
+        started = datetime(2024, 5, 1, 0, 0, 0)
+        async with TestSession() as session:
+            for day in range(3):
+                session.add(
+                    JobRun(
+                        job_name="daily.recurring_charges",
+                        status="success",
+                        started_at=started + timedelta(days=day),
+                        finished_at=started + timedelta(days=day, seconds=4),
+                        rows_read=10 + day,
+                        rows_written=20,
+                        commits=10,
+                        max_item_ms=12.5,
+                        max_lag_seconds=60.0,
+                    )
+                )
+            session.add(
+                JobRun(
+                    job_name="daily.loan_interest",
+                    started_at=started - timedelta(hours=1),
+                )
+            )
+            await session.commit()
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post(
+                "/register",
+                json={"name": "Admin", "email": "ops@example.com", "password": "pass"},
+            )
+            admin_id = resp.json()["id"]
+            async with TestSession() as session:
+                admin = await session.get(User, admin_id)
+                admin.role = "admin"
+                admin.status = "active"
+                await session.commit()
+            resp = await client.post(
+                "/login", json={"email": "ops@example.com", "password": "pass"}
+            )
+            headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+            resp = await client.get(
+                "/admin/job-runs",
+                headers=headers,
+                params={"job_name": "daily.recurring_charges", "limit": 2},
+            )
+            assert resp.status_code == 200
+            runs = resp.json()
+            assert [r["rows_read"] for r in runs] == [12, 11]
+            assert runs[0]["duration_seconds"] == 4.0
+            assert runs[0]["max_lag_seconds"] == 60.0
+
+            resp = await client.get("/admin/job-runs", headers=headers)
+            assert len(resp.json()) == 4
+            assert resp.json()[-1]["duration_seconds"] is None
+
+    asyncio.run(run())
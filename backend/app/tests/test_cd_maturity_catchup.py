@@ -2,6 +2,7 @@ import asyncio
 import pathlib
 import sys
 from datetime import datetime, timedelta
+from decimal import Decimal
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlmodel import SQLModel, select
@@ -15,6 +16,7 @@ from app.models import (
     Transaction,
     CertificateDeposit,
 )
+import app.crud as crud
 from app.auth import get_password_hash
 from app.crud import create_transaction, redeem_matured_cds
 
@@ -120,3 +122,95 @@ def test_cd_redemption_after_downtime():
             assert round(balance, 2) == 110.0
 
     asyncio.run(run())
+
+
+def test_bulk_maturity_recalculates_each_child_once(monkeypatch):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        TestSession = async_sessionmaker(engine, expire_on_commit=False)
+        now = datetime.utcnow().replace(microsecond=0)
+
+        async with TestSession() as session:
+            children = [
+                Child(first_name=f"Kid {i}", access_code=f"K{i}") for i in (1, 2)
+            ]
+            session.add_all(children)
+            await session.flush()
+            for child in children:
+                session.add(
+                    Account(child_id=child.id, interest_rate=0, penalty_interest_rate=0)
+                )
+            maturities = [
+                (children[0], 1),
+                (children[0], 2),
+                (children[0], 3),
+                (children[1], 1),
+            ]
+            cds = []
+            for child, days_ago in maturities:
+                cd = CertificateDeposit(
+                    child_id=child.id,
+                    parent_id=1,
+                    amount=Decimal("10.00"),
+                    interest_rate=Decimal("0.1"),
+                    term_days=5,
+                    status="accepted",
+                    matures_at=now - timedelta(days=days_ago),
+                )
+                session.add(cd)
+                cds.append(cd)
+            session.add(
+                CertificateDeposit(
+                    child_id=children[1].id,
+                    parent_id=1,
+                    amount=Decimal("10.00"),
+                    interest_rate=Decimal("0.1"),
+                    term_days=5,
+                    status="accepted",
+                    matures_at=now + timedelta(days=1),
+                )
+            )
+            await session.flush()
+            # A payout recorded before a crash must not be paid again.
+            session.add(
+                Transaction(
+                    child_id=children[0].id,
+                    type="credit",
+                    amount=Decimal("11.00"),
+                    memo=f"CD #{cds[0].id} maturity",
+                    initiated_by="system",
+                    initiator_id=0,
+                    idempotency_key=crud.cd_transaction_key(cds[0].id, "maturity"),
+                )
+            )
+            await session.commit()
+            await crud.rebuild_account_balances(session)
+
+            recalculated = []
+            original = crud.recalc_interest
+
+            async def counting_recalc(db, child_id, frequency=None):
+                recalculated.append(child_id)
+                await original(db, child_id, frequency)
+
+            monkeypatch.setattr(crud, "recalc_interest", counting_recalc)
+            assert await redeem_matured_cds(session, batch_size=2) == 4
+            assert sorted(recalculated) == [children[0].id, children[1].id]
+
+            result = await session.execute(
+                select(Transaction.source_id).where(Transaction.source_type == "cd")
+            )
+            assert sorted(result.scalars().all()) == sorted(cd.id for cd in cds[1:])
+            first = await crud.get_account_by_child(session, children[0].id)
+            second = await crud.get_account_by_child(session, children[1].id)
+            assert first.balance == Decimal("33.00")
+            assert second.balance == Decimal("11.00")
+
+            result = await session.execute(
+                select(CertificateDeposit.status).order_by(CertificateDeposit.id)
+            )
+            assert result.scalars().all() == ["redeemed"] * 4 + ["accepted"]
+
+    asyncio.run(run())
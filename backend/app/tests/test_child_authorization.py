@@ -0,0 +1,143 @@
+"""Tests for the shared per-child authorization dependency."""
+
+import asyncio
+import pathlib
+import sys
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+# Allow importing the app package
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.main import app
+from app.database import get_session
+from app.models import Child, User
+from app.acl import ALL_PERMISSIONS, PERM_DEPOSIT, PERM_VIEW_TRANSACTIONS
+from app.auth import (
+    authorize_child_access,
+    create_access_token,
+    resolve_identity,
+)
+from app.crud import (
+    create_child_for_user,
+    create_user,
+    ensure_permissions_exist,
+    link_child_to_user,
+    remove_child_link,
+)
+
+
+async def _setup_test_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    TestSession = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with TestSession() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    return engine, TestSession
+
+
+async def _parent(session, email: str) -> User:
+    return await create_user(
+        session,
+        User(name=email, email=email, password_hash="pass", role="parent"),
+    )
+
+
+def _headers(subject: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token({'sub': subject})}"}
+
+
+def test_ledger_access_resolves_link_with_one_query():
+    async def run():
+        engine, TestSession = await _setup_test_db()
+        async with TestSession() as session:
+            await ensure_permissions_exist(session, ALL_PERMISSIONS)
+            owner = await _parent(session, "owner@example.com")
+            viewer = await _parent(session, "viewer@example.com")
+            stranger = await _parent(session, "stranger@example.com")
+            child = await create_child_for_user(
+                session, Child(first_name="Kid", access_code="AUTHZ"), owner.id
+            )
+            await link_child_to_user(session, child.id, viewer.id, [])
+            owner_id, viewer_id, stranger_id = owner.id, viewer.id, stranger.id
+            child_id = child.id
+
+        statements: list[str] = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            url = f"/transactions/child/{child_id}"
+            resp = await client.get(url, headers=_headers(f"user:{owner_id}"))
+            assert resp.status_code == 200
+
+            statements.clear()
+            resp = await client.get(url, headers=_headers(f"user:{owner_id}"))
+            assert resp.status_code == 200
+            link_queries = [s for s in statements if "FROM childuserlink" in s]
+            assert len(link_queries) == 1
+
+            resp = await client.get(url, headers=_headers(f"user:{viewer_id}"))
+            assert resp.status_code == 403
+            resp = await client.get(url, headers=_headers(f"user:{stranger_id}"))
+            assert resp.status_code == 404
+
+            resp = await client.get(url, headers=_headers(f"child:{child_id}"))
+            assert resp.status_code == 200
+            resp = await client.get(
+                f"/transactions/child/{child_id + 1}",
+                headers=_headers(f"child:{child_id}"),
+            )
+            assert resp.status_code == 403
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_link_changes_clear_the_session_memo():
+    async def run():
+        engine, TestSession = await _setup_test_db()
+        async with TestSession() as session:
+            await ensure_permissions_exist(session, ALL_PERMISSIONS)
+            owner = await _parent(session, "memo-owner@example.com")
+            helper = await _parent(session, "memo-helper@example.com")
+            child = await create_child_for_user(
+                session, Child(first_name="Kid", access_code="MEMO"), owner.id
+            )
+            identity = await resolve_identity(session, "user", helper.id)
+
+            with pytest.raises(HTTPException) as exc:
+                await authorize_child_access(session, identity, child.id)
+            assert exc.value.status_code == 404
+
+            await link_child_to_user(session, child.id, helper.id, [PERM_DEPOSIT])
+            access = await authorize_child_access(
+                session, identity, child.id, PERM_DEPOSIT
+            )
+            assert access.can(PERM_DEPOSIT)
+            assert not access.can(PERM_VIEW_TRANSACTIONS)
+
+            await remove_child_link(session, child.id, helper.id)
+            with pytest.raises(HTTPException) as exc:
+                await authorize_child_access(session, identity, child.id)
+            assert exc.value.status_code == 404
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
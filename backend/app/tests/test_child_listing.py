@@ -0,0 +1,161 @@
+"""Tests for listing children with their accounts in constant queries."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel, select
+
+# Allow importing the app package
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.main import app
+from app.database import get_session
+from app.models import Account, Child, Transaction, User
+from app.acl import ALL_PERMISSIONS
+from app.auth import create_access_token
+from app.crud import (
+    create_child_for_user,
+    create_user,
+    create_transaction,
+    ensure_permissions_exist,
+    get_accrued_interest,
+    get_accrued_interest_by_child,
+)
+
+
+async def _setup_test_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    TestSession = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with TestSession() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    return engine, TestSession
+
+
+async def _add_children(session, parent_id: int, names: list[str]) -> list[int]:
+    ids = []
+    for name in names:
+        child = await create_child_for_user(
+            session, Child(first_name=name, access_code=f"CODE{name}"), parent_id
+        )
+        await create_transaction(
+            session,
+            Transaction(
+                child_id=child.id,
+                type="credit",
+                amount=Decimal("100.00") + len(ids),
+                memo="Gift",
+                initiated_by="parent",
+                initiator_id=parent_id,
+                timestamp=datetime.utcnow() - timedelta(days=10),
+            ),
+        )
+        ids.append(child.id)
+    return ids
+
+
+def test_listing_children_uses_constant_queries():
+    async def run():
+        engine, TestSession = await _setup_test_db()
+        async with TestSession() as session:
+            await ensure_permissions_exist(session, ALL_PERMISSIONS)
+            parent = await create_user(
+                session,
+                User(name="P", email="list@example.com", password_hash="x", role="parent"),
+            )
+            admin = await create_user(
+                session,
+                User(name="A", email="admin-list@example.com", password_hash="x", role="admin"),
+            )
+            await _add_children(session, parent.id, ["Cara", "Abe"])
+            parent_id, admin_id = parent.id, admin.id
+
+        statements: list[str] = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        headers = {
+            "Authorization": f"Bearer {create_access_token({'sub': f'user:{parent_id}'})}"
+        }
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/children/", headers=headers)
+            statements.clear()
+            resp = await client.get("/children/", headers=headers)
+            assert resp.status_code == 200
+            assert len(resp.json()) == 2
+            assert all(c["accrued_interest"] is not None for c in resp.json())
+            two_children = len(statements)
+
+            async with TestSession() as session:
+                await _add_children(session, parent_id, ["Bo", "Dee", "Eve"])
+            statements.clear()
+            resp = await client.get("/children/", headers=headers)
+            assert resp.status_code == 200
+            assert len(resp.json()) == 5
+            assert len(statements) == two_children
+
+            admin_headers = {
+                "Authorization": f"Bearer {create_access_token({'sub': f'user:{admin_id}'})}"
+            }
+            resp = await client.get("/admin/children", headers=admin_headers)
+            assert resp.status_code == 200
+            assert len(resp.json()) == 5
+            resp = await client.get(
+                "/admin/children",
+                params={"sort": "first_name", "limit": 2, "offset": 1},
+                headers=admin_headers,
+            )
+            assert resp.status_code == 200
+            assert [c["first_name"] for c in resp.json()] == ["Bo", "Cara"]
+            resp = await client.get(
+                "/admin/children",
+                params={"sort": "balance", "order": "desc", "limit": 1},
+                headers=admin_headers,
+            )
+            assert [c["first_name"] for c in resp.json()] == ["Eve"]
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_batched_accrued_interest_matches_single_projection():
+    async def run():
+        engine, TestSession = await _setup_test_db()
+        async with TestSession() as session:
+            await ensure_permissions_exist(session, ALL_PERMISSIONS)
+            parent = await create_user(
+                session,
+                User(name="P", email="accrue@example.com", password_hash="x", role="parent"),
+            )
+            await _add_children(session, parent.id, ["Ann", "Ben"])
+            accounts = (await session.execute(select(Account))).scalars().all()
+            for account in accounts:
+                account.interest_rate = Decimal("0.05")
+            await session.commit()
+
+            batched = await get_accrued_interest_by_child(session, accounts)
+            for account in accounts:
+                single = await get_accrued_interest(session, account)
+                assert single > 0
+                assert batched[account.child_id] == single
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -6,15 +6,15 @@ import sys
 
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlmodel import SQLModel, select
+from sqlmodel import SQLModel
 
 # Allow importing the app package
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
 from app.main import app
 from app.database import get_session
-from app.models import Permission, UserPermissionLink, User
-from app.crud import ensure_permissions_exist
+from app.models import User
+from app.crud import ensure_permissions_exist, remove_permissions_by_names
 from app.acl import (
     ROLE_DEFAULT_PERMISSIONS,
     ALL_PERMISSIONS,
@@ -196,21 +196,10 @@ def test_child_management_endpoints():
 
             # Revoking manage-child-settings permission prevents updates
             async with TestSession() as session:
-                result = await session.execute(
-                    select(Permission).where(
-                        Permission.name == PERM_MANAGE_CHILD_SETTINGS
-                    )
+                parent = await session.get(User, p1_id)
+                await remove_permissions_by_names(
+                    session, parent, [PERM_MANAGE_CHILD_SETTINGS]
                 )
-                perm = result.scalar_one()
-                result = await session.execute(
-                    select(UserPermissionLink).where(
-                        (UserPermissionLink.user_id == p1_id)
-                        & (UserPermissionLink.permission_id == perm.id)
-                    )
-                )
-                link = result.scalar_one()
-                await session.delete(link)
-                await session.commit()
 
             resp = await client.put(
                 f"/children/{child_id}/interest-rate",
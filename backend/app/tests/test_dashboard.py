@@ -0,0 +1,168 @@
+"""Tests for the parent dashboard aggregate endpoint."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+# Allow importing the app package
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.main import app
+from app.database import get_session
+from app.models import (
+    CertificateDeposit,
+    Child,
+    Chore,
+    Loan,
+    Transaction,
+    User,
+    WithdrawalRequest,
+)
+from app.acl import ALL_PERMISSIONS, PERM_DEPOSIT
+from app.auth import create_access_token
+from app.crud import (
+    create_child_for_user,
+    create_transaction,
+    create_user,
+    ensure_permissions_exist,
+    link_child_to_user,
+)
+
+
+async def _setup_test_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    TestSession = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with TestSession() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    return engine, TestSession
+
+
+async def _child_with_deposit(session, parent_id: int, name: str) -> int:
+    child = await create_child_for_user(
+        session, Child(first_name=name, access_code=f"DASH{name}"), parent_id
+    )
+    await create_transaction(
+        session,
+        Transaction(
+            child_id=child.id,
+            type="credit",
+            amount=Decimal("50.00"),
+            memo="Allowance",
+            initiated_by="parent",
+            initiator_id=parent_id,
+        ),
+    )
+    return child.id
+
+
+def test_dashboard_summarizes_children_with_grouped_queries():
+    async def run():
+        engine, TestSession = await _setup_test_db()
+        async with TestSession() as session:
+            await ensure_permissions_exist(session, ALL_PERMISSIONS)
+            parent = await create_user(
+                session,
+                User(name="P", email="dash@example.com", password_hash="x", role="parent"),
+            )
+            helper = await create_user(
+                session,
+                User(name="H", email="helper@example.com", password_hash="x", role="parent"),
+            )
+            busy_id = await _child_with_deposit(session, parent.id, "Busy")
+            quiet_id = await _child_with_deposit(session, parent.id, "Quiet")
+            # A link without view_transactions keeps the child off the dashboard.
+            await link_child_to_user(session, busy_id, helper.id, [PERM_DEPOSIT])
+            matures = datetime.utcnow() + timedelta(days=30)
+            session.add_all(
+                [
+                    WithdrawalRequest(child_id=busy_id, amount=Decimal("5.00")),
+                    WithdrawalRequest(child_id=busy_id, amount=Decimal("6.00")),
+                    Chore(
+                        child_id=busy_id,
+                        description="Dishes",
+                        amount=Decimal("1.00"),
+                        status="awaiting_approval",
+                    ),
+                    Chore(child_id=busy_id, description="Bed", amount=Decimal("1.00")),
+                    Loan(
+                        child_id=busy_id,
+                        amount=Decimal("20.00"),
+                        status="active",
+                        principal_remaining=Decimal("12.50"),
+                    ),
+                    CertificateDeposit(
+                        child_id=busy_id,
+                        parent_id=parent.id,
+                        amount=Decimal("10.00"),
+                        interest_rate=Decimal("0.05"),
+                        term_days=30,
+                        status="accepted",
+                        matures_at=matures,
+                    ),
+                ]
+            )
+            await session.commit()
+            parent_id, helper_id = parent.id, helper.id
+
+        statements: list[str] = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        headers = {
+            "Authorization": f"Bearer {create_access_token({'sub': f'user:{parent_id}'})}"
+        }
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/dashboard", headers=headers)
+            statements.clear()
+            resp = await client.get("/dashboard", headers=headers)
+            assert resp.status_code == 200
+            children = {c["id"]: c for c in resp.json()["children"]}
+            two_children = len(statements)
+
+            busy = children[busy_id]
+            assert busy["balance"] == 50.0
+            assert busy["last_activity"] is not None
+            assert busy["pending_withdrawals"] == 2
+            assert busy["chores_awaiting_approval"] == 1
+            assert busy["active_loans"] == 1
+            assert busy["active_loan_principal"] == 12.5
+            assert [cd["amount"] for cd in busy["upcoming_cds"]] == [10.0]
+            quiet = children[quiet_id]
+            assert quiet["pending_withdrawals"] == 0
+            assert quiet["upcoming_cds"] == []
+
+            async with TestSession() as session:
+                for name in ("Third", "Fourth"):
+                    await _child_with_deposit(session, parent_id, name)
+            statements.clear()
+            resp = await client.get("/dashboard", headers=headers)
+            assert len(resp.json()["children"]) == 4
+            assert len(statements) == two_children
+
+            helper_headers = {
+                "Authorization": f"Bearer {create_access_token({'sub': f'user:{helper_id}'})}"
+            }
+            resp = await client.get("/dashboard", headers=helper_headers)
+            assert resp.status_code == 200
+            assert resp.json()["children"] == []
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
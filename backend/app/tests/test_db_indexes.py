@@ -0,0 +1,62 @@
+"""Tests for the secondary indexes backing hot query paths."""
+
+import asyncio
+import pathlib
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+import app.database as database
+import app.models  # noqa: F401  (register tables on the metadata)
+
+
+EXPECTED_INDEXES = {
+    "transaction": "ix_transaction_child_id_timestamp",
+    "account": "ix_account_child_id",
+    "withdrawalrequest": "ix_withdrawalrequest_child_id_status",
+    "recurringcharge": "ix_recurringcharge_active_next_run",
+    "certificatedeposit": "ix_certificatedeposit_status_matures_at",
+    "loan": "ix_loan_status",
+    "loantransaction": "ix_loantransaction_loan_id_timestamp",
+    "chore": "ix_chore_child_id_status",
+    "message": "ix_message_recipient_user_inbox",
+    "childuserlink": "ix_childuserlink_child_id",
+}
+
+
+def test_startup_migration_adds_missing_indexes(tmp_path, monkeypatch):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+            # Simulate an install created before the indexes existed.
+            for index_name in EXPECTED_INDEXES.values():
+                await conn.execute(text(f'DROP INDEX "{index_name}"'))
+
+        monkeypatch.setattr(database, "engine", engine)
+        await database.create_db_and_tables()
+
+        async with engine.connect() as conn:
+            for table, index_name in EXPECTED_INDEXES.items():
+                result = await conn.execute(text(f"PRAGMA index_list('{table}')"))
+                names = {row[1] for row in result.fetchall()}
+                assert index_name in names, (table, names)
+
+            plan = await conn.execute(
+                text(
+                    'EXPLAIN QUERY PLAN SELECT * FROM "transaction" '
+                    "WHERE child_id = 1 ORDER BY timestamp"
+                )
+            )
+            details = " ".join(str(row[-1]) for row in plan.fetchall())
+            assert "ix_transaction_child_id_timestamp" in details
+
+        # Running the migration again is a no-op.
+        await database.create_db_and_tables()
+        await engine.dispose()
+
+    asyncio.run(run())
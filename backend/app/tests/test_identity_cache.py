@@ -0,0 +1,116 @@
+"""Tests for the cached identity behind the auth dependencies."""
+
+import asyncio
+import pathlib
+import sys
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+# Allow importing the app package
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.main import app
+from app.database import get_session
+from app.models import Child, User
+from app.acl import ALL_PERMISSIONS, PERM_VIEW_TRANSACTIONS
+from app.auth import create_access_token, resolve_identity
+from app.crud import (
+    create_child_for_user,
+    create_user,
+    ensure_permissions_exist,
+    remove_permissions_by_names,
+    set_child_frozen,
+)
+
+
+async def _setup_test_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    TestSession = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with TestSession() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    return engine, TestSession
+
+
+def test_ledger_requests_reuse_cached_identity():
+    async def run():
+        engine, TestSession = await _setup_test_db()
+        async with TestSession() as session:
+            await ensure_permissions_exist(session, ALL_PERMISSIONS)
+            parent = await create_user(
+                session,
+                User(
+                    name="Parent",
+                    email="cache@example.com",
+                    password_hash="pass",
+                    role="parent",
+                ),
+            )
+            child = await create_child_for_user(
+                session, Child(first_name="Kid", access_code="CACHE"), parent.id
+            )
+            parent_id, child_id = parent.id, child.id
+        headers = {
+            "Authorization": f"Bearer {create_access_token({'sub': f'user:{parent_id}'})}"
+        }
+
+        statements: list[str] = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            loaded_user = []
+            for _ in range(2):
+                statements.clear()
+                resp = await client.get(
+                    f"/transactions/child/{child_id}", headers=headers
+                )
+                assert resp.status_code == 200
+                loaded_user.append(any("FROM user" in s for s in statements))
+            # The user row and its permissions are only loaded once.
+            assert loaded_user == [True, False]
+
+            async with TestSession() as session:
+                parent = await session.get(User, parent_id)
+                await remove_permissions_by_names(
+                    session, parent, [PERM_VIEW_TRANSACTIONS]
+                )
+            resp = await client.get(f"/transactions/child/{child_id}", headers=headers)
+            assert resp.status_code == 403
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_freezing_a_child_refreshes_its_identity():
+    async def run():
+        engine, TestSession = await _setup_test_db()
+        async with TestSession() as session:
+            child = Child(first_name="Kid", access_code="FROZEN")
+            session.add(child)
+            await session.commit()
+            await session.refresh(child)
+
+            identity = await resolve_identity(session, "child", child.id)
+            assert identity.account_frozen is False
+            await set_child_frozen(session, child.id, True)
+            identity = await resolve_identity(session, "child", child.id)
+            assert identity.account_frozen is True
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,147 @@
+"""Equivalence test for the set-based daily interest and fee pass."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+import app.crud as crud
+from app.models import Account, Child, Settings, Transaction
+
+FEE_DAY = date.today().replace(day=1)
+
+# (opening amount, days before FEE_DAY, already overdraft-charged)
+SCENARIOS = [
+    (Decimal("100.00"), 12, False),
+    (Decimal("-40.00"), 5, False),
+    (Decimal("-3.00"), 3, True),
+    (Decimal("0.00"), 0, False),
+    (None, 0, False),
+]
+
+
+class _FixedDate(date):
+    @classmethod
+    def today(cls):
+        return FEE_DAY
+
+
+def _settings() -> Settings:
+    return Settings(
+        service_fee_amount=Decimal("0.01"),
+        service_fee_is_percentage=True,
+        overdraft_fee_amount=Decimal("1.50"),
+        overdraft_fee_daily=False,
+        interest_posting_frequency="weekly",
+    )
+
+
+async def _populate(Session) -> None:
+    async with Session() as session:
+        for index, (amount, days, charged) in enumerate(SCENARIOS):
+            child = Child(first_name=f"Kid {index}", access_code=f"BATCH{index}")
+            session.add(child)
+            await session.commit()
+            await session.refresh(child)
+            session.add(Account(child_id=child.id, overdraft_fee_charged=charged))
+            await session.commit()
+            if amount is None:
+                continue
+            await crud.create_transaction(
+                session,
+                Transaction(
+                    child_id=child.id,
+                    type="credit" if amount >= 0 else "debit",
+                    amount=abs(amount),
+                    initiated_by="parent",
+                    initiator_id=1,
+                    timestamp=datetime.combine(
+                        FEE_DAY - timedelta(days=days), time.min
+                    ),
+                ),
+            )
+
+
+async def _snapshot(Session):
+    async with Session() as session:
+        accounts = await session.execute(select(Account).order_by(Account.child_id))
+        txs = await session.execute(
+            select(Transaction)
+            .where(Transaction.initiated_by == "system")
+            .order_by(Transaction.child_id, Transaction.memo, Transaction.timestamp)
+        )
+        return (
+            [
+                (
+                    a.child_id,
+                    a.balance,
+                    a.accrued_interest,
+                    a.total_interest_earned,
+                    a.last_interest_applied,
+                    a.service_fee_last_charged,
+                    a.overdraft_fee_last_charged,
+                    a.overdraft_fee_charged,
+                )
+                for a in accounts.scalars().all()
+            ],
+            [
+                (
+                    t.child_id,
+                    t.type,
+                    t.amount,
+                    t.memo,
+                    t.timestamp if t.memo != "Overdraft Fee" else None,
+                )
+                for t in txs.scalars().all()
+            ],
+        )
+
+
+async def _fresh_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    await _populate(Session)
+    return engine, Session
+
+
+def test_batch_matches_per_account_reference(monkeypatch):
+    async def run():
+        settings = _settings()
+
+        ref_engine, RefSession = await _fresh_db()
+        monkeypatch.setattr(crud, "date", _FixedDate)
+        async with RefSession() as session:
+            for account in await crud.get_all_accounts(session):
+                await crud.recalc_interest(
+                    session, account.child_id, settings.interest_posting_frequency
+                )
+            for account in await crud.get_all_accounts(session):
+                await crud.apply_service_fee(session, account, settings, FEE_DAY)
+                await crud.apply_overdraft_fee(session, account, settings, FEE_DAY)
+        monkeypatch.undo()
+        expected = await _snapshot(RefSession)
+
+        batch_engine, BatchSession = await _fresh_db()
+        async with BatchSession() as session:
+            processed = await crud.apply_interest_and_fees_batch(
+                session, settings, FEE_DAY, batch_size=2
+            )
+        assert processed == len(SCENARIOS)
+        actual = await _snapshot(BatchSession)
+
+        assert actual == expected
+        assert any(memo == "Service Fee" for *_, memo, _ in actual[1])
+        assert any(memo == "Overdraft Fee" for *_, memo, _ in actual[1])
+
+        await ref_engine.dispose()
+        await batch_engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,102 @@
+"""Tests for periodic interest posting with daily accrual."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.crud import (
+    calculate_balance,
+    consolidate_interest,
+    create_transaction,
+    get_account_by_child,
+    get_accrued_interest,
+    recalc_interest,
+)
+from app.models import Account, Child, Transaction
+
+
+async def _child_with_deposit(session, code: str, start: date) -> int:
+    child = Child(first_name="Kid", access_code=code)
+    session.add(child)
+    await session.commit()
+    await session.refresh(child)
+    session.add(Account(child_id=child.id, interest_rate=Decimal("0.010000")))
+    await session.commit()
+    await create_transaction(
+        session,
+        Transaction(
+            child_id=child.id,
+            type="credit",
+            amount=Decimal("100.00"),
+            initiated_by="parent",
+            initiator_id=1,
+            timestamp=datetime.combine(start, time.min),
+        ),
+    )
+    return child.id
+
+
+def test_monthly_posting_matches_daily_total():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        start = date.today() - timedelta(days=45)
+        async with Session() as session:
+            daily_id = await _child_with_deposit(session, "DAILY", start)
+            monthly_id = await _child_with_deposit(session, "MONTHLY", start)
+
+            monthly_account = await get_account_by_child(session, monthly_id)
+            projected = await get_accrued_interest(session, monthly_account)
+
+            await recalc_interest(session, daily_id, "daily")
+            await recalc_interest(session, monthly_id, "monthly")
+
+            daily_account = await get_account_by_child(session, daily_id)
+            assert daily_account.accrued_interest == Decimal("0.00")
+            daily_total = await calculate_balance(session, daily_id)
+
+            result = await session.execute(
+                select(Transaction).where(
+                    Transaction.child_id == monthly_id,
+                    Transaction.memo == "Interest",
+                )
+            )
+            postings = result.scalars().all()
+            assert 1 <= len(postings) <= 2
+            assert all(tx.timestamp.day == 1 for tx in postings)
+
+            accrued = monthly_account.accrued_interest
+            monthly_balance = await calculate_balance(session, monthly_id)
+            assert monthly_balance + accrued == daily_total
+            assert projected == daily_total - Decimal("100.00")
+            assert await get_accrued_interest(session, monthly_account) == accrued
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_consolidate_interest_carries_open_period():
+    today = date(2024, 3, 15)
+    daily = [(date(2024, 2, 28), 5), (date(2024, 2, 29), 6), (date(2024, 3, 1), 7)]
+    posted, accrued = consolidate_interest(
+        daily, 10, date(2024, 2, 27), "monthly", today
+    )
+    assert posted == [(date(2024, 3, 1), 21)]
+    assert accrued == 7
+
+    posted, accrued = consolidate_interest(
+        daily, 0, date(2024, 2, 27), "weekly", today
+    )
+    assert posted == [(date(2024, 3, 4), 18)]
+    assert accrued == 0
@@ -0,0 +1,65 @@
+"""Equivalence tests for the segment-based interest schedule."""
+
+import pathlib
+import random
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.crud import interest_schedule
+from app.money import from_cents, percentage_of, quantize_money
+
+
+def _reference_schedule(opening, deltas, start, end, rate, penalty_rate):
+    """The original day-by-day Decimal walk of ``recalc_interest``."""
+
+    postings = []
+    balance = quantize_money(opening)
+    day = start
+    while day < end:
+        balance = quantize_money(balance + deltas.get(day, Decimal("0")))
+        interest = percentage_of(balance, rate if balance >= 0 else penalty_rate)
+        if interest != 0:
+            postings.append((day, interest))
+            balance = quantize_money(balance + interest)
+        day += timedelta(days=1)
+    return postings
+
+
+def test_segment_schedule_matches_daily_walk():
+    rng = random.Random(20240101)
+    rates = [
+        Decimal("0"),
+        Decimal("0.000137"),
+        Decimal("0.001"),
+        Decimal("0.010000"),
+        Decimal("0.05"),
+    ]
+    for _ in range(300):
+        start = date(2024, 1, 1)
+        end = start + timedelta(days=rng.randint(0, 400))
+        opening = Decimal(rng.randint(-50_000, 50_000)) / 100
+        deltas = {
+            start + timedelta(days=rng.randint(0, 450)): Decimal(
+                rng.randint(-20_000, 20_000)
+            )
+            / 100
+            for _ in range(rng.randint(0, 8))
+        }
+        rate = rng.choice(rates)
+        penalty_rate = rng.choice(rates)
+
+        expected = _reference_schedule(
+            opening, deltas, start, end, rate, penalty_rate
+        )
+        actual = interest_schedule(
+            int(opening * 100),
+            {day: int(amount * 100) for day, amount in deltas.items()},
+            start,
+            end,
+            rate,
+            penalty_rate,
+        )
+        assert [(day, from_cents(cents)) for day, cents in actual] == expected
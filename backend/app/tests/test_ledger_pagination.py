@@ -0,0 +1,126 @@
+"""Tests for keyset pagination and filters on the ledger endpoint."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+# Allow importing the app package
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.main import app
+from app.database import get_session
+from app.models import Child, Transaction, User
+from app.auth import get_password_hash
+from app.crud import create_child_for_user, create_transaction
+
+
+async def _setup_test_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    TestSession = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with TestSession() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    return TestSession
+
+
+def test_ledger_pages_with_cursor_and_filters():
+    async def run():
+        TestSession = await _setup_test_db()
+        async with TestSession() as session:
+            parent = User(
+                name="Parent",
+                email="ledger@example.com",
+                password_hash=get_password_hash("pass"),
+                role="parent",
+            )
+            session.add(parent)
+            await session.commit()
+            await session.refresh(parent)
+            child = await create_child_for_user(
+                session, Child(first_name="Kid", access_code="LEDGER"), parent.id
+            )
+            base = datetime(2024, 1, 1, 12, 0, 0)
+            for i in range(7):
+                await create_transaction(
+                    session,
+                    Transaction(
+                        child_id=child.id,
+                        type="credit" if i % 2 == 0 else "debit",
+                        amount=Decimal("10.00") if i % 2 == 0 else Decimal("1.00"),
+                        memo=f"tx {i}",
+                        initiated_by="parent",
+                        initiator_id=parent.id,
+                        # Two rows share each timestamp to exercise the id tie-break.
+                        timestamp=base + timedelta(days=i // 2),
+                    ),
+                )
+            child_id = child.id
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/children/login", json={"access_code": "LEDGER"})
+            headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+            memos: list[str] = []
+            cursor = None
+            pages = 0
+            while True:
+                params = {"limit": 3}
+                if cursor:
+                    params["cursor"] = cursor
+                resp = await client.get(
+                    f"/transactions/child/{child_id}", headers=headers, params=params
+                )
+                assert resp.status_code == 200
+                body = resp.json()
+                assert body["balance"] == 37.0
+                memos.extend(t["memo"] for t in body["transactions"])
+                pages += 1
+                cursor = body["next_cursor"]
+                if cursor is None:
+                    break
+            assert pages == 3
+            assert memos == [f"tx {i}" for i in reversed(range(7))]
+
+            resp = await client.get(
+                f"/transactions/child/{child_id}",
+                headers=headers,
+                params={
+                    "type": "debit",
+                    "start": (base + timedelta(days=1)).isoformat(),
+                },
+            )
+            assert [t["memo"] for t in resp.json()["transactions"]] == ["tx 5", "tx 3"]
+
+            resp = await client.get(
+                f"/transactions/child/{child_id}",
+                headers=headers,
+                params={"legacy": "true"},
+            )
+            body = resp.json()
+            assert [t["memo"] for t in body["transactions"]] == [
+                f"tx {i}" for i in range(7)
+            ]
+            assert body["next_cursor"] is None
+
+            resp = await client.get(
+                f"/transactions/child/{child_id}",
+                headers=headers,
+                params={"cursor": "not-a-cursor"},
+            )
+            assert resp.status_code == 400
+
+        app.dependency_overrides.clear()
+
+    asyncio.run(run())
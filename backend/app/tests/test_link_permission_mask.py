@@ -0,0 +1,111 @@
+"""Tests for the bitmask mirror of ``ChildUserLink.permissions``."""
+
+import asyncio
+import json
+import pathlib
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+import app.database as database
+from app.acl import (
+    ALL_PERMISSIONS,
+    PERM_DEPOSIT,
+    PERM_MANAGE_WITHDRAWALS,
+    mask_to_permissions,
+    permissions_to_mask,
+)
+from app.crud import get_children_with_accounts, link_child_to_user
+from app.models import Child, User
+
+
+def test_mask_round_trips_in_canonical_order():
+    names = [PERM_MANAGE_WITHDRAWALS, PERM_DEPOSIT, "retired_permission"]
+    mask = permissions_to_mask(names)
+    assert mask_to_permissions(mask) == [PERM_DEPOSIT, PERM_MANAGE_WITHDRAWALS]
+    assert mask_to_permissions(permissions_to_mask(ALL_PERMISSIONS)) == ALL_PERMISSIONS
+
+
+def test_links_keep_mask_in_sync_for_permission_filters():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with Session() as session:
+            users = [
+                User(name=f"P{i}", email=f"p{i}@example.com", password_hash="x", role="parent")
+                for i in range(3)
+            ]
+            child = Child(first_name="Kid", access_code="MASK")
+            session.add_all([*users, child])
+            await session.commit()
+            owner, helper, viewer = users
+
+            await link_child_to_user(session, child.id, owner.id, [], is_owner=True)
+            link = await link_child_to_user(
+                session, child.id, helper.id, [PERM_MANAGE_WITHDRAWALS]
+            )
+            assert link.permission_mask == permissions_to_mask([PERM_MANAGE_WITHDRAWALS])
+            viewer_link = await link_child_to_user(
+                session, child.id, viewer.id, [PERM_DEPOSIT]
+            )
+
+            async def may_manage(user: User) -> bool:
+                rows = await get_children_with_accounts(
+                    session, user_id=user.id, permission=PERM_MANAGE_WITHDRAWALS
+                )
+                return [c.id for c, _ in rows] == [child.id]
+
+            assert [await may_manage(u) for u in users] == [True, True, False]
+
+            viewer_link.permissions = [PERM_DEPOSIT, PERM_MANAGE_WITHDRAWALS]
+            session.add(viewer_link)
+            await session.commit()
+            assert await may_manage(viewer)
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_startup_migration_backfills_masks(tmp_path, monkeypatch):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+            # Simulate an install created before the mask column existed.
+            await conn.execute(text('DROP INDEX "ix_childuserlink_child_permission_mask"'))
+            await conn.execute(text("ALTER TABLE childuserlink DROP COLUMN permission_mask"))
+            await conn.execute(
+                text(
+                    "INSERT INTO childuserlink (user_id, child_id, permissions, is_owner) "
+                    "VALUES (1, 1, :permissions, 0)"
+                ),
+                {"permissions": json.dumps([PERM_DEPOSIT])},
+            )
+
+        monkeypatch.setattr(database, "engine", engine)
+        await database.create_db_and_tables()
+
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT permission_mask FROM childuserlink"))
+            assert result.scalar_one() == permissions_to_mask([PERM_DEPOSIT])
+
+            plan = await conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT user_id FROM childuserlink "
+                    "WHERE child_id = 1 AND (is_owner = 1 OR permission_mask & 4 != 0)"
+                )
+            )
+            details = " ".join(str(row[-1]) for row in plan.fetchall())
+            assert "COVERING INDEX ix_childuserlink_child_permission_mask" in details
+
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,106 @@
+"""Equivalence test for the set-based loan interest pass."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+import app.crud as crud
+from app.models import Child, Loan, LoanTransaction, Settings
+
+# (principal, rate, days since interest was last applied, accrued, status)
+SCENARIOS = [
+    (Decimal("100.00"), Decimal("0.010000"), 5, Decimal("0.00"), "active"),
+    (Decimal("250.55"), Decimal("0.001370"), 40, Decimal("0.12"), "active"),
+    (Decimal("12.34"), Decimal("0.050000"), 400, Decimal("0.00"), "active"),
+    (Decimal("80.00"), Decimal("0.000000"), 9, Decimal("0.00"), "active"),
+    (Decimal("60.00"), Decimal("0.020000"), 0, Decimal("0.00"), "active"),
+    (Decimal("75.00"), Decimal("0.020000"), 9, Decimal("0.00"), "closed"),
+]
+
+
+async def _fresh_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with Session() as session:
+        child = Child(first_name="Kid", access_code="LOANS")
+        session.add(child)
+        await session.flush()
+        for principal, rate, days, accrued, status in SCENARIOS:
+            session.add(
+                Loan(
+                    child_id=child.id,
+                    amount=principal,
+                    interest_rate=rate,
+                    status=status,
+                    principal_remaining=principal,
+                    accrued_interest=accrued,
+                    last_interest_applied=date.today() - timedelta(days=days),
+                    created_at=datetime(2020, 1, 1),
+                )
+            )
+        await session.commit()
+    return engine, Session
+
+
+async def _snapshot(Session):
+    async with Session() as session:
+        loans = await session.execute(select(Loan).order_by(Loan.id))
+        txs = await session.execute(
+            select(LoanTransaction).order_by(
+                LoanTransaction.loan_id, LoanTransaction.timestamp
+            )
+        )
+        return (
+            [
+                (
+                    loan.id,
+                    loan.principal_remaining,
+                    loan.accrued_interest,
+                    loan.last_interest_applied,
+                )
+                for loan in loans.scalars().all()
+            ],
+            [
+                (tx.loan_id, tx.type, tx.amount, tx.memo, tx.timestamp)
+                for tx in txs.scalars().all()
+            ],
+        )
+
+
+def test_batch_matches_per_loan_reference():
+    async def run():
+        settings = Settings(interest_posting_frequency="weekly")
+
+        ref_engine, RefSession = await _fresh_db()
+        async with RefSession() as session:
+            result = await session.execute(select(Loan).order_by(Loan.id))
+            for loan in result.scalars().all():
+                await crud.recalc_loan_interest(
+                    session, loan, settings.interest_posting_frequency
+                )
+        expected = await _snapshot(RefSession)
+
+        batch_engine, BatchSession = await _fresh_db()
+        async with BatchSession() as session:
+            processed = await crud.apply_loan_interest_batch(
+                session, settings, batch_size=2
+            )
+        assert processed == len(SCENARIOS) - 1
+        actual = await _snapshot(BatchSession)
+
+        assert actual == expected
+        assert len(actual[1]) > len(SCENARIOS)
+
+        await ref_engine.dispose()
+        await batch_engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,187 @@
+"""Tests for login throttling and the legacy password hash flag."""
+
+import asyncio
+import pathlib
+import sys
+
+import bcrypt
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+# Allow importing the app package
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+import app.auth as auth
+from app.main import app
+from app.database import get_session
+from app.models import User
+from app.rate_limit import (
+    LOGIN_MAX_FAILURES_PER_IP,
+    TokenBucketLimiter,
+    clear_login_limits,
+    login_client_ip,
+)
+
+
+async def _setup_test_db(password_hash: str):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    TestSession = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with TestSession() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    async with TestSession() as session:
+        user = User(
+            name="Parent",
+            email="limit@example.com",
+            password_hash=password_hash,
+            role="parent",
+            status="active",
+        )
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+    return engine, TestSession, user.id
+
+
+def test_token_bucket_refills_and_forgets_full_buckets():
+    limiter = TokenBucketLimiter(capacity=2, refill_seconds=10)
+    limiter.consume("a", now=0)
+    assert limiter.retry_after("a", now=0) == 0
+    limiter.consume("a", now=0)
+    assert limiter.retry_after("a", now=0) == 5
+    assert limiter.retry_after("a", now=5) == 0
+    limiter.consume("b", now=20)
+    assert len(limiter) == 1
+
+
+def test_failed_logins_are_throttled_before_hashing(monkeypatch):
+    checks = []
+    real_checkpw = bcrypt.checkpw
+
+    def counting_checkpw(password, hashed):
+        checks.append(password)
+        return real_checkpw(password, hashed)
+
+    monkeypatch.setattr(bcrypt, "checkpw", counting_checkpw)
+
+    async def run():
+        clear_login_limits()
+        engine, _, _ = await _setup_test_db(auth.get_password_hash("pass"))
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(5):
+                resp = await client.post(
+                    "/login", json={"email": "limit@example.com", "password": "bad"}
+                )
+                assert resp.status_code == 401
+            checked = len(checks)
+
+            resp = await client.post(
+                "/login", json={"email": "LIMIT@example.com", "password": "pass"}
+            )
+            assert resp.status_code == 429
+            assert resp.json()["detail"]["code"] == "auth_rate_limited"
+            assert int(resp.headers["retry-after"]) > 0
+            assert len(checks) == checked
+
+        clear_login_limits()
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_login_client_ip_trusts_only_configured_proxies():
+    # Direct peers are keyed on their own address, whatever they forward.
+    assert login_client_ip("198.51.100.4", "203.0.113.7") == "198.51.100.4"
+    # Only the hop appended by the trusted proxy counts, not spoofed ones.
+    assert login_client_ip("127.0.0.1", "6.6.6.6, 203.0.113.7") == "203.0.113.7"
+    assert login_client_ip("127.0.0.1", None) is None
+    assert login_client_ip(None, None) is None
+
+
+def test_ip_throttle_is_per_forwarded_client_behind_proxy():
+    async def run():
+        clear_login_limits()
+        engine, _, _ = await _setup_test_db(auth.get_password_hash("pass"))
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            # The test transport connects from 127.0.0.1, the default trusted
+            # proxy, so without a forwarded address no IP bucket is shared.
+            for i in range(LOGIN_MAX_FAILURES_PER_IP + 2):
+                resp = await client.post(
+                    "/login", json={"email": f"user{i}@example.com", "password": "bad"}
+                )
+                assert resp.status_code == 401
+
+            attacker = {"X-Forwarded-For": "203.0.113.7"}
+            for i in range(LOGIN_MAX_FAILURES_PER_IP):
+                resp = await client.post(
+                    "/login",
+                    json={"email": f"spray{i}@example.com", "password": "bad"},
+                    headers=attacker,
+                )
+                assert resp.status_code == 401
+            resp = await client.post(
+                "/login",
+                json={"email": "limit@example.com", "password": "pass"},
+                headers=attacker,
+            )
+            assert resp.status_code == 429
+
+            resp = await client.post(
+                "/login",
+                json={"email": "limit@example.com", "password": "pass"},
+                headers={"X-Forwarded-For": "198.51.100.4"},
+            )
+            assert resp.status_code == 200
+
+        clear_login_limits()
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_login_migrates_legacy_hash_and_skips_legacy_check(monkeypatch):
+    async def run():
+        clear_login_limits()
+        legacy_hash = bcrypt.hashpw(b"pass", bcrypt.gensalt()).decode("utf-8")
+        engine, TestSession, user_id = await _setup_test_db(legacy_hash)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post(
+                "/login", json={"email": "limit@example.com", "password": "pass"}
+            )
+            assert resp.status_code == 200
+
+            async with TestSession() as session:
+                user = await session.get(User, user_id)
+                assert user.password_migrated is True
+                assert auth._match_password("pass", user.password_hash) == "current"
+
+            checks = []
+            real_checkpw = bcrypt.checkpw
+
+            def counting_checkpw(password, hashed):
+                checks.append(password)
+                return real_checkpw(password, hashed)
+
+            monkeypatch.setattr(bcrypt, "checkpw", counting_checkpw)
+            resp = await client.post(
+                "/login", json={"email": "limit@example.com", "password": "bad"}
+            )
+            assert resp.status_code == 401
+            assert len(checks) == 1
+
+        clear_login_limits()
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -4,15 +4,15 @@ import sys
 
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlmodel import SQLModel, select, delete
+from sqlmodel import SQLModel
 
 # Allow importing the app package
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
 from app.main import app
 from app.database import get_session
-from app.models import Permission, UserPermissionLink, User, ChildUserLink
-from app.crud import ensure_permissions_exist
+from app.models import User, ChildUserLink
+from app.crud import ensure_permissions_exist, remove_permissions_by_names
 from app.acl import ALL_PERMISSIONS, ROLE_DEFAULT_PERMISSIONS, PERM_SEND_MESSAGE
 
 
@@ -151,17 +151,8 @@ def test_basic_messaging_flow():
 
             # Remove parent's messaging permission at user level
             async with TestSession() as session:
-                result = await session.execute(
-                    select(Permission).where(Permission.name == PERM_SEND_MESSAGE)
-                )
-                perm = result.scalar_one()
-                await session.execute(
-                    delete(UserPermissionLink).where(
-                        UserPermissionLink.user_id == parent_id,
-                        UserPermissionLink.permission_id == perm.id,
-                    )
-                )
-                await session.commit()
+                parent = await session.get(User, parent_id)
+                await remove_permissions_by_names(session, parent, [PERM_SEND_MESSAGE])
 
             resp = await client.post(
                 "/messages/",
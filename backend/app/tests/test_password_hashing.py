@@ -0,0 +1,94 @@
+"""Tests for running bcrypt on the bounded hashing pool."""
+
+import asyncio
+import pathlib
+import sys
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+# Allow importing the app package
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+import app.auth as auth
+from app.main import app
+from app.database import get_session
+from app.models import User
+
+
+def test_password_checks_do_not_block_the_event_loop():
+    async def run():
+        hashed = await auth.get_password_hash_async("pass")
+        started = time.perf_counter()
+        auth.verify_password("pass", hashed)
+        one_check = time.perf_counter() - started
+        stamps = [time.perf_counter()]
+
+        async def ticker():
+            while True:
+                await asyncio.sleep(0.001)
+                stamps.append(time.perf_counter())
+
+        task = asyncio.create_task(ticker())
+        checks = [auth.verify_password_async("pass", hashed) for _ in range(4)]
+        assert all(await asyncio.gather(*checks))
+        stamps.append(time.perf_counter())
+        task.cancel()
+        # Checks run inline would stall the loop for at least one bcrypt round.
+        longest_gap = max(b - a for a, b in zip(stamps, stamps[1:]))
+        assert longest_gap < one_check / 2
+
+    asyncio.run(run())
+
+
+def test_login_returns_503_when_hashing_pool_is_saturated(monkeypatch):
+    monkeypatch.setattr(auth, "PASSWORD_HASH_CONCURRENCY", 1)
+    monkeypatch.setattr(auth, "PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", 0.05)
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        TestSession = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def override_get_session():
+            async with TestSession() as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        async with TestSession() as session:
+            session.add(
+                User(
+                    name="Parent",
+                    email="busy@example.com",
+                    password_hash=auth.get_password_hash("pass"),
+                    role="parent",
+                    status="active",
+                )
+            )
+            await session.commit()
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            # Hold the only hashing slot for longer than the queue timeout.
+            busy = asyncio.create_task(auth._run_password_work(time.sleep, 0.5))
+            await asyncio.sleep(0)
+            resp = await client.post(
+                "/login", json={"email": "busy@example.com", "password": "pass"}
+            )
+            assert resp.status_code == 503
+            assert resp.json()["code"] == "service_busy"
+            assert resp.headers["retry-after"] == "1"
+            await busy
+
+            resp = await client.post(
+                "/login", json={"email": "busy@example.com", "password": "pass"}
+            )
+            assert resp.status_code == 200
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -1,6 +1,7 @@
 """Unit test for recurring charge processing."""
 
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 import asyncio
 import pathlib
 import sys
@@ -14,6 +15,7 @@ from app.models import User, Child, RecurringCharge
 from app.crud import (
     create_child_for_user,
     create_recurring_charge,
+    get_account_by_child,
     process_due_recurring_charges,
     get_transactions_by_child,
 )
@@ -74,3 +76,63 @@ def test_recurring_charge_posts_transaction():
             updated_credit = result.scalar_one()
             assert updated_credit.next_run > date.today()
     asyncio.run(run())
+
+
+def test_recurring_catch_up_posts_each_missed_occurrence():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        today = date.today()
+        async with Session() as session:
+            parent = User(
+                name="Parent",
+                email="p@example.com",
+                password_hash=get_password_hash("pass"),
+                role="parent",
+            )
+            session.add(parent)
+            await session.commit()
+            await session.refresh(parent)
+            child = await create_child_for_user(
+                session, Child(first_name="Kid", access_code="K1"), parent.id
+            )
+            for memo, days_ago in (("Allowance", 10), ("Snack", 0)):
+                await create_recurring_charge(
+                    session,
+                    RecurringCharge(
+                        child_id=child.id,
+                        amount=5 if memo == "Allowance" else 1,
+                        type="credit" if memo == "Allowance" else "debit",
+                        memo=memo,
+                        interval_days=3,
+                        next_run=today - timedelta(days=days_ago),
+                    ),
+                )
+
+            posted = await process_due_recurring_charges(session, batch_size=1)
+            assert posted == 5
+
+            txs = await get_transactions_by_child(session, child.id)
+            allowance = sorted(t.timestamp for t in txs if t.memo == "Allowance")
+            assert allowance == [
+                datetime.combine(today - timedelta(days=days), time.min)
+                for days in (10, 7, 4, 1)
+            ]
+            result = await session.execute(select(RecurringCharge))
+            assert {rc.next_run for rc in result.scalars().all()} == {
+                today + timedelta(days=2),
+                today + timedelta(days=3),
+            }
+
+            account = await get_account_by_child(session, child.id)
+            assert account.last_interest_applied == today
+            # Backdated rows earn interest from their due dates.
+            assert account.total_interest_earned > 0
+            assert account.balance == Decimal("19.00") + account.total_interest_earned
+
+            assert await process_due_recurring_charges(session) == 0
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,121 @@
+"""Tests for the in-process revoked token cache."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+import app.auth as auth
+from app.models import RevokedToken
+
+
+async def _fresh_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _count_queries(engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    return statements
+
+
+def test_revoked_token_checks_skip_database_between_syncs():
+    async def run():
+        engine, Session = await _fresh_db()
+        expires = datetime.now(timezone.utc) + timedelta(minutes=30)
+        async with Session() as session:
+            await auth.sync_revoked_tokens(session, force=True)
+            await auth.revoke_token(session, "gone", "user:1", "access", expires)
+
+        statements = _count_queries(engine)
+        async with Session() as session:
+            assert await auth.is_token_revoked(session, "gone")
+            assert not await auth.is_token_revoked(session, "live")
+        assert statements == []
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_revocations_from_other_workers_are_synced(monkeypatch):
+    async def run():
+        engine, Session = await _fresh_db()
+        async with Session() as session:
+            assert not await auth.is_token_revoked(session, "elsewhere")
+            # Another worker revokes a token directly in the database.
+            session.add(
+                RevokedToken(
+                    jti="elsewhere",
+                    subject="user:2",
+                    token_type="access",
+                    expires_at=datetime.utcnow() + timedelta(minutes=5),
+                )
+            )
+            await session.commit()
+            assert not await auth.is_token_revoked(session, "elsewhere")
+
+            monkeypatch.setattr(auth, "REVOCATION_SYNC_SECONDS", 0)
+            assert await auth.is_token_revoked(session, "elsewhere")
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_local_revocation_does_not_skip_unsynced_rows(monkeypatch):
+    async def run():
+        engine, Session = await _fresh_db()
+        expires = datetime.now(timezone.utc) + timedelta(minutes=30)
+        async with Session() as session:
+            await auth.sync_revoked_tokens(session, force=True)
+            # Another worker revokes first, so its row gets the lower id.
+            session.add(
+                RevokedToken(
+                    jti="other-worker",
+                    subject="user:2",
+                    token_type="access",
+                    expires_at=datetime.utcnow() + timedelta(minutes=5),
+                )
+            )
+            await session.commit()
+            await auth.revoke_token(session, "local", "user:1", "access", expires)
+
+            monkeypatch.setattr(auth, "REVOCATION_SYNC_SECONDS", 0)
+            assert await auth.is_token_revoked(session, "other-worker")
+            assert await auth.is_token_revoked(session, "local")
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_expired_revocations_are_evicted_and_purged():
+    async def run():
+        engine, Session = await _fresh_db()
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        async with Session() as session:
+            await auth.revoke_token(session, "old", "user:1", "access", past)
+            await auth.revoke_token(session, "older", "user:1", "access", past)
+            assert not await auth.is_token_revoked(session, "older")
+
+            assert await auth.purge_expired_revoked_tokens(session) == 1
+            remaining = await session.execute(select(RevokedToken.jti))
+            assert remaining.scalars().all() == ["older"]
+
+        await engine.dispose()
+
+    asyncio.run(run())
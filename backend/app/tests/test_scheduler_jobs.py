@@ -3,14 +3,46 @@
 import asyncio
 import pathlib
 import sys
+import time as time_module
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
 
+import pytest
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlmodel import SQLModel, select
+from sqlmodel import SQLModel, select, update
 
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
-from app.models import JobRun
-from app.services.daily_jobs import PIPELINE_JOB_NAME, run_daily_jobs_once
+import app.crud as crud
+from app.models import (
+    Account,
+    CertificateDeposit,
+    Child,
+    JobRun,
+    RecurringCharge,
+    SchedulerLock,
+    Settings,
+    Transaction,
+)
+from app.services.daily_jobs import (
+    PIPELINE_JOB_NAME,
+    Stage,
+    _resume_checkpoint,
+    has_successful_run_for_day,
+    run_account_interest_and_fees,
+    run_daily_jobs_once,
+    run_due_items_once,
+    run_stage_graph,
+    run_tracked_job,
+)
+from app.services.leases import LeaseHeartbeat, LeaseLostError
+from app.services.scheduler import (
+    DailyScheduler,
+    acquire_scheduler_lease,
+    run_available_shards,
+    shard_lock_name,
+    try_acquire_scheduler_lock,
+)
 
 
 def test_daily_pipeline_records_job_runs_and_deduplicates_per_day():
@@ -50,3 +82,453 @@ def test_daily_pipeline_records_job_runs_and_deduplicates_per_day():
         assert len(pipeline_runs) == 1
 
     asyncio.run(run())
+
+
+def test_stage_graph_runs_independent_stages_concurrently(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dag.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        events: list[str] = []
+        attempts = {"flaky": 0}
+
+        def stage(name, seconds):
+            async def runner(db, context, shard=None):
+                events.append(f"start {name}")
+                await asyncio.sleep(seconds)
+                events.append(f"end {name}")
+
+            return runner
+
+        async def flaky(db, context, shard=None):
+            attempts["flaky"] += 1
+            if attempts["flaky"] == 1:
+                raise RuntimeError("transient")
+
+        async def hangs(db, context, shard=None):
+            await asyncio.sleep(5)
+
+        stages = (
+            Stage("first", stage("first", 0.2)),
+            Stage("second", flaky, depends_on=("first",), backoff_seconds=0.01),
+            Stage("side", stage("side", 0.1)),
+        )
+        critical_path = await run_stage_graph(Session, stages)
+
+        assert events.index("start side") < events.index("end first")
+        assert attempts["flaky"] == 2
+        assert 0.2 <= critical_path < 1
+
+        with pytest.raises(TimeoutError):
+            await run_stage_graph(
+                Session,
+                (
+                    Stage("slow", hangs, timeout_seconds=0.05, max_attempts=1),
+                    Stage("after", stage("after", 0), depends_on=("slow",)),
+                    Stage("other", stage("other", 0)),
+                ),
+            )
+        assert "start after" not in events
+        assert "end other" in events
+
+        async with Session() as session:
+            result = await session.execute(select(JobRun).order_by(JobRun.id))
+            runs = [(run.job_name, run.status) for run in result.scalars().all()]
+        assert ("second", "error") in runs and ("second", "success") in runs
+        assert ("slow", "error") in runs
+        assert all(name != "after" for name, _ in runs)
+
+        with pytest.raises(ValueError):
+            await run_stage_graph(Session, (Stage("loop", hangs, depends_on=("loop",)),))
+
+        await run_daily_jobs_once(Session)
+        async with Session() as session:
+            result = await session.execute(
+                select(JobRun).where(JobRun.job_name == PIPELINE_JOB_NAME)
+            )
+            pipeline = result.scalar_one()
+        assert pipeline.status == "success"
+        assert pipeline.critical_path_seconds is not None
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+async def _session_with_funded_accounts(count: int):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with Session() as session:
+        session.add(Settings(daily_job_chunk_size=2))
+        for index in range(count):
+            child = Child(first_name=f"Kid {index}", access_code=f"CHK{index}")
+            session.add(child)
+            await session.flush()
+            session.add(Account(child_id=child.id))
+            session.add(
+                Transaction(
+                    child_id=child.id,
+                    type="credit",
+                    amount=Decimal("100.00"),
+                    initiated_by="parent",
+                    initiator_id=1,
+                    timestamp=datetime.combine(
+                        date.today() - timedelta(days=3), time.min
+                    ),
+                )
+            )
+        await session.commit()
+        await crud.rebuild_account_balances(session)
+    return Session
+
+
+async def _interest_rows_per_child(Session) -> list[int]:
+    async with Session() as session:
+        result = await session.execute(
+            select(Transaction.child_id).where(Transaction.memo == "Interest")
+        )
+        return sorted(row[0] for row in result.all())
+
+
+def test_account_stage_resumes_from_checkpoint(monkeypatch):
+    async def run():
+        Session = await _session_with_funded_accounts(5)
+
+        original_rows = crud._interest_rows
+
+        def crash_on_third_child(child_id, postings):
+            if child_id == 3:
+                raise RuntimeError("simulated crash")
+            return original_rows(child_id, postings)
+
+        monkeypatch.setattr(crud, "_interest_rows", crash_on_third_child)
+        stage = "daily.account_interest_and_fees"
+        with pytest.raises(RuntimeError):
+            await run_tracked_job(
+                Session,
+                job_name=stage,
+                runner=run_account_interest_and_fees,
+                resumable=True,
+            )
+        monkeypatch.undo()
+
+        await run_tracked_job(
+            Session,
+            job_name=stage,
+            runner=run_account_interest_and_fees,
+            resumable=True,
+        )
+
+        async with Session() as session:
+            result = await session.execute(
+                select(JobRun).where(JobRun.job_name == stage).order_by(JobRun.id)
+            )
+            failed, resumed = result.scalars().all()
+            assert (failed.status, failed.checkpoint) == ("error", 2)
+            assert (resumed.status, resumed.checkpoint) == ("success", 5)
+
+        # Every child received its three days of interest exactly once.
+        assert await _interest_rows_per_child(Session) == sorted(
+            list(range(1, 6)) * 3
+        )
+
+    asyncio.run(run())
+
+
+def test_resume_checkpoint_uses_the_local_day(monkeypatch):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        midnight = datetime.combine(date.today(), time.min).astimezone(timezone.utc)
+        midnight = midnight.replace(tzinfo=None)
+        stage = "daily.account_interest_and_fees"
+
+        async with Session() as session:
+            session.add(
+                JobRun(
+                    job_name=stage,
+                    status="error",
+                    checkpoint=7,
+                    started_at=midnight - timedelta(minutes=1),
+                )
+            )
+            await session.commit()
+            assert await _resume_checkpoint(session, stage) is None
+
+            session.add(
+                JobRun(
+                    job_name=stage,
+                    status="error",
+                    checkpoint=9,
+                    started_at=midnight + timedelta(minutes=1),
+                )
+            )
+            await session.commit()
+            assert await _resume_checkpoint(session, stage) == 9
+
+        await engine.dispose()
+
+    # Six hours behind UTC, so the local and UTC dates differ part of the day.
+    monkeypatch.setenv("TZ", "Etc/GMT+6")
+    time_module.tzset()
+    try:
+        asyncio.run(run())
+    finally:
+        monkeypatch.undo()
+        time_module.tzset()
+
+
+def test_stage_runs_record_metrics():
+    async def run():
+        Session = await _session_with_funded_accounts(3)
+        async with Session() as session:
+            session.add(
+                RecurringCharge(
+                    child_id=1,
+                    amount=Decimal("2.00"),
+                    type="debit",
+                    memo="Allowance fee",
+                    interval_days=7,
+                    next_run=date.today() - timedelta(days=2),
+                )
+            )
+            await session.commit()
+
+        assert await run_daily_jobs_once(Session) is True
+
+        async with Session() as session:
+            result = await session.execute(select(JobRun))
+            runs = {run.job_name: run for run in result.scalars().all()}
+
+        accounts = runs["daily.account_interest_and_fees"]
+        assert accounts.rows_read == 3  # settings come from the cache
+        assert accounts.rows_written >= 3
+        assert accounts.commits == 2  # chunk size 2
+        assert accounts.max_item_ms is not None
+
+        charges = runs["daily.recurring_charges"]
+        assert charges.rows_read == 3  # charge, settings, recalculated account
+        assert charges.rows_written >= 3  # transaction, next_run and balance
+        assert charges.commits == 2  # the batch, then the interest recalculation
+        assert charges.max_lag_seconds >= timedelta(days=2).total_seconds()
+
+        loans = runs["daily.loan_interest"]
+        assert loans.rows_written == 0 and loans.max_item_ms is None
+
+    asyncio.run(run())
+
+
+def test_sharded_replicas_split_work_and_complete_pipeline():
+    async def run():
+        Session = await _session_with_funded_accounts(6)
+        today = datetime.utcnow().date()
+
+        # Replica A holds shard 0, so replica B can only run the others.
+        assert await try_acquire_scheduler_lock(
+            Session,
+            lock_name=shard_lock_name("daily", 0, 3),
+            owner_id="replica-a",
+            ttl_seconds=600,
+        )
+        ran = await run_available_shards(
+            Session,
+            lock_name="daily",
+            owner_id="replica-b",
+            shard_count=3,
+            ttl_seconds=600,
+        )
+        assert ran == 2
+        async with Session() as session:
+            assert not await has_successful_run_for_day(
+                session, job_name=PIPELINE_JOB_NAME, day=today
+            )
+        assert set(await _interest_rows_per_child(Session)) == {1, 2, 4, 5}
+
+        ran = await run_available_shards(
+            Session,
+            lock_name="daily",
+            owner_id="replica-a",
+            shard_count=3,
+            ttl_seconds=600,
+        )
+        assert ran == 1
+        async with Session() as session:
+            assert await has_successful_run_for_day(
+                session, job_name=PIPELINE_JOB_NAME, day=today
+            )
+            result = await session.execute(
+                select(JobRun.job_name).where(JobRun.job_name.like("%@%/3"))
+            )
+            assert len(result.all()) == 3 * 5
+        assert await _interest_rows_per_child(Session) == sorted(
+            list(range(1, 7)) * 3
+        )
+
+    asyncio.run(run())
+
+
+def test_heartbeat_renews_lease_and_fence_blocks_stale_owner(tmp_path):
+    async def run():
+        # A file database gives each session its own connection, so the
+        # background heartbeat cannot interleave with the test's transactions.
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'lease.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        token_a = await acquire_scheduler_lease(
+            Session, lock_name="daily", owner_id="replica-a", ttl_seconds=1
+        )
+        assert token_a == 1
+        # Re-acquiring as the same owner keeps the token.
+        assert (
+            await acquire_scheduler_lease(
+                Session, lock_name="daily", owner_id="replica-a", ttl_seconds=1
+            )
+            == 1
+        )
+
+        async def lease() -> SchedulerLock:
+            async with Session() as session:
+                return await session.get(SchedulerLock, "daily")
+
+        first_deadline = (await lease()).locked_until
+        async with LeaseHeartbeat(
+            Session,
+            lock_name="daily",
+            owner_id="replica-a",
+            token=token_a,
+            ttl_seconds=1,
+            interval_seconds=0.05,
+        ) as fence:
+            await asyncio.sleep(0.2)
+            assert (await lease()).locked_until > first_deadline
+
+            async def write(db):
+                db.add(Child(first_name="Kid", access_code="FENCE"))
+                await db.commit()
+
+            await run_tracked_job(Session, job_name="fenced", runner=write, fence=fence)
+
+            # Simulate replica B taking over after A's lease lapsed.
+            async with Session() as session:
+                await session.execute(
+                    update(SchedulerLock).values(
+                        owner_id="replica-b", fencing_token=2
+                    )
+                )
+                await session.commit()
+
+            async def stale_write(db):
+                db.add(Child(first_name="Kid", access_code="STALE"))
+                await db.commit()
+
+            with pytest.raises(LeaseLostError):
+                await run_tracked_job(
+                    Session, job_name="fenced", runner=stale_write, fence=fence
+                )
+
+        assert (await lease()).owner_id == "replica-b"
+
+        # Taking over an expired lease bumps the fencing token.
+        async with Session() as session:
+            await session.execute(
+                update(SchedulerLock).values(
+                    locked_until=datetime.utcnow() - timedelta(seconds=1)
+                )
+            )
+            await session.commit()
+        assert (
+            await acquire_scheduler_lease(
+                Session, lock_name="daily", owner_id="replica-c", ttl_seconds=60
+            )
+            == 3
+        )
+        async with Session() as session:
+            codes = await session.execute(select(Child.access_code))
+            assert [row[0] for row in codes.all()] == ["FENCE"]
+            runs = await session.execute(
+                select(JobRun.status).where(JobRun.job_name == "fenced")
+            )
+            assert [row[0] for row in runs.all()] == ["success", "error"]
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_scheduler_wakes_for_next_due_item_and_processes_it():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        scheduler = DailyScheduler(
+            Session,
+            lock_name="daily",
+            owner_id="replica-a",
+            poll_seconds=2 * 86400,
+            lock_ttl_seconds=60,
+        )
+
+        now = datetime.utcnow()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        assert await scheduler.next_wake_at(now) == midnight
+
+        async with Session() as session:
+            child = Child(first_name="Kid", access_code="WAKE")
+            session.add(child)
+            await session.flush()
+            session.add(Account(child_id=child.id))
+            matures_at = now + timedelta(minutes=5)
+            session.add(
+                CertificateDeposit(
+                    child_id=child.id,
+                    parent_id=1,
+                    amount=Decimal("10.00"),
+                    interest_rate=Decimal("0.01"),
+                    term_days=1,
+                    status="accepted",
+                    matures_at=matures_at,
+                )
+            )
+            await session.commit()
+            child_id = child.id
+        assert await scheduler.next_wake_at(now) == min(midnight, matures_at)
+
+        scheduler._next_wake = now + timedelta(hours=1)
+        scheduler.wake_if_earlier(now + timedelta(hours=2))
+        assert not scheduler._wake_event.is_set()
+        scheduler.wake_if_earlier(now + timedelta(minutes=1))
+        assert scheduler._wake_event.is_set()
+
+        # A charge that falls due after today's pipeline still gets processed.
+        assert await run_daily_jobs_once(Session) is True
+        async with Session() as session:
+            session.add(
+                RecurringCharge(
+                    child_id=child_id,
+                    amount=Decimal("2.00"),
+                    type="debit",
+                    memo="Allowance fee",
+                    interval_days=7,
+                    next_run=date.today(),
+                )
+            )
+            await session.commit()
+        assert await run_daily_jobs_once(Session) is False
+        assert await run_due_items_once(Session) is True
+        assert await run_due_items_once(Session) is False
+        async with Session() as session:
+            result = await session.execute(
+                select(Transaction.memo).where(Transaction.child_id == child_id)
+            )
+            assert [row[0] for row in result.all()] == ["Allowance fee"]
+
+    asyncio.run(run())
@@ -6,14 +6,15 @@ import sys
 
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, update
 
 # Allow importing the app package
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
 from app.main import app
 from app.database import get_session
-from app.models import User
+import app.crud as crud
+from app.models import Settings, User
 from app.auth import get_password_hash
 from app.crud import ensure_permissions_exist
 from app.acl import ALL_PERMISSIONS
@@ -95,6 +96,16 @@ def test_settings_endpoints():
             assert data["currency_symbol"] == "€"
             assert data["site_url"] == "https://bank"
 
+            # An explicit null leaves the field unchanged
+            resp = await client.put(
+                "/settings/",
+                headers=admin_headers,
+                json={"default_interest_rate": None, "site_name": None},
+            )
+            assert resp.status_code == 200
+            assert resp.json()["default_interest_rate"] == 0.01
+            assert resp.json()["site_name"] == "My Bank"
+
             # Updated values persist on subsequent read
             resp = await client.get("/settings/")
             assert resp.status_code == 200
@@ -103,4 +114,86 @@ def test_settings_endpoints():
             assert data["currency_symbol"] == "€"
             assert data["site_url"] == "https://bank"
 
+            # Unchanged settings revalidate with the ETag
+            etag = resp.headers["etag"]
+            resp = await client.get("/settings/", headers={"If-None-Match": etag})
+            assert resp.status_code == 304
+            assert resp.headers["etag"] == etag
+
+            resp = await client.put(
+                "/settings/", headers=admin_headers, json={"currency_symbol": "£"}
+            )
+            assert resp.status_code == 200
+            resp = await client.get("/settings/", headers={"If-None-Match": etag})
+            assert resp.status_code == 200
+            assert resp.json()["currency_symbol"] == "£"
+            assert resp.headers["etag"] != etag
+
+    asyncio.run(run())
+
+
+def test_settings_cache_revalidates_by_version(monkeypatch):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with Session() as session:
+            assert (await crud.get_settings(session)).site_name == "Uncle Jon's Bank"
+            # Another worker saves a change, bumping the version.
+            await session.execute(
+                update(Settings)
+                .where(Settings.id == 1)
+                .values(site_name="Elsewhere", version=Settings.version + 1)
+            )
+            await session.commit()
+
+        async with Session() as session:
+            assert (await crud.get_settings(session)).site_name == "Uncle Jon's Bank"
+            monkeypatch.setattr(crud, "SETTINGS_CACHE_TTL_SECONDS", 0)
+            assert (await crud.get_settings(session)).site_name == "Elsewhere"
+
+            saved = await crud.save_settings(session, {"site_name": "Saved"})
+            assert saved.version == 2
+            monkeypatch.setattr(crud, "SETTINGS_CACHE_TTL_SECONDS", 3600)
+            assert (await crud.get_settings(session)).site_name == "Saved"
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_save_within_ttl_keeps_other_workers_changes():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with Session() as session:
+            await crud.get_settings(session)
+
+        # Another worker saves while this worker's cached copy is still fresh.
+        async with Session() as session:
+            await session.execute(
+                update(Settings)
+                .where(Settings.id == 1)
+                .values(site_name="Elsewhere", version=Settings.version + 1)
+            )
+            await session.commit()
+
+        async with Session() as session:
+            assert (await crud.get_settings(session)).site_name == "Uncle Jon's Bank"
+            saved = await crud.save_settings(session, {"currency_symbol": "£"})
+            assert saved.site_name == "Elsewhere"
+            assert saved.currency_symbol == "£"
+            assert saved.version == 2
+
+        async with Session() as session:
+            row = await session.get(Settings, 1)
+            assert (row.site_name, row.currency_symbol) == ("Elsewhere", "£")
+
+        await engine.dispose()
+
     asyncio.run(run())
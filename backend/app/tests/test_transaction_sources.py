@@ -0,0 +1,110 @@
+"""Tests for structured transaction source references."""
+
+import asyncio
+import pathlib
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from app.crud import backfill_transaction_sources, redeem_cd
+from app.models import Account, CertificateDeposit, Child, RecurringCharge, Transaction
+
+
+def _legacy(child_id: int, memo: str, initiated_by: str = "system") -> Transaction:
+    return Transaction(
+        child_id=child_id,
+        type="credit",
+        amount=Decimal("1.00"),
+        memo=memo,
+        initiated_by=initiated_by,
+        initiator_id=0,
+    )
+
+
+def test_backfill_classifies_legacy_memos_and_cd_dedupe_uses_keys():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with Session() as session:
+            child = Child(first_name="Kid", access_code="SRC")
+            session.add(child)
+            await session.flush()
+            session.add(Account(child_id=child.id, interest_rate=Decimal("0")))
+            cd = CertificateDeposit(
+                child_id=child.id,
+                parent_id=1,
+                amount=Decimal("10.00"),
+                interest_rate=Decimal("0.1"),
+                term_days=5,
+                status="accepted",
+                matures_at=datetime.utcnow() - timedelta(days=1),
+            )
+            session.add(cd)
+            session.add(
+                RecurringCharge(
+                    child_id=child.id,
+                    amount=Decimal("1.00"),
+                    memo="Allowance",
+                    interval_days=7,
+                    next_run=datetime.utcnow().date(),
+                )
+            )
+            await session.flush()
+            memos = [
+                (f"CD #{cd.id} purchase", "child"),
+                (f"CD #{cd.id} maturity", "system"),
+                ("Loan #4 payment", "parent"),
+                ("Chore: Dishes", "parent"),
+                ("Interest", "system"),
+                ("Overdraft Fee", "system"),
+                ("Allowance", "system"),
+                ("Birthday", "parent"),
+            ]
+            for memo, initiated_by in memos:
+                session.add(_legacy(child.id, memo, initiated_by))
+            await session.commit()
+
+            assert await backfill_transaction_sources(session, batch_size=3) == 7
+            result = await session.execute(
+                select(
+                    Transaction.memo,
+                    Transaction.source_type,
+                    Transaction.source_id,
+                    Transaction.idempotency_key,
+                ).order_by(Transaction.id)
+            )
+            assert result.all() == [
+                (f"CD #{cd.id} purchase", "cd", cd.id, f"cd:{cd.id}:purchase"),
+                (f"CD #{cd.id} maturity", "cd", cd.id, f"cd:{cd.id}:maturity"),
+                ("Loan #4 payment", "loan", 4, None),
+                ("Chore: Dishes", "chore", None, None),
+                ("Interest", "interest", None, None),
+                ("Overdraft Fee", "overdraft_fee", None, None),
+                ("Allowance", "recurring_charge", 1, None),
+                ("Birthday", None, None, None),
+            ]
+            assert await backfill_transaction_sources(session) == 0
+
+            # The backfilled maturity row is found by its key, so redeeming
+            # the CD does not pay it out a second time.
+            await redeem_cd(session, cd)
+            result = await session.execute(
+                select(Transaction).where(
+                    Transaction.source_type == "cd",
+                    Transaction.source_id == cd.id,
+                )
+            )
+            assert len(result.scalars().all()) == 2
+            assert cd.status == "redeemed"
+
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,131 @@
+"""Measure API latency while a burst of logins hits the password hasher.
+
+Runs the app in-process against an in-memory database.  Concurrent
+``/login`` calls keep bcrypt busy while a probe times ``GET /settings/``,
+a cheap endpoint that never hashes, on a fixed schedule.  Latency is
+counted from each probe's scheduled start, so a stalled event loop shows
+up even for probes that could not be sent on time.  The p50/p99 show
+whether hashing blocks unrelated requests::
+
+    cd backend
+    python scripts/login_storm_bench.py
+    python scripts/login_storm_bench.py --inline   # bcrypt on the event loop
+
+``--inline`` runs the hashing on the event loop, as before the bounded
+pool, to give a baseline to compare against.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import pathlib
+import sys
+import time
+from collections import Counter
+
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+
+import app.auth as auth
+from app.database import get_session
+from app.main import app
+from app.models import User
+from app.rate_limit import clear_login_limits
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return ordered[index]
+
+
+async def _setup() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    async with Session() as session:
+        session.add(
+            User(
+                name="Bench",
+                email="bench@example.com",
+                password_hash=auth.get_password_hash("pass"),
+                role="parent",
+                status="active",
+                password_migrated=True,
+            )
+        )
+        await session.commit()
+
+
+async def run(logins: int, concurrency: int, probe_interval: float) -> None:
+    await _setup()
+    clear_login_limits()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/settings/")  # warm the settings cache
+
+        statuses: Counter[int] = Counter()
+        gate = asyncio.Semaphore(concurrency)
+
+        async def login() -> None:
+            async with gate:
+                resp = await client.post(
+                    "/login", json={"email": "bench@example.com", "password": "pass"}
+                )
+                statuses[resp.status_code] += 1
+
+        latencies: list[float] = []
+        storm = asyncio.gather(*(login() for _ in range(logins)))
+        started = next_probe = time.perf_counter()
+        while not storm.done():
+            await asyncio.sleep(max(next_probe - time.perf_counter(), 0))
+            await client.get("/settings/")
+            latencies.append((time.perf_counter() - next_probe) * 1000)
+            next_probe += probe_interval
+        await storm
+        elapsed = time.perf_counter() - started
+
+    print(f"logins: {logins} in {elapsed:.2f}s, statuses {dict(statuses)}")
+    print(
+        f"GET /settings/ during storm: n={len(latencies)} "
+        f"p50={_percentile(latencies, 0.5):.1f}ms "
+        f"p99={_percentile(latencies, 0.99):.1f}ms "
+        f"max={max(latencies):.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    parser.add_argument(
+        "--inline",
+        action="store_true",
+        help="hash on the event loop instead of the bounded pool",
+    )
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.inline:
+
+        async def inline(func, *func_args):
+            return func(*func_args)
+
+        auth._run_password_work = inline
+    asyncio.run(run(args.logins, args.concurrency, args.probe_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -21,8 +21,8 @@ export interface AdminChild {
 export const listAdminUsers = (client: ApiClient) =>
   client.get<AdminUser[]>('/admin/users')
 
-export const listAdminChildren = (client: ApiClient) =>
-  client.get<AdminChild[]>('/admin/children')
+export const listAdminChildren = (client: ApiClient, params?: URLSearchParams) =>
+  client.get<AdminChild[]>(params ? `/admin/children?${params.toString()}` : '/admin/children')
 
 export const listAdminTransactions = (client: ApiClient) =>
   client.get<Transaction[]>('/admin/transactions')
@@ -10,6 +10,7 @@ export interface ChildApi {
   penalty_interest_rate?: number
   cd_penalty_rate?: number
   total_interest_earned?: number
+  accrued_interest?: number | null
 }
 
 export type { ChildParentInfo }
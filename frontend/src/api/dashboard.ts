@@ -0,0 +1,29 @@
+import type { ApiClient } from './client'
+
+export interface DashboardCd {
+  id: number
+  amount: number
+  interest_rate: number
+  matures_at?: string | null
+}
+
+export interface DashboardChild {
+  id: number
+  first_name: string
+  frozen: boolean
+  balance: number
+  accrued_interest: number
+  last_activity?: string | null
+  pending_withdrawals: number
+  chores_awaiting_approval: number
+  active_loans: number
+  active_loan_principal: number
+  upcoming_cds: DashboardCd[]
+}
+
+export interface DashboardResponse {
+  children: DashboardChild[]
+}
+
+export const getDashboard = (client: ApiClient) =>
+  client.get<DashboardResponse>('/dashboard')
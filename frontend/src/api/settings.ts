@@ -13,6 +13,8 @@ export interface SiteSettings {
   overdraft_fee_daily: boolean
   currency_symbol: string
   public_registration_disabled: boolean
+  interest_posting_frequency: 'daily' | 'weekly' | 'monthly'
+  daily_job_chunk_size: number
 }
 
 export const getSettings = (client: ApiClient) =>
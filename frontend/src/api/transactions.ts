@@ -11,8 +11,9 @@ export interface CreateTransactionPayload {
   initiator_id: number
 }
 
+// The dashboards still render the whole ledger, so request the legacy shape.
 export const getChildLedger = (client: ApiClient, childId: number) =>
-  client.get<LedgerResponse>(`/transactions/child/${childId}`)
+  client.get<LedgerResponse>(`/transactions/child/${childId}?legacy=true`)
 
 export const createTransaction = (client: ApiClient, payload: CreateTransactionPayload) =>
   client.post<Transaction>('/transactions/', payload)
@@ -13,6 +13,8 @@ interface SiteSettings {
   overdraft_fee_daily: boolean
   currency_symbol: string
   public_registration_disabled: boolean
+  interest_posting_frequency: 'daily' | 'weekly' | 'monthly'
+  daily_job_chunk_size: number
 }
 
 interface Props {
@@ -37,6 +39,8 @@ export default function EditSiteSettingsModal({ settings, token, apiUrl, onClose
     overdraft_fee_daily: settings.overdraft_fee_daily,
     currency_symbol: settings.currency_symbol,
     public_registration_disabled: settings.public_registration_disabled,
+    interest_posting_frequency: settings.interest_posting_frequency,
+    daily_job_chunk_size: settings.daily_job_chunk_size.toString(),
   })
 
   const handleChange = (e: React.ChangeEvent<HTMLInputElement>) => {
@@ -44,6 +48,11 @@ export default function EditSiteSettingsModal({ settings, token, apiUrl, onClose
     setForm(prev => ({ ...prev, [name]: type === 'checkbox' ? checked : value }))
   }
 
+  const handleSelectChange = (e: React.ChangeEvent<HTMLSelectElement>) => {
+    const { name, value } = e.target
+    setForm(prev => ({ ...prev, [name]: value }))
+  }
+
   const handleSubmit = async (e: FormEvent) => {
     e.preventDefault()
     await fetch(`${apiUrl}/settings/`, {
@@ -62,6 +71,8 @@ export default function EditSiteSettingsModal({ settings, token, apiUrl, onClose
         overdraft_fee_daily: form.overdraft_fee_daily,
         currency_symbol: form.currency_symbol,
         public_registration_disabled: form.public_registration_disabled,
+        interest_posting_frequency: form.interest_posting_frequency,
+        daily_job_chunk_size: Number(form.daily_job_chunk_size),
       })
     })
     onSaved()
@@ -97,6 +108,18 @@ export default function EditSiteSettingsModal({ settings, token, apiUrl, onClose
             CD Penalty Rate (%)
             <input name="default_cd_penalty_rate" type="number" step="0.01" value={form.default_cd_penalty_rate} onChange={handleChange} required />
           </label>
+          <label>
+            Post Interest
+            <select name="interest_posting_frequency" value={form.interest_posting_frequency} onChange={handleSelectChange}>
+              <option value="daily">Daily</option>
+              <option value="weekly">Weekly</option>
+              <option value="monthly">Monthly</option>
+            </select>
+          </label>
+          <label>
+            Daily Job Chunk Size
+            <input name="daily_job_chunk_size" type="number" min="1" step="1" value={form.daily_job_chunk_size} onChange={handleChange} required />
+          </label>
           <label>
             Service Fee Amount
             <input name="service_fee_amount" type="number" step="0.01" value={form.service_fee_amount} onChange={handleChange} required />
@@ -32,6 +32,12 @@ export default function ChildLedgerSection({
             <p className="help-text">
               This is how much money you have right now. Money you add makes it go up. Money you spend makes it go down.
             </p>
+            {!!ledger.accrued_interest && (
+              <p>
+                Interest earned so far: {formatCurrency(ledger.accrued_interest, currencySymbol)}
+                <span className="help-text"> (added to your balance at the end of the period)</span>
+              </p>
+            )}
             <LedgerTable
               transactions={ledger.transactions}
               onWidth={(width) => !tableWidth && onWidth(width)}
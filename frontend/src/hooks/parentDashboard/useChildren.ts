@@ -6,7 +6,7 @@ import {
   unfreezeChild,
   type ChildApi,
 } from '../../api/children'
-import { getChildLedger } from '../../api/transactions'
+import { getDashboard, type DashboardChild } from '../../api/dashboard'
 import { mapApiErrorMessage, toastApiError } from '../../utils/apiError'
 import type { ApiClient } from '../../api/client'
 import type { ChildAccount } from '../../types/domain'
@@ -24,31 +24,29 @@ export function useChildren({ client, showToast }: UseChildrenOptions) {
   const fetchChildren = useCallback(async () => {
     setLoadingChildren(true)
     try {
-      const data = await listChildren(client)
-      const enriched = await Promise.all(
-        data.map(async (c: ChildApi) => {
-          let balance: number | undefined
-          let lastActivity: string | undefined
-          try {
-            const ledger = await getChildLedger(client, c.id)
-            balance = ledger.balance
-            lastActivity = ledger.transactions[0]?.timestamp
-          } catch {
-            // Some children may have no ledger yet.
-          }
-          return {
-            id: c.id,
-            first_name: c.first_name,
-            frozen: c.frozen ?? c.account_frozen ?? false,
-            interest_rate: c.interest_rate,
-            penalty_interest_rate: c.penalty_interest_rate,
-            cd_penalty_rate: c.cd_penalty_rate,
-            total_interest_earned: c.total_interest_earned,
-            balance,
-            last_activity: lastActivity,
-          } as ChildAccount
-        }),
-      )
+      const [data, summaries] = await Promise.all([
+        listChildren(client),
+        // Children the caller cannot view transactions for are left out.
+        getDashboard(client).then(
+          (dashboard) => dashboard.children,
+          () => [] as DashboardChild[],
+        ),
+      ])
+      const byId = new Map(summaries.map((s) => [s.id, s]))
+      const enriched = data.map((c: ChildApi) => {
+        const summary = byId.get(c.id)
+        return {
+          id: c.id,
+          first_name: c.first_name,
+          frozen: c.frozen ?? c.account_frozen ?? false,
+          interest_rate: c.interest_rate,
+          penalty_interest_rate: c.penalty_interest_rate,
+          cd_penalty_rate: c.cd_penalty_rate,
+          total_interest_earned: c.total_interest_earned,
+          balance: summary?.balance,
+          last_activity: summary?.last_activity ?? undefined,
+        } as ChildAccount
+      })
       setChildren(enriched)
     } catch (error) {
       toastApiError(showToast, error, 'Failed to load children')
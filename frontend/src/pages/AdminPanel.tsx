@@ -117,6 +117,7 @@ export default function AdminPanel({ token, apiUrl, onLogout, siteName, currency
             Overdraft Fee: {settings.overdraft_fee_is_percentage ? `${settings.overdraft_fee_amount}%` : formatCurrency(settings.overdraft_fee_amount, currencySymbol)}
             {settings.overdraft_fee_daily ? ' (daily)' : ' (once)'}
           </p>
+          <p>Interest Posting: {settings.interest_posting_frequency}</p>
           <p>Public Registration: {settings.public_registration_disabled ? 'Disabled' : 'Enabled'}</p>
           <button onClick={() => setShowSettingsModal(true)}>Edit</button>
         </div>
@@ -11,7 +11,9 @@ export interface Transaction {
 
 export interface LedgerResponse {
   balance: number
+  accrued_interest?: number
   transactions: Transaction[]
+  next_cursor?: string | null
 }
 
 export interface RecurringCharge {
@@ -52,6 +54,7 @@ export interface ChildAccount {
   penalty_interest_rate?: number
   cd_penalty_rate?: number
   total_interest_earned?: number
+  accrued_interest?: number | null
   balance?: number
   last_activity?: string
 }